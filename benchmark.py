@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for langit: scene drawing, geometry generation and textures.
+
+    python benchmark.py                         # run everything, print a table
+    python benchmark.py --save baseline.json    # also store the results
+    python benchmark.py --compare baseline.json # exit 1 on a regression
+
+Three groups are measured:
+
+* draw/<scene>: every scene from SCENES rendered headless (see
+  render_headless) -- frames/s including glFinish, the p50 of the scene's
+  draw_* phase from the FrameProfiler, GL calls per frame and Python
+  allocations per frame.
+* geometry/<name>: the NumPy generators in geometry.py alone, no GL.
+* texture/<file>: cold decode through an empty TextureCache, warm
+  (memory-mapped) cache load, and the GL upload of the full mip chain.
+  texture/procedural/<name> does the same for procedural.py, with the
+  NumPy generation in place of the decode.
+
+A metric regresses when it is more than --threshold (relative) worse than
+the baseline; GL call counts are compared the same way.
+
+--renderer core measures the shader renderer instead of the fixed-function
+one, so the two can be A/B compared:
+
+    python benchmark.py --only draw --save legacy.json
+    python benchmark.py --only draw --renderer core --compare legacy.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import geometry
+
+# Metrik yang makin kecil makin baik; yang lain (fps) makin besar makin baik
+_LOWER_IS_BETTER = ('_ms', 'gl_calls', 'allocs')
+_HIGHER_IS_BETTER = ('fps',)
+
+
+def time_calls(func, repeat, warmup=2):
+    """Per-call wall times in milliseconds"""
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return np.asarray(times)
+
+
+def count_allocations(func):
+    """Number of Python memory blocks allocated (and still traced) by one call"""
+    # GC dimatikan supaya jumlahnya tidak bergantung kapan collector berjalan
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        func()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return sum(max(stat.count_diff, 0) for stat in after.compare_to(before, 'lineno'))
+
+
+class CountingGL(object):
+    """Proxy for an OpenGL module (GL, GLU, an ARB extension) that counts gl* calls"""
+
+    def __init__(self, module):
+        self._module = module
+        self._wrapped = {}
+        self.calls = 0
+
+    def __getattr__(self, name):
+        wrapped = self._wrapped.get(name)
+        if wrapped is not None:
+            return wrapped
+        attr = getattr(self._module, name)
+        if not (callable(attr) and name.startswith('gl')):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return attr(*args, **kwargs)
+        self._wrapped[name] = counted
+        return counted
+
+
+# Global modul yang meneruskan panggilan GL (instancing juga lewat ekstensi ARB)
+GL_GLOBALS = ('GL', 'GLU', 'draw_instanced', 'instanced_arrays')
+
+
+def count_gl_calls(func, modules):
+    """GL calls made by func() through the GL module globals (GL_GLOBALS) of `modules`"""
+    proxies = []
+    for module in modules:
+        for name in GL_GLOBALS:
+            original = getattr(module, name, None)
+            if original is not None:
+                proxy = CountingGL(original)
+                setattr(module, name, proxy)
+                proxies.append((module, name, original, proxy))
+    try:
+        func()
+    finally:
+        for module, name, original, _ in proxies:
+            setattr(module, name, original)
+    return sum(proxy.calls for _, _, _, proxy in proxies)
+
+
+def bench_draw(renderer, frames):
+    from OpenGL import GL
+    import capture
+    import core_renderer
+    import instancing
+    import langit
+    import mesh
+    import profiler
+    import recorder
+    import shaders
+    import textures
+    import video
+
+    widget = renderer.widget
+    results = {}
+    for scene in langit.SCENES:
+        angles = iter(np.linspace(0.0, 360.0, frames * 4))
+
+        def frame():
+            angle = next(angles, 0.0)
+            renderer.render(scene, (0.0, angle, 0.0))
+
+        times = time_calls(frame, frames)
+
+        widget.set_profiling(True, hud=False)
+        for _ in range(frames):
+            frame()
+        profile = widget.set_profiling(False)
+        phases = profile.summary()
+        draw_ms = phases.get('draw_' + scene, {}).get('p50', 0.0)
+        draw_calls = phases['draw_calls']['p50']
+        vertices = phases['vertices']['p50']
+
+        def paint():
+            widget.paintGL()
+            GL.glFinish()
+
+        gl_calls = count_gl_calls(paint, (langit, mesh, core_renderer, shaders, instancing,
+                                         recorder, textures, profiler, capture, video))
+        allocs = count_allocations(paint)
+        results['draw/' + scene] = {
+            'fps': 1000.0 / float(np.median(times)),
+            'frame_ms': float(np.median(times)),
+            'draw_ms': draw_ms,
+            'gl_calls': gl_calls,
+            'draw_calls': draw_calls,
+            'vertices': vertices,
+            'allocs': allocs,
+        }
+    return results
+
+
+def geometry_cases():
+    # Busur pelangi seperti di presets.rainbow_node
+    rainbow_outer = 0.5 + 0.15 * len(geometry.RAINBOW_COLORS)
+    return [
+        ('uv_sphere_32', lambda: geometry.uv_sphere(1.0, 32, 32)),
+        ('uv_sphere_64', lambda: geometry.uv_sphere(1.0, 64, 64)),
+        ('star_prism', lambda: geometry.star_prism(1.0, 0.4, 0.3)),
+        ('saturn_ring_100', lambda: geometry.saturn_ring(1.1, 1.6, 100, 0.1)),
+        ('crescent_prism_36', lambda: geometry.crescent_prism(0.8, 0.3, 36)),
+        ('arc_band_50', lambda: geometry.arc_band(0.5, rainbow_outer, np.pi / 8,
+                                                  np.pi - np.pi / 8, 50)),
+        ('ellipse_fan_36', lambda: geometry.ellipse_fan(0.0, 0.0, 0.5, 0.5, 36)),
+        ('interleave_sphere_32', lambda sphere=geometry.uv_sphere(1.0, 32, 32):
+            geometry.interleave(sphere)),
+    ]
+
+
+def bench_geometry(repeat):
+    results = {}
+    for name, build in geometry_cases():
+        times = time_calls(build, repeat)
+        results['geometry/' + name] = {
+            'build_ms': float(times.min()),
+            'allocs': count_allocations(build),
+        }
+    return results
+
+
+def bench_textures(repeat):
+    """Needs a current GL context (a HeadlessRenderer)"""
+    from OpenGL import GL
+    import langit
+    import procedural
+    from texture_cache import TextureCache
+    from textures import upload_texture
+
+    results = {}
+    for name in sorted(os.listdir(langit.TEXTURE_DIR)):
+        if not name.lower().endswith(('.png', '.jpg', '.jpeg')):
+            continue
+        path = os.path.join(langit.TEXTURE_DIR, name)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = TextureCache(cache_dir)
+
+            def cold():
+                cache.clear()
+                return cache.load(path)
+            decode_ms = time_calls(cold, max(1, repeat // 4), warmup=0)
+            load_ms = time_calls(lambda: cache.load(path), repeat)
+
+            data = cache.load(path)
+            texture_id = GL.glGenTextures(1)
+
+            def upload():
+                upload_texture(data, texture_id)
+                GL.glFinish()
+            upload_ms = time_calls(upload, repeat)
+            GL.glDeleteTextures(1, [texture_id])
+            results['texture/' + name] = {
+                'decode_ms': float(np.median(decode_ms)),
+                'cache_load_ms': float(load_ms.min()),
+                'upload_ms': float(upload_ms.min()),
+            }
+
+    for name in sorted(procedural.GENERATORS):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = TextureCache(cache_dir)
+
+            def load(name=name):
+                return cache.load_generated(name, procedural.VERSION,
+                                            lambda: procedural.GENERATORS[name]())
+            generate_ms = time_calls(lambda: procedural.GENERATORS[name](), max(1, repeat // 4))
+            load()
+            load_ms = time_calls(load, repeat)
+            results['texture/procedural/' + name] = {
+                'generate_ms': float(np.median(generate_ms)),
+                'cache_load_ms': float(load_ms.min()),
+            }
+    return results
+
+
+def regressions(results, baseline, threshold, min_delta_ms=0.05):
+    """(key, metric, baseline value, new value) for every metric that got worse.
+
+    Timings must also be at least `min_delta_ms` slower, so jitter on
+    sub-0.1 ms cases does not fail the run.
+    """
+    found = []
+    for key, metrics in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric, value in metrics.items():
+            old = base.get(metric)
+            if not old:
+                continue
+            if metric.endswith('_ms') and value - old < min_delta_ms:
+                continue
+            if metric.endswith(_LOWER_IS_BETTER):
+                worse = value > old * (1.0 + threshold)
+            elif metric.endswith(_HIGHER_IS_BETTER):
+                worse = value < old / (1.0 + threshold)
+            else:
+                continue
+            if worse:
+                found.append((key, metric, old, value))
+    return found
+
+
+def format_table(results):
+    lines = []
+    for key in sorted(results):
+        metrics = "  ".join(f"{name} {value:.3f}" if isinstance(value, float) else f"{name} {value}"
+                            for name, value in results[key].items())
+        lines.append(f"{key:<32} {metrics}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark langit drawing, geometry and textures")
+    parser.add_argument('--only', choices=['draw', 'geometry', 'texture'], action='append',
+                        help="run only these groups (repeatable)")
+    parser.add_argument('--frames', type=int, default=60, help="frames per scene")
+    parser.add_argument('--repeat', type=int, default=20, help="repetitions per geometry/texture case")
+    parser.add_argument('--size', type=int, default=512, help="square viewport size")
+    parser.add_argument('--backend', default='auto', help="headless GL backend (see render_headless)")
+    parser.add_argument('--renderer', choices=['legacy', 'core'],
+                        default=os.environ.get('LANGIT_RENDERER', 'legacy'),
+                        help="scene renderer to measure; compare both with --save/--compare")
+    parser.add_argument('--save', metavar='PATH', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="fail when worse than this baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument('--min-delta', type=float, default=0.05,
+                        help="ignore timing differences smaller than this many ms")
+    args = parser.parse_args(argv)
+
+    groups = args.only or ['draw', 'geometry', 'texture']
+    results = {}
+    if 'geometry' in groups:
+        results.update(bench_geometry(args.repeat))
+    if 'draw' in groups or 'texture' in groups:
+        from render_headless import HeadlessRenderer
+        renderer = HeadlessRenderer(args.size, args.size, args.backend, args.renderer)
+        try:
+            if 'draw' in groups:
+                results.update(bench_draw(renderer, args.frames))
+            if 'texture' in groups:
+                results.update(bench_textures(args.repeat))
+        finally:
+            renderer.close()
+
+    print(format_table(results))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'size': args.size, 'renderer': args.renderer, 'results': results},
+                      f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        found = regressions(results, baseline, args.threshold, args.min_delta)
+        for key, metric, old, new in found:
+            print(f"REGRESSION {key} {metric}: {old:.3f} -> {new:.3f}", file=sys.stderr)
+        if found:
+            return 1
+        print(f"No regressions against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""Frame capture from the scene widget without stalling the render loop.
+
+FrameCapture keeps a ring of pixel buffer objects (three by default). At
+the end of frame N, paintGL starts an asynchronous glReadPixels of frame N
+into a free buffer. It then maps the buffer that holds frame N-2, which the
+GPU has long finished. The mapped pixels go to the consumer callback on a
+capture thread as a NumPy view of the mapping itself, without a copy. The
+buffer is unmapped on the GL thread once the callback has returned.
+
+If the consumer is still busy when a frame needs a buffer, that frame is
+dropped rather than waited for; `stats()` reports captured, dropped and
+failed frames (the callback raised) and the latency from readback to
+callback.
+
+    widget.capture_next(1, save_png)     # screenshot of the next frame
+    widget.capture_next(600, encode)     # ten seconds at 60 Hz
+
+The array passed to the callback is only valid during the call; copy it to
+keep it.
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PyQt5 import QtCore
+
+from video import allocate_buffers, map_buffer, read_into_buffer, unmap_buffer
+
+FREE, READING, MAPPED = 0, 1, 2
+# Latensi yang disimpan untuk statistik
+LATENCY_HISTORY = 600
+
+
+class CapturedFrame(object):
+    """One frame handed to the consumer; `rgba` is a top-down view into the mapped buffer"""
+
+    __slots__ = ('index', 'frame', 'rgba', 'time', 'latency')
+
+    def __init__(self, index, frame, rgba, time, latency):
+        self.index = index      # Urutan dalam permintaan capture_next (0, 1, ...)
+        self.frame = frame      # Nomor paint widget
+        self.rgba = rgba
+        self.time = time        # time.perf_counter() saat frame dibaca (akhir paintGL)
+        self.latency = latency  # Detik dari glReadPixels sampai callback dipanggil
+
+
+class _Slot(object):
+    __slots__ = ('buffer', 'state', 'callback', 'index', 'frame', 'issued', 'future')
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.state = FREE
+        self.future = None
+
+
+class FrameCapture(object):
+    """Ring of `count` PBOs feeding a consumer callback on a capture thread"""
+
+    def __init__(self, widget, count=3):
+        self.widget = widget
+        self.count = max(count, 2)
+        self.slots = []
+        self.size = None
+        self.callback = None
+        self.remaining = 0
+        self.requested = 0
+        self.captured = 0
+        self.dropped = 0
+        self.failed = 0
+        self.latencies = []
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='capture')
+        self._flush_scheduled = False
+
+    @property
+    def active(self):
+        return self.remaining > 0 or any(slot.state != FREE for slot in self.slots)
+
+    def capture_next(self, frames, callback):
+        """Capture the next `frames` painted frames; callback(CapturedFrame) runs on the capture thread"""
+        self.callback = callback
+        self.remaining = frames
+        # Statistik per permintaan
+        self.requested = self.captured = self.dropped = self.failed = 0
+        self.latencies = []
+        self.widget.update()
+
+    def stop(self):
+        """Capture no further frames; frames already read are still delivered"""
+        self.remaining = 0
+        self._schedule_flush()
+
+    def on_frame(self, frame, width, height):
+        """End of paintGL (context current, frame drawn): read this frame, map frame N-2"""
+        self._retire()
+        if self.remaining > 0:
+            self.remaining -= 1
+            slot = self._free_slot(width, height)
+            if slot is None:
+                self.dropped += 1  # Consumer belum selesai: frame dilewati, bukan ditunggu
+            else:
+                read_into_buffer(slot.buffer, width, height)
+                slot.state = READING
+                slot.callback = self.callback
+                slot.index = self.requested
+                slot.frame = frame
+                slot.issued = time.perf_counter()
+            self.requested += 1
+        # Frame N-2 dan lebih tua sudah selesai di GPU
+        self._deliver(lambda slot: slot.frame <= frame - (self.count - 1))
+        if self.remaining == 0:
+            self._schedule_flush()
+
+    def finish(self):
+        """Deliver every frame in flight and wait for the consumer (context must be current)"""
+        self.remaining = 0
+        self._deliver(lambda slot: True)
+        for slot in self.slots:
+            if slot.state == MAPPED:
+                slot.future.result()
+        self._retire()
+
+    def stats(self):
+        latencies = np.array(self.latencies) * 1000.0
+        return {
+            'captured': self.captured,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'latency_p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else None,
+            'latency_p95_ms': float(np.percentile(latencies, 95)) if len(latencies) else None,
+        }
+
+    def report(self):
+        stats = self.stats()
+        line = f"capture: {stats['captured']} frames, {stats['dropped']} dropped"
+        if stats['failed']:
+            line += f", {stats['failed']} failed"
+        if stats['latency_p50_ms'] is not None:
+            line += f", latency p50 {stats['latency_p50_ms']:.2f} p95 {stats['latency_p95_ms']:.2f} ms"
+        return line
+
+    def delete(self):
+        """Release the buffers and the capture thread (context must be current)"""
+        self.finish()
+        if self.slots:
+            from OpenGL import GL
+            GL.glDeleteBuffers(len(self.slots), [slot.buffer for slot in self.slots])
+            self.slots = []
+        self.executor.shutdown()
+
+    def _free_slot(self, width, height):
+        if (width, height) != self.size:
+            # Ukuran berubah: buffer baru, tapi hanya kalau tidak ada yang sedang dipakai
+            if any(slot.state != FREE for slot in self.slots):
+                return None
+            if self.slots:
+                from OpenGL import GL
+                GL.glDeleteBuffers(len(self.slots), [slot.buffer for slot in self.slots])
+            self.slots = [_Slot(buffer) for buffer in allocate_buffers(self.count, width, height)]
+            self.size = (width, height)
+        return next((slot for slot in self.slots if slot.state == FREE), None)
+
+    def _deliver(self, ready):
+        # Dari frame paling tua, supaya consumer menerima frame berurutan
+        reading = sorted((slot for slot in self.slots if slot.state == READING and ready(slot)),
+                         key=lambda slot: slot.frame)
+        for slot in reading:
+            width, height = self.size
+            rgba = map_buffer(slot.buffer, width, height)
+            slot.state = MAPPED
+            slot.future = self.executor.submit(self._consume, slot.callback, slot.index, slot.frame,
+                                               rgba, slot.issued)
+
+    def _consume(self, callback, index, frame, rgba, issued):
+        latency = time.perf_counter() - issued
+        try:
+            callback(CapturedFrame(index, frame, rgba, issued, latency))
+        except Exception as e:
+            print(f"Error in capture callback: {e}", file=sys.stderr)
+            self.failed += 1
+            return
+        self.captured += 1
+        self.latencies.append(latency)
+        del self.latencies[:-LATENCY_HISTORY]
+
+    def _retire(self):
+        for slot in self.slots:
+            if slot.state == MAPPED and slot.future.done():
+                unmap_buffer(slot.buffer)
+                slot.state = FREE
+                slot.future = None
+
+    def _schedule_flush(self):
+        # Setelah frame terakhir tidak ada paint lagi yang memetakan / melepas buffer
+        if not self._flush_scheduled and any(slot.state != FREE for slot in self.slots):
+            self._flush_scheduled = True
+            QtCore.QTimer.singleShot(5, self._flush)
+
+    def _flush(self):
+        self._flush_scheduled = False
+        if self.remaining > 0 or not self.slots:
+            return  # Masih ada paint berikutnya yang mengurusnya
+        if self.widget.isVisible():
+            self.widget.makeCurrent()
+        self._deliver(lambda slot: True)
+        self._retire()
+        self._schedule_flush()
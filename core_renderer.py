@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""Core-profile (OpenGL 3.3) renderer for the eight scenes.
+
+Draws the same scene graphs (presets.py) as the fixed-function
+SceneGLWidget, but from VAOs (mesh.VertexArrayMesh) with the programs in
+shaders.py. Transforms and the light live in uniform buffers: the
+Transforms block is re-uploaded only when a node's model-view, the
+projection or the viewport actually changed.
+"""
+
+import ctypes
+
+import numpy as np
+from OpenGL import GL
+
+import mesh
+from instancing import InstanceBuffer, InstancedVertexArray
+from shaders import (LIGHT_BINDING, LIGHT_FLOATS, TRANSFORMS_BINDING, TRANSFORMS_FLOATS,
+                     ShaderLibrary, UniformBuffer, pack_light)
+from transforms import gl_matrix
+
+# Lampu sama dengan setup GL_LIGHT0 lama: posisi (5, 5, 5) di ruang mata,
+# ambient 0.2, diffuse dan specular 1, ambient global default 0.2
+LIGHT = pack_light((5.0, 5.0, 5.0, 1.0), (0.2, 0.2, 0.2, 1.0), (1.0, 1.0, 1.0, 1.0),
+                   (1.0, 1.0, 1.0, 1.0), (0.2, 0.2, 0.2, 1.0))
+
+
+class GlowLines(object):
+    """A closed polyline as screen-space quads for the 'glow' program.
+
+    Every segment (a, b) becomes two triangles whose vertices carry both
+    end points and a side (+1/-1); the vertex shader pushes them apart by
+    u_width pixels, which replaces glLineWidth for GL_LINE_LOOP.
+    """
+
+    def __init__(self, points):
+        points = np.asarray(points, dtype=np.float32)
+        if points.shape[1] == 2:
+            points = np.hstack([points, np.zeros((len(points), 1), dtype=np.float32)])
+        a = points
+        b = np.roll(points, -1, axis=0)
+        # Per segmen: (a, b, +1), (a, b, -1), (b, a, -1), (b, a, +1)
+        position = np.stack([a, a, b, b], axis=1)
+        other = np.stack([b, b, a, a], axis=1)
+        side = np.broadcast_to(np.array([1.0, -1.0, -1.0, 1.0], dtype=np.float32),
+                               (len(points), 4))
+        vertices = np.ascontiguousarray(np.concatenate(
+            [position, other, side[..., None]], axis=-1).reshape(-1, 7), dtype=np.float32)
+        base = (np.arange(len(points), dtype=np.uint32) * 4)[:, None]
+        indices = np.ascontiguousarray((base + np.array([0, 1, 2, 2, 1, 3], dtype=np.uint32))
+                                       .reshape(-1))
+        self.index_count = indices.size
+
+        stride = 7 * 4
+        self.vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self.vao)
+        self.vbo, self.ibo = GL.glGenBuffers(2)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL.GL_STATIC_DRAW)
+        for location, size, offset in ((0, 3, 0), (1, 3, 3), (2, 1, 6)):
+            GL.glEnableVertexAttribArray(location)
+            GL.glVertexAttribPointer(location, size, GL.GL_FLOAT, GL.GL_FALSE, stride,
+                                     ctypes.c_void_p(offset * 4))
+        GL.glBindVertexArray(0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        GL.glBindVertexArray(self.vao)
+        GL.glDrawElements(GL.GL_TRIANGLES, self.index_count, GL.GL_UNSIGNED_INT, ctypes.c_void_p(0))
+        if mesh.draw_counter is not None:
+            mesh.draw_counter(self.index_count)
+
+    def delete(self):
+        GL.glDeleteVertexArrays(1, [self.vao])
+        GL.glDeleteBuffers(2, [self.vbo, self.ibo])
+        self.vao = self.vbo = self.ibo = 0
+
+
+class CoreRenderer(object):
+    """Draws the widget's current scene with shaders; needs a 3.3 core context"""
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.shaders = None
+        self.transforms = None
+        self.light = None
+        self.glow_lines = {}  # Titik outline -> GlowLines
+        self.instance_buffers = {}  # InstanceSet -> InstanceBuffer
+        self.instanced_arrays = {}  # (mesh atau None untuk titik, InstanceSet) -> VAO
+        self.bound_mesh = None
+        self.viewport = (1, 1)
+        self._uploaded = None  # Kunci isi UBO Transforms saat ini
+        self.transform_uploads = 0
+
+    def initialize(self):
+        self.shaders = ShaderLibrary()
+        self.transforms = UniformBuffer(TRANSFORMS_BINDING, TRANSFORMS_FLOATS)
+        self.light = UniformBuffer(LIGHT_BINDING, LIGHT_FLOATS)
+        self.light.update(LIGHT)
+        GL.glClearColor(0.1, 0.1, 0.1, 1.0)
+
+    def resize(self, w, h):
+        self.viewport = (max(w, 1), max(h, 1))
+        GL.glViewport(0, 0, w, h)
+        widget = self.widget
+        widget.matrices.set_projection(widget.fovy, self.viewport[0] / self.viewport[1])
+
+    def set_transforms(self, model_view, tag):
+        """Upload model-view, projection and normal matrix if they changed.
+
+        `tag` identifies what `model_view` was built from (node and its
+        world revision); with the camera revision it decides whether the
+        block already holds this matrix.
+        """
+        widget = self.widget
+        key = (tag, widget.matrices.rebuilds, self.viewport, widget.fovy)
+        if key == self._uploaded:
+            return
+        projection = widget.matrices.projection
+        data = np.zeros(TRANSFORMS_FLOATS, dtype=np.float32)
+        data[0:16] = gl_matrix(model_view).reshape(-1)
+        data[16:32] = gl_matrix(projection).reshape(-1)
+        # Invers-transpos 3x3 (tanpa normalisasi, sama seperti pipeline lama
+        # yang tidak mengaktifkan GL_NORMALIZE)
+        normal = np.identity(4, dtype=np.float32)
+        normal[:3, :3] = np.linalg.inv(model_view[:3, :3]).T
+        data[32:48] = gl_matrix(normal).reshape(-1)
+        data[48:50] = self.viewport
+        self.transforms.update(data)
+        self._uploaded = key
+        self.transform_uploads += 1
+
+    def render(self):
+        widget = self.widget
+        # QPainter (HUD) bisa mengubah state; set ulang yang dipakai di sini
+        self.shaders.reset()
+        GL.glViewport(0, 0, *self.viewport)
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        GL.glDepthFunc(GL.GL_LESS)
+        GL.glDepthMask(GL.GL_TRUE)
+        GL.glDisable(GL.GL_BLEND)
+        GL.glDisable(GL.GL_CULL_FACE)
+        GL.glDisable(GL.GL_SCISSOR_TEST)
+        GL.glDisable(GL.GL_STENCIL_TEST)
+        GL.glClearColor(0.1, 0.1, 0.1, 1.0)
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
+        self.transforms.bind()
+        self.light.bind()
+
+        with widget.profiler.phase('transform'):
+            view = widget.matrices.model_view_matrix(widget.camera_distance)
+
+        graph = widget.scene_graph()
+        if graph is not None:
+            with widget.profiler.phase('draw_' + widget.current_scene):
+                graph.render(self, view, widget)
+        GL.glBindVertexArray(0)
+        GL.glUseProgram(0)
+        self.shaders.reset()
+
+    # Backend scene graph (lihat scene_graph.py)
+
+    def apply_state(self, state, previous):
+        program = self.shaders.use('lit' if state.lit else 'unlit')
+        if state.lit:
+            program.set_float('u_specular', state.specular, state.specular, state.specular)
+            program.set_float('u_shininess', state.shininess)
+        program.set_int('u_texture', 0)
+        program.set_int('u_use_texture', state.texture is not None)
+        if state.texture is not None:
+            GL.glActiveTexture(GL.GL_TEXTURE0)
+            GL.glBindTexture(GL.GL_TEXTURE_2D, state.texture.id)
+        if previous is None or state.blend != previous.blend:
+            if state.blend:
+                GL.glEnable(GL.GL_BLEND)
+                GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
+            else:
+                GL.glDisable(GL.GL_BLEND)
+
+    def finish_states(self, previous):
+        self.bound_mesh = None
+        GL.glDisable(GL.GL_BLEND)
+
+    def load_model_view(self, model_view, node):
+        self.set_transforms(model_view, (id(node), node.world_revision))
+
+    def draw_mesh(self, vertex_mesh, color):
+        self.shaders.current.set_float('u_color', color[0], color[1], color[2], 1.0)
+        if vertex_mesh is not self.bound_mesh:
+            if not vertex_mesh.has_colors:
+                # Atribut warna mati -> nilai tetap putih, warna dari u_color
+                GL.glVertexAttrib4f(mesh.ATTRIBUTE_LOCATIONS['colors'], 1.0, 1.0, 1.0, 1.0)
+            vertex_mesh.bind()
+            self.bound_mesh = vertex_mesh
+        vertex_mesh.draw_elements()
+
+    def instanced_array(self, vertex_mesh, instances):
+        arrays = self.instanced_arrays.get((vertex_mesh, instances))
+        if arrays is None:
+            buffer = self.instance_buffers.get(instances)
+            if buffer is None:
+                buffer = self.instance_buffers[instances] = InstanceBuffer()
+            arrays = self.instanced_arrays[(vertex_mesh, instances)] = \
+                InstancedVertexArray(buffer, vertex_mesh)
+        return arrays
+
+    def draw_instanced(self, vertex_mesh, instances, color, state):
+        arrays = self.instanced_array(vertex_mesh, instances)
+        previous = self.shaders.current
+        program = self.shaders.use('instanced')
+        program.set_float('u_color', color[0], color[1], color[2], 1.0)
+        program.set_int('u_lit', state.lit)
+        if state.lit:
+            program.set_float('u_specular', state.specular, state.specular, state.specular)
+            program.set_float('u_shininess', state.shininess)
+        if not vertex_mesh.has_colors:
+            GL.glVertexAttrib4f(mesh.ATTRIBUTE_LOCATIONS['colors'], 1.0, 1.0, 1.0, 1.0)
+        arrays.draw(instances)
+        self.bound_mesh = None
+        if previous is not None:
+            self.shaders.use(previous.name)
+
+    def draw_instance_points(self, instances, color, radius, pixel_scale, max_radius, ranges=None,
+                             sprite=None):
+        arrays = self.instanced_array(None, instances)
+        previous = self.shaders.current
+        program = self.shaders.use('instance_points')
+        program.set_float('u_color', color[0], color[1], color[2], 1.0)
+        program.set_float('u_radius', radius)
+        program.set_float('u_pixel_scale', pixel_scale)
+        program.set_float('u_max_radius', max_radius)
+        use_sprite = sprite is not None and not sprite.failed
+        program.set_int('u_use_sprite', use_sprite)
+        if use_sprite:
+            program.set_int('u_sprite', 0)
+            GL.glActiveTexture(GL.GL_TEXTURE0)
+            GL.glBindTexture(GL.GL_TEXTURE_2D, sprite.id)
+        GL.glEnable(GL.GL_PROGRAM_POINT_SIZE)
+        arrays.draw(instances, ranges)
+        GL.glDisable(GL.GL_PROGRAM_POINT_SIZE)
+        self.bound_mesh = None
+        if previous is not None:
+            self.shaders.use(previous.name)
+
+    def draw_glow(self, points, layers):
+        lines = self.glow_lines.get(points)
+        if lines is None:
+            lines = self.glow_lines[points] = GlowLines(points)
+        previous = self.shaders.current
+        program = self.shaders.use('glow')
+        for r, g, b, a, offset in layers:
+            program.set_float('u_color', r, g, b, a)
+            program.set_float('u_width', 5.0 * (1.0 - offset))
+            program.set_float('u_scale', 1.0 + offset)
+            lines.draw()
+        self.bound_mesh = None
+        if previous is not None:
+            self.shaders.use(previous.name)
+
+    def delete(self):
+        if self.shaders is not None:
+            self.shaders.delete()
+            self.transforms.delete()
+            self.light.delete()
+            for lines in self.glow_lines.values():
+                lines.delete()
+            self.glow_lines = {}
+            for arrays in self.instanced_arrays.values():
+                arrays.delete()
+            for buffer in self.instance_buffers.values():
+                buffer.delete()
+            self.instanced_arrays = {}
+            self.instance_buffers = {}
+            self.shaders = None
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""View-frustum culling: bounding boxes, frustum planes and an instance grid.
+
+Every drawable has a local BoundingBox (axis-aligned, with the enclosing
+sphere for a cheap first test). SceneNode keeps the box of its drawable and
+of its whole subtree in world space, so the scene graph doubles as a
+bounding volume hierarchy: a subtree that is outside the frustum is skipped
+in one test, one that is fully inside needs no further tests.
+
+Instance sets are too large for one box per instance per frame, so
+InstanceGrid sorts the instances into a uniform grid; whole cells are
+tested and visible cells become contiguous index ranges.
+
+Frustum planes are taken from the row-major clip matrix
+(projection @ model_view, see transforms.py), so testing in a node's local
+space needs no transformed boxes at all.
+"""
+
+import numpy as np
+
+OUTSIDE, INTERSECT, INSIDE = 0, 1, 2
+
+
+class BoundingBox(object):
+    """Axis-aligned box; `center`, `extents` (half size) and `radius` of its sphere"""
+
+    __slots__ = ('minimum', 'maximum', 'center', 'extents', 'radius')
+
+    def __init__(self, minimum, maximum):
+        self.minimum = np.asarray(minimum, dtype=np.float64)
+        self.maximum = np.asarray(maximum, dtype=np.float64)
+        self.center = (self.minimum + self.maximum) * 0.5
+        self.extents = (self.maximum - self.minimum) * 0.5
+        self.radius = float(np.linalg.norm(self.extents))
+
+    @classmethod
+    def of_points(cls, points, pad=0.0):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, np.shape(points)[-1])
+        if points.shape[1] == 2:
+            points = np.hstack([points, np.zeros((len(points), 1))])
+        return cls(points.min(axis=0) - pad, points.max(axis=0) + pad)
+
+    @classmethod
+    def union(cls, boxes):
+        """Box around all `boxes` (None entries ignored); None if there are none"""
+        boxes = [box for box in boxes if box is not None]
+        if not boxes:
+            return None
+        if len(boxes) == 1:
+            return boxes[0]
+        return cls(np.min([box.minimum for box in boxes], axis=0),
+                   np.max([box.maximum for box in boxes], axis=0))
+
+    def transformed(self, matrix):
+        """Box around this box after the row-major 4x4 `matrix` (Arvo's method)"""
+        linear = matrix[:3, :3]
+        center = linear @ self.center + matrix[:3, 3]
+        extents = np.abs(linear) @ self.extents
+        return BoundingBox(center - extents, center + extents)
+
+
+def frustum_planes(clip):
+    """The six planes (a, b, c, d) of a clip matrix, normals pointing inwards"""
+    clip = np.asarray(clip, dtype=np.float64)
+    rows = clip[3] + np.array([clip[0], -clip[0], clip[1], -clip[1], clip[2], -clip[2]])
+    return rows / np.linalg.norm(rows[:, :3], axis=1, keepdims=True)
+
+
+class Frustum(object):
+    """Frustum of a row-major clip matrix, in that matrix's source space"""
+
+    def __init__(self, clip):
+        self.planes = frustum_planes(clip)
+        self._normals = self.planes[:, :3]
+        self._abs_normals = np.abs(self._normals)
+
+    def test_box(self, box):
+        """OUTSIDE, INTERSECT or INSIDE"""
+        distance = self._normals @ box.center + self.planes[:, 3]
+        # Bola dulu (murah), baru kotak: proyeksi extents ke normal tiap bidang
+        if (distance < -box.radius).any():
+            return OUTSIDE
+        reach = self._abs_normals @ box.extents
+        if (distance + reach < 0.0).any():
+            return OUTSIDE
+        if (distance - reach >= 0.0).all():
+            return INSIDE
+        return INTERSECT
+
+    def boxes_visible(self, minimum, maximum):
+        """Mask of the boxes (N, 3) that are at least partly inside"""
+        center = (minimum + maximum) * 0.5
+        extents = (maximum - minimum) * 0.5
+        distance = center @ self._normals.T + self.planes[:, 3]
+        reach = extents @ self._abs_normals.T
+        return (distance + reach >= 0.0).all(axis=1)
+
+    def spheres_visible(self, centers, radii):
+        """Mask of the spheres that are at least partly inside"""
+        distance = centers @ self._normals.T + self.planes[:, 3]
+        return (distance >= -np.asarray(radii)[:, None]).all(axis=1)
+
+
+class InstanceGrid(object):
+    """Uniform grid over instance positions for per-cell frustum tests.
+
+    `order` sorts the instances cell by cell; after the caller applied it,
+    cell i covers rows starts[i]:starts[i] + counts[i]. Cell boxes include
+    each instance's radius.
+    """
+
+    def __init__(self, positions, radii, per_cell=256):
+        positions = np.asarray(positions, dtype=np.float64)
+        radii = np.asarray(radii, dtype=np.float64)
+        low = positions.min(axis=0)
+        size = np.maximum(positions.max(axis=0) - low, 1e-6)
+        # Kira-kira `per_cell` instance per sel, sel berbentuk kubus
+        cells = max(len(positions) / per_cell, 1.0)
+        cell_size = float(np.cbrt(np.prod(size) / cells))
+        shape = np.maximum(np.ceil(size / max(cell_size, 1e-6)), 1).astype(np.int64)
+        index = np.minimum(((positions - low) / max(cell_size, 1e-6)).astype(np.int64), shape - 1)
+        keys = (index[:, 0] * shape[1] + index[:, 1]) * shape[2] + index[:, 2]
+
+        self.order = np.argsort(keys, kind='stable')
+        keys = keys[self.order]
+        cell_keys, self.starts, self.counts = np.unique(keys, return_index=True, return_counts=True)
+        lows = positions[self.order] - radii[self.order, None]
+        highs = positions[self.order] + radii[self.order, None]
+        self.minimum = np.minimum.reduceat(lows, self.starts, axis=0)
+        self.maximum = np.maximum.reduceat(highs, self.starts, axis=0)
+        self.cell_count = len(cell_keys)
+
+    def visible_cells(self, frustum):
+        return frustum.boxes_visible(self.minimum, self.maximum)
+
+    def visible_ranges(self, frustum):
+        """(firsts, counts) of the visible instances as int32, adjacent cells merged"""
+        visible = self.visible_cells(frustum)
+        starts = self.starts[visible]
+        ends = starts + self.counts[visible]
+        if not len(starts):
+            return starts.astype(np.int32), ends.astype(np.int32)
+        # Sel berurutan yang sama-sama terlihat digabung jadi satu range
+        breaks = np.flatnonzero(starts[1:] != ends[:-1]) + 1
+        firsts = starts[np.concatenate([[0], breaks])]
+        lasts = ends[np.concatenate([breaks - 1, [len(ends) - 1]])]
+        return firsts.astype(np.int32), (lasts - firsts).astype(np.int32)
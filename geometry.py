@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+"""Pure NumPy geometry generators for the scenes in langit.py.
+
+Nothing in here touches OpenGL, so the functions can be used (and timed)
+without a GL context.  Every generator returns a MeshData whose arrays are
+contiguous float32 (uint32 for indices) and ready to be uploaded.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# positions: (N, 3), normals: (N, 3) or None, uvs: (N, 2) or None,
+# colors: (N, 3) or None, indices: (M,) uint32
+MeshData = namedtuple('MeshData', ['positions', 'normals', 'uvs', 'colors', 'indices'])
+
+
+def _f32(a):
+    return np.ascontiguousarray(a, dtype=np.float32)
+
+
+def _u32(a):
+    return np.ascontiguousarray(a, dtype=np.uint32)
+
+
+def grid_indices(rows, cols):
+    """Triangle indices for a (rows + 1) x (cols + 1) vertex grid"""
+    r = np.arange(rows, dtype=np.uint32)[:, None]
+    c = np.arange(cols, dtype=np.uint32)[None, :]
+    a = r * (cols + 1) + c          # (i, j)
+    b = a + (cols + 1)              # (i + 1, j)
+    quads = np.stack([a, b, a + 1, a + 1, b, b + 1], axis=-1)
+    return _u32(quads.reshape(-1))
+
+
+def uv_sphere(radius=1.0, stacks=32, slices=32):
+    """UV sphere with the same layout the old quad-strip loop produced"""
+    lat = np.pi * (-0.5 + np.arange(stacks + 1) / stacks)
+    # Sama seperti versi immediate mode: longitude digeser satu slice
+    lng = 2 * np.pi * (np.arange(slices + 1) - 1) / slices
+    cos_lat = np.cos(lat)[:, None]
+    normals = np.stack([
+        np.cos(lng)[None, :] * cos_lat,
+        np.sin(lng)[None, :] * cos_lat,
+        np.broadcast_to(np.sin(lat)[:, None], (stacks + 1, slices + 1)),
+    ], axis=-1).reshape(-1, 3)
+
+    s, t = np.meshgrid(np.arange(slices + 1) / slices, np.arange(stacks + 1) / stacks)
+    uvs = np.stack([s, t], axis=-1).reshape(-1, 2)
+
+    return MeshData(_f32(normals * radius), _f32(normals), _f32(uvs), None,
+                    grid_indices(stacks, slices))
+
+
+def strip_indices(columns):
+    """Triangle indices for a quad strip of `columns` vertex pairs (a0, b0, a1, b1, ...)"""
+    a = np.arange(columns - 1, dtype=np.uint32) * 2
+    quads = np.stack([a, a + 1, a + 2, a + 2, a + 1, a + 3], axis=-1)
+    return _u32(quads.reshape(-1))
+
+
+def fan_indices(rim_count, closed=True):
+    """Triangle indices for a fan around vertex 0 with rim vertices 1..rim_count"""
+    i = np.arange(rim_count if closed else rim_count - 1, dtype=np.uint32)
+    tris = np.stack([np.zeros_like(i), 1 + i, 1 + (i + 1) % rim_count], axis=-1)
+    return _u32(tris.reshape(-1))
+
+
+def _color_array(color, count):
+    if color is None:
+        return None
+    return _f32(np.broadcast_to(np.asarray(color, dtype=np.float32), (count, 3)))
+
+
+def _flat_normals(count, normal=(0.0, 0.0, 1.0)):
+    return _f32(np.broadcast_to(np.asarray(normal, dtype=np.float32), (count, 3)))
+
+
+def merge(meshes):
+    """Concatenate several MeshData into one, rebasing the indices"""
+    meshes = list(meshes)
+    merged = {}
+    for name in ('positions', 'normals', 'uvs', 'colors'):
+        arrays = [getattr(m, name) for m in meshes]
+        if all(a is None for a in arrays):
+            merged[name] = None
+        elif any(a is None for a in arrays):
+            raise ValueError(f"Cannot merge meshes: '{name}' is missing on some of them")
+        else:
+            merged[name] = _f32(np.concatenate(arrays))
+    offsets = np.cumsum([0] + [len(m.positions) for m in meshes[:-1]])
+    indices = np.concatenate([m.indices + np.uint32(o) for m, o in zip(meshes, offsets)])
+    return MeshData(merged['positions'], merged['normals'], merged['uvs'],
+                    merged['colors'], _u32(indices))
+
+
+def weld(mesh, crease_angle=30.0):
+    """Merge vertices that share position, uv and color across soft edges.
+
+    Coincident vertices whose normals differ by less than `crease_angle`
+    degrees become one vertex with the normalized mean normal, so shading is
+    smooth over that edge; at harder creases each side keeps its own vertex.
+    """
+    columns = [a for a in (mesh.positions, mesh.uvs, mesh.colors) if a is not None]
+    _, group = np.unique(np.round(np.hstack(columns), 5), axis=0, return_inverse=True)
+    group = group.reshape(-1)
+    normals = mesh.normals.astype(np.float64)
+    limit = np.cos(np.radians(crease_angle))
+    # Tiap vertex menunjuk vertex pertama yang digabung dengannya
+    target = np.arange(len(group))
+    order = np.argsort(group, kind='stable')
+    for members in np.split(order, np.flatnonzero(np.diff(group[order])) + 1):
+        for i, k in enumerate(members[1:], 1):
+            for j in members[:i]:
+                if target[j] == j and np.dot(normals[k], normals[j]) >= limit:
+                    target[k] = j
+                    break
+    summed = np.zeros_like(normals)
+    np.add.at(summed, target, normals)
+    keep = target == np.arange(len(target))
+    remap = np.cumsum(keep) - 1
+    summed = summed[keep]
+    normals = summed / np.linalg.norm(summed, axis=1, keepdims=True)
+
+    def kept(a):
+        return None if a is None else _f32(a[keep])
+    return MeshData(kept(mesh.positions), _f32(normals), kept(mesh.uvs), kept(mesh.colors),
+                    _u32(remap[target[mesh.indices]]))
+
+
+def ellipse_fan(x, y, width, height, segments=36, color=None):
+    """Filled ellipse in the z=0 plane (centre vertex plus rim)"""
+    theta = 2.0 * np.pi * np.arange(segments) / segments
+    rim_x, rim_y = np.cos(theta), np.sin(theta)
+    positions = np.zeros((segments + 1, 3))
+    positions[0] = (x, y, 0.0)
+    positions[1:, 0] = x + width / 2 * rim_x
+    positions[1:, 1] = y + height / 2 * rim_y
+    uvs = np.empty((segments + 1, 2))
+    uvs[0] = (0.5, 0.5)
+    uvs[1:, 0] = 0.5 + 0.5 * rim_x
+    uvs[1:, 1] = 0.5 + 0.5 * rim_y
+    return MeshData(_f32(positions), _flat_normals(segments + 1), _f32(uvs),
+                    _color_array(color, segments + 1), fan_indices(segments))
+
+
+def circle_fan(x, y, radius, segments=32, color=None):
+    return ellipse_fan(x, y, 2 * radius, 2 * radius, segments, color)
+
+
+def arc_band(inner_radius, outer_radius, start_angle, end_angle, segments=50, color=None):
+    """Flat band between two concentric arcs; u is radial (0 inner, 1 outer), v runs along"""
+    theta = start_angle + (end_angle - start_angle) * np.arange(segments + 1) / segments
+    radii = np.array([inner_radius, outer_radius])
+    # Urutan vertex sama dengan quad strip: dalam, luar, dalam, luar, ...
+    positions = np.zeros((segments + 1, 2, 3))
+    positions[..., 0] = np.cos(theta)[:, None] * radii
+    positions[..., 1] = np.sin(theta)[:, None] * radii
+    s = np.arange(segments + 1) / segments
+    uvs = np.stack(np.broadcast_arrays(np.array([0.0, 1.0]), s[:, None]), axis=-1)
+    count = 2 * (segments + 1)
+    return MeshData(_f32(positions.reshape(-1, 3)), _flat_normals(count),
+                    _f32(uvs.reshape(-1, 2)), _color_array(color, count),
+                    strip_indices(segments + 1))
+
+
+# Data bentuk 2D, dipakai bersama oleh kedua renderer di langit.py
+RAINBOW_COLORS = [
+    (1.0, 0.0, 0.0),  # Red
+    (1.0, 0.5, 0.0),  # Orange
+    (1.0, 1.0, 0.0),  # Yellow
+    (0.0, 1.0, 0.0),  # Green
+    (0.0, 0.0, 1.0),  # Blue
+    (0.5, 0.0, 1.0),  # Indigo
+    (0.7, 0.0, 1.0),  # Violet
+]
+
+# (x, y, width, height) tiap ellipse awan
+CLOUD_PARTS = [
+    (-0.6, 0, 0.5, 0.5),
+    (-0.3, 0.1, 0.6, 0.6),
+    (0.1, 0.4, 0.7, 0.7),
+    (0.5, 0.2, 0.6, 0.6),
+    (0.8, 0, 0.5, 0.5),
+    (0.2, -0.1, 0.8, 0.7),
+]
+
+LIGHTNING_POINTS = [
+    (0.0, 1.0),      # Titik atas
+    (-0.2, 0.4),     # Miring ke kiri bawah
+    (0.1, 0.4),      # Sedikit kanan
+    (-0.3, -0.2),    # Miring ke kiri bawah
+    (0.0, -0.2),     # Ke kanan
+    (-0.5, -1.0),    # Ujung bawah
+]
+
+# (r, g, b, a, offset) garis glow di sekeliling petir, dari luar ke dalam
+LIGHTNING_GLOW = [
+    (1.0, 1.0, 0.8, 0.4, 0.05),
+    (1.0, 1.0, 0.6, 0.6, 0.03),
+    (1.0, 0.9, 0.3, 0.8, 0.01),
+]
+
+
+def polygon(points, color=None):
+    """Filled 2D polygon triangulated as a fan from its first point, like GL_POLYGON"""
+    n = len(points)
+    positions = np.zeros((n, 3))
+    positions[:, :2] = points
+    i = np.arange(1, n - 1, dtype=np.uint32)
+    indices = np.stack([np.zeros_like(i), i, i + 1], axis=-1)
+    return MeshData(_f32(positions), _flat_normals(n), _f32(np.zeros((n, 2))),
+                    _color_array(color, n), _u32(indices.reshape(-1)))
+
+
+def triangles(points, colors):
+    """Separate 2D triangles; `colors` has one color per triangle"""
+    n = len(points)
+    positions = np.zeros((n, 3))
+    positions[:, :2] = points
+    return MeshData(_f32(positions), _flat_normals(n), _f32(np.zeros((n, 2))),
+                    _f32(np.repeat(np.asarray(colors, dtype=np.float32), 3, axis=0)),
+                    _u32(np.arange(n)))
+
+
+def cloud(segments=36):
+    """All cloud ellipses in one mesh (no colors: drawn with the current color).
+
+    Texture coordinates are planar over the whole cloud (for a tiling noise
+    texture), so the ellipses show no seams where they overlap.
+    """
+    mesh = merge(ellipse_fan(x, y, w, h, segments) for x, y, w, h in CLOUD_PARTS)
+    return mesh._replace(uvs=_f32(mesh.positions[:, :2] * 0.6))
+
+
+def lightning_bolt(color=(1.0, 0.9, 0.1)):
+    return polygon(LIGHTNING_POINTS, color)
+
+
+def rocket(body_color=(0.8, 0.8, 0.8)):
+    """2D rocket in drawing order: body, nose, fins, window, flames"""
+    body = polygon([(-0.1, -0.5), (0.1, -0.5), (0.2, 0.3), (-0.2, 0.3)], body_color)
+    nose = triangles([(-0.2, 0.3), (0.2, 0.3), (0.0, 0.7)], [(1.0, 0.0, 0.0)])
+    fins = triangles([(-0.1, -0.3), (-0.1, -0.5), (-0.3, -0.5),
+                      (0.1, -0.3), (0.1, -0.5), (0.3, -0.5)],
+                     [(0.6, 0.6, 0.6), (0.6, 0.6, 0.6)])
+    window = circle_fan(0.0, 0.0, 0.08, 32, (0.2, 0.6, 1.0))
+    flames = triangles([(-0.1, -0.5), (0.1, -0.5), (0.0, -0.8),
+                        (-0.15, -0.5), (-0.05, -0.5), (-0.1, -0.7),
+                        (0.05, -0.5), (0.15, -0.5), (0.1, -0.7)],
+                       [(1.0, 0.0, 0.0), (1.0, 1.0, 0.0), (1.0, 1.0, 0.0)])
+    return merge([body, nose, fins, window, flames])
+
+
+def star_outline(outer_radius=1.0, inner_radius=0.4, depth=0.3, points=5):
+    """Alternating outer/inner star points with the subtle sine z contour"""
+    i = np.arange(2 * points)
+    angle = np.pi * i / points
+    radius = np.where(i % 2 == 0, outer_radius, inner_radius)
+    z = np.sin(i * np.pi / points) * (depth * 0.2)
+    return np.stack([radius * np.cos(angle), radius * np.sin(angle), z], axis=-1)
+
+
+def star_prism(outer_radius=1.0, inner_radius=0.4, depth=0.3, points=5):
+    """Raised 3D star: front fan, back fan and a side wall, with vertex colors"""
+    outline = star_outline(outer_radius, inner_radius, depth, points)
+    n = len(outline)
+    even = (np.arange(n) % 2 == 0)[:, None]
+
+    # Front face
+    front = np.vstack([[0.0, 0.0, depth], outline + [0.0, 0.0, depth * 0.1]])
+    front_colors = np.vstack([[1.0, 0.84, 0.0],
+                              np.where(even, [1.0, 0.7, 0.0], [1.0, 0.9, 0.4])])
+    front_mesh = MeshData(_f32(front), _flat_normals(n + 1), _f32(np.zeros((n + 1, 2))),
+                          _f32(front_colors), fan_indices(n))
+
+    # Back face (z dicerminkan)
+    back = np.vstack([[0.0, 0.0, -depth], outline * [1.0, 1.0, -1.0] - [0.0, 0.0, depth * 0.1]])
+    back_colors = np.vstack([[1.0, 0.84, 0.0],
+                             np.where(even, [1.0, 0.5, 0.0], [1.0, 0.8, 0.3])])
+    back_mesh = MeshData(_f32(back), _flat_normals(n + 1, (0.0, 0.0, -1.0)),
+                         _f32(np.zeros((n + 1, 2))), _f32(back_colors), fan_indices(n))
+
+    # Sides: n + 1 columns so the color gradient can wrap back to the start
+    cols = np.arange(n + 1)
+    ring = outline[cols % n]
+    side = np.stack([ring + [0.0, 0.0, depth * 0.1],
+                     ring * [1.0, 1.0, -1.0] - [0.0, 0.0, depth * 0.1]], axis=1)
+    factor = cols / n
+    side_colors = np.stack([
+        np.stack([np.ones(n + 1), 0.6 + 0.3 * factor, np.full(n + 1, 0.2)], axis=-1),
+        np.stack([np.ones(n + 1), 0.5 + 0.3 * factor, np.zeros(n + 1)], axis=-1),
+    ], axis=1)
+    radial = ring[:, :2] / np.linalg.norm(ring[:, :2], axis=1, keepdims=True)
+    side_normals = np.repeat(np.hstack([radial, np.zeros((n + 1, 1))])[:, None], 2, axis=1)
+    side_mesh = MeshData(_f32(side.reshape(-1, 3)), _f32(side_normals.reshape(-1, 3)),
+                         _f32(np.zeros((2 * (n + 1), 2))), _f32(side_colors.reshape(-1, 3)),
+                         strip_indices(n + 1))
+
+    return merge([front_mesh, back_mesh, side_mesh])
+
+
+def _ellipse_ring(segments, scale):
+    theta = 2.0 * np.pi * np.arange(segments + 1) / segments
+    return np.cos(theta) * scale[0], np.sin(theta) * scale[1], np.arange(segments + 1) / segments
+
+
+def annulus_strip(inner_radius, outer_radius, segments=100, z=0.0,
+                  normal=(0.0, 0.0, 1.0), scale=(1.0, 1.0)):
+    """Flat elliptical annulus at height z (one face of Saturn's ring).
+
+    u is radial (0 at the inner edge, 1 at the outer edge), v runs around.
+    """
+    x, y, s = _ellipse_ring(segments, scale)
+    radii = np.array([inner_radius, outer_radius])
+    positions = np.zeros((segments + 1, 2, 3))
+    positions[..., 0] = x[:, None] * radii
+    positions[..., 1] = y[:, None] * radii
+    positions[..., 2] = z
+    uvs = np.stack(np.broadcast_arrays(np.array([0.0, 1.0]), s[:, None]), axis=-1)
+    count = 2 * (segments + 1)
+    return MeshData(_f32(positions.reshape(-1, 3)), _flat_normals(count, normal),
+                    _f32(uvs.reshape(-1, 2)), None, strip_indices(segments + 1))
+
+
+def elliptic_wall(radius, z0, z1, segments=100, scale=(1.0, 1.0), outward=True, u=0.0):
+    """Vertical wall along an ellipse between z0 and z1 (ring edge), texture column u"""
+    x, y, s = _ellipse_ring(segments, scale)
+    positions = np.zeros((segments + 1, 2, 3))
+    positions[..., 0] = (x * radius)[:, None]
+    positions[..., 1] = (y * radius)[:, None]
+    positions[..., 2] = [z0, z1]
+    # Normal elips: gradien dari (x/a)^2 + (y/b)^2
+    normal = np.stack([x / scale[0] ** 2, y / scale[1] ** 2, np.zeros_like(x)], axis=-1)
+    normal /= np.linalg.norm(normal, axis=1, keepdims=True)
+    if not outward:
+        normal = -normal
+    uvs = np.stack(np.broadcast_arrays(np.full((segments + 1, 2), u), s[:, None]), axis=-1)
+    return MeshData(_f32(positions.reshape(-1, 3)), _f32(np.repeat(normal, 2, axis=0)),
+                    _f32(uvs.reshape(-1, 2)), None, strip_indices(segments + 1))
+
+
+def saturn_ring(inner_radius=1.1, outer_radius=1.6, segments=100, thickness=0.1,
+                scale=(1.2, 0.9)):
+    """Closed annular prism: both faces and both edges in one indexed mesh.
+
+    Texture u is the radial position (see textures.ring_band_data); the
+    edges sample the innermost and outermost column.
+    """
+    half = thickness / 2
+    return merge([
+        annulus_strip(inner_radius, outer_radius, segments, half, (0.0, 0.0, 1.0), scale),
+        annulus_strip(inner_radius, outer_radius, segments, -half, (0.0, 0.0, -1.0), scale),
+        elliptic_wall(outer_radius, -half, half, segments, scale, outward=True, u=1.0),
+        elliptic_wall(inner_radius, -half, half, segments, scale, outward=False, u=0.0),
+    ])
+
+
+def oriented_strip(rows_a, rows_b, normals, uvs):
+    """Quad strip between two vertex rows, wound counter-clockwise around `normals`"""
+    # Segitiga pertama menentukan arah putaran; tukar baris kalau terbalik
+    winding = np.cross(rows_b[0] - rows_a[0], rows_a[1] - rows_a[0])
+    if np.dot(winding, normals[0]) < 0:
+        rows_a, rows_b = rows_b, rows_a
+        uvs = uvs[:, ::-1]
+    positions = np.stack([rows_a, rows_b], axis=1).reshape(-1, 3)
+    return MeshData(_f32(positions), _f32(np.repeat(normals, 2, axis=0)),
+                    _f32(uvs.reshape(-1, 2)), None, strip_indices(len(rows_a)))
+
+
+def crescent_prism(radius=0.8, thickness=0.3, segments=36, offset_ratio=0.45,
+                   start_angle=np.radians(45), end_angle=np.radians(315)):
+    """Closed crescent moon: outer and shifted inner arc walls, top and bottom faces, end caps.
+
+    Every face is one indexed strip wound outwards, sharing each column of
+    vertices between neighbouring quads. Faces are then welded: where a cap
+    meets the outer wall almost flush, the two share vertices; at the hard
+    creases (walls to top and bottom, caps to the inner wall) each side
+    keeps its own vertices at identical positions, so the mesh stays
+    watertight. Texture coordinates project the moon disc from the front,
+    the same on every face, so the texture runs over the edges.
+    """
+    angle = start_angle + (end_angle - start_angle) * np.arange(segments + 1) / segments
+    radial = np.stack([np.cos(angle), np.sin(angle), np.zeros_like(angle)], axis=-1)
+    tangent = np.stack([-radial[:, 1], radial[:, 0], np.zeros_like(angle)], axis=-1)
+    lift = np.array([0.0, 0.0, thickness / 2])
+    up = np.broadcast_to([0.0, 0.0, 1.0], radial.shape)
+
+    outer = radial * radius
+    # Lingkaran dalam digeser ke kanan: bentuk sabit
+    inner = radial * (radius - thickness) + [radius * offset_ratio, 0.0, 0.0]
+
+    def uv(rows_a, rows_b):
+        return np.stack([0.5 + rows_a[:, :2] / (2 * radius),
+                         0.5 + rows_b[:, :2] / (2 * radius)], axis=1)
+
+    def cap(i, direction):
+        # Tutup ujung: normal tegak lurus garis luar-dalam, menjauhi busur
+        edge = outer[i] - inner[i]
+        normal = np.array([edge[1], -edge[0], 0.0]) / np.linalg.norm(edge[:2])
+        if np.dot(normal, tangent[i]) * direction < 0:
+            normal = -normal
+        rows_a = np.stack([outer[i] + lift, inner[i] + lift])
+        rows_b = np.stack([outer[i] - lift, inner[i] - lift])
+        return oriented_strip(rows_a, rows_b, np.stack([normal, normal]), uv(rows_a, rows_b))
+
+    faces = [
+        (outer + lift, outer - lift, radial),   # outer arc
+        (inner + lift, inner - lift, -radial),  # inner arc
+        (inner + lift, outer + lift, up),       # top face
+        (inner - lift, outer - lift, -up),      # bottom face
+    ]
+    return weld(merge([oriented_strip(a, b, normals, uv(a, b)) for a, b, normals in faces] +
+                      [cap(0, -1.0), cap(segments, 1.0)]))
+
+
+def interleave(mesh):
+    """Pack a MeshData into one float32 array (position, normal, uv, color).
+
+    Returns (vertices, layout) where layout maps attribute name to
+    (component count, offset in floats) and missing attributes are skipped.
+    """
+    parts = []
+    layout = {}
+    offset = 0
+    for name in ('positions', 'normals', 'uvs', 'colors'):
+        arr = getattr(mesh, name)
+        if arr is None:
+            continue
+        layout[name] = (arr.shape[1], offset)
+        offset += arr.shape[1]
+        parts.append(arr)
+    return _f32(np.hstack(parts)), layout
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""Instanced drawing: one mesh, thousands of copies in a single draw call.
+
+An InstanceSet keeps the per-instance attributes in one NumPy array of
+INSTANCE_FLOATS floats per row:
+
+    offset_scale  vec4   position (x, y, z) and uniform scale
+    rotation      vec4   unit quaternion (x, y, z, w)
+    color         vec3   multiplied with the mesh / node color
+
+InstanceBuffer is the GPU copy of a set and is re-uploaded only when the
+set's revision changed. Drawing uses glDrawElementsInstanced with
+glVertexAttribDivisor (GL 3.3 and the core renderer) or the ARB
+draw_instanced / instanced_arrays extensions; `instancing_support` tells
+which one a legacy context has.
+
+Software rasterizers (llvmpipe) pay a fixed cost per instance and per
+vertex, so far-away instances of a few pixels are better drawn as points:
+the same buffer read with POINT_ATTRIBUTES (divisor 0) is one vertex per
+instance in a plain glDrawArrays(GL_POINTS).
+"""
+
+import ctypes
+
+import numpy as np
+from OpenGL import GL
+from OpenGL.GL.ARB import draw_instanced, instanced_arrays
+
+import mesh
+
+INSTANCE_FLOATS = 11
+
+# (lokasi atribut, jumlah float, offset) -- sama dengan layout di shaders.py
+INSTANCE_ATTRIBUTES = [(5, 4, 0), (6, 4, 4), (7, 3, 8)]
+# Sebagai titik: offset_scale di lokasi 0 (profil compatibility hanya
+# menggambar bila atribut 0 aktif) dan warna
+POINT_ATTRIBUTES = [(0, 4, 0), (7, 3, 8)]
+
+_STRIDE = INSTANCE_FLOATS * 4
+
+
+def quaternions(axes, degrees):
+    """Unit quaternions (N, 4) for rotations of `degrees` about `axes` (N, 3)"""
+    axes = np.asarray(axes, dtype=np.float64)
+    axes = axes / np.linalg.norm(axes, axis=-1, keepdims=True)
+    half = np.radians(np.asarray(degrees, dtype=np.float64))[..., None] * 0.5
+    return np.concatenate([axes * np.sin(half), np.cos(half)], axis=-1)
+
+
+def quaternion_multiply(a, b):
+    """Hamilton product a * b (rotate by b first, then a), row-wise"""
+    ax, ay, az, aw = np.moveaxis(np.asarray(a, dtype=np.float64), -1, 0)
+    bx, by, bz, bw = np.moveaxis(np.asarray(b, dtype=np.float64), -1, 0)
+    return np.stack([aw * bx + ax * bw + ay * bz - az * by,
+                     aw * by - ax * bz + ay * bw + az * bx,
+                     aw * bz + ax * by - ay * bx + az * bw,
+                     aw * bw - ax * bx - ay * by - az * bz], axis=-1)
+
+
+class InstanceSet(object):
+    """Per-instance offset, scale, rotation and color of one instanced mesh"""
+
+    def __init__(self, positions, scales=1.0, rotations=None, colors=None):
+        positions = np.asarray(positions, dtype=np.float32)
+        self.data = np.zeros((len(positions), INSTANCE_FLOATS), dtype=np.float32)
+        self.data[:, 6] = 1.0  # Quaternion identitas
+        self.data[:, 8:11] = 1.0
+        self.revision = 0
+        self.update(positions, scales, rotations, colors)
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def positions(self):
+        return self.data[:, 0:3]
+
+    @property
+    def scales(self):
+        return self.data[:, 3]
+
+    def replace(self, data):
+        """Swap in new rows (N, INSTANCE_FLOATS); the count may change"""
+        self.data = np.ascontiguousarray(data, dtype=np.float32).reshape(-1, INSTANCE_FLOATS)
+        self.revision += 1
+
+    def update(self, positions=None, scales=None, rotations=None, colors=None):
+        """Overwrite some attributes (arrays or broadcastable values)"""
+        if positions is not None:
+            self.data[:, 0:3] = positions
+        if scales is not None:
+            self.data[:, 3] = scales
+        if rotations is not None:
+            self.data[:, 4:8] = rotations
+        if colors is not None:
+            self.data[:, 8:11] = colors
+        self.revision += 1
+
+
+def pixel_radii(instances, model_view, radius, pixel_scale):
+    """Screen radius in pixels of every instance (see lod.projected_radius).
+
+    `instances` is an InstanceSet or rows of its `data`; `radius` is the
+    mesh radius already multiplied by the model-view scale,
+    `pixel_scale` = viewport_height / 2 / tan(fovy / 2).
+    """
+    data = instances.data if isinstance(instances, InstanceSet) else instances
+    eye = data[:, 0:3] @ model_view[:3, :3].T + model_view[:3, 3]
+    with np.errstate(divide='ignore'):
+        return radius * data[:, 3] * pixel_scale / np.linalg.norm(eye, axis=1)
+
+
+def star_field(count, seed=7, radius=(2.5, 6.0), size=(0.04, 0.1)):
+    """Stars scattered through a spherical shell, same field for the same seed.
+
+    Random numbers are drawn in the same order as the old one-node-per-star
+    saturn_stars preset, so that field looks the same.
+    """
+    rng = np.random.default_rng(seed)
+    directions = rng.normal(size=(count, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    positions = directions * rng.uniform(radius[0], radius[1], size=(count, 1))
+    sizes = rng.uniform(size[0], size[1], size=count)
+    angles = rng.uniform(0.0, 360.0, size=(count, 2))
+    # rotation(ax, 1,0,0) @ rotation(ay, 0,1,0): putar y dulu, lalu x
+    rotations = quaternion_multiply(quaternions([(1.0, 0.0, 0.0)], angles[:, 0]),
+                                    quaternions([(0.0, 1.0, 0.0)], angles[:, 1]))
+    return InstanceSet(positions, sizes, rotations)
+
+
+def star_backdrop(count, seed=3, width=80.0, height=(-8.0, 34.0), depth=(-60.0, -15.0),
+                  size=(0.02, 0.07)):
+    """Stars in a wide slab far behind the scene (night sky seen from the front)"""
+    rng = np.random.default_rng(seed)
+    positions = np.stack([rng.uniform(-width / 2, width / 2, count),
+                          rng.uniform(height[0], height[1], count),
+                          rng.uniform(depth[0], depth[1], count)], axis=-1)
+    axes = rng.normal(size=(count, 3))
+    rotations = quaternions(axes, rng.uniform(0.0, 360.0, count))
+    # Sebagian bintang sedikit kebiruan / redup
+    colors = rng.uniform(0.6, 1.0, size=(count, 1)) * [1.0, 1.0, 1.0]
+    colors[:, 2] = np.minimum(colors[:, 2] * rng.uniform(1.0, 1.4, count), 1.0)
+    return InstanceSet(positions, rng.uniform(size[0], size[1], count), rotations, colors)
+
+
+def cloud_bank(count, seed=11, width=14.0, height=(-2.6, -1.2), depth=(-8.0, 0.0),
+               size=(0.15, 0.4)):
+    """Flat clouds facing the camera, spread over a band below the horizon"""
+    rng = np.random.default_rng(seed)
+    positions = np.stack([rng.uniform(-width / 2, width / 2, count),
+                          rng.uniform(height[0], height[1], count),
+                          rng.uniform(depth[0], depth[1], count)], axis=-1)
+    # Awan di belakang sedikit lebih gelap supaya ada kesan kedalaman
+    shade = np.interp(positions[:, 2], depth, (0.7, 1.0))[:, None]
+    return InstanceSet(positions, rng.uniform(size[0], size[1], count),
+                       colors=np.repeat(shade, 3, axis=1))
+
+
+def instancing_support():
+    """'core', 'arb' or None for the current (legacy) context"""
+    version = GL.glGetString(GL.GL_VERSION)
+    try:
+        major, minor = (int(v) for v in version.split()[0].split(b'.')[:2])
+    except (AttributeError, ValueError):
+        major = minor = 0
+    if (major, minor) >= (3, 3):
+        return 'core'
+    if draw_instanced.glInitDrawInstancedARB() and instanced_arrays.glInitInstancedArraysARB():
+        return 'arb'
+    return None
+
+
+def _functions(support):
+    if support == 'arb':
+        return (instanced_arrays.glVertexAttribDivisorARB,
+                draw_instanced.glDrawElementsInstancedARB)
+    return GL.glVertexAttribDivisor, GL.glDrawElementsInstanced
+
+
+class InstanceBuffer(object):
+    """GPU copy of an InstanceSet, uploaded again only after `update`"""
+
+    def __init__(self, support='core'):
+        self.vbo = GL.glGenBuffers(1)
+        self.capacity = 0
+        self.revision = None
+        self.count = 0
+        self.divisor, self._draw = _functions(support)
+
+    def sync(self, instances):
+        if instances.revision == self.revision and len(instances) == self.count:
+            return
+        data = instances.data
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        if data.nbytes > self.capacity:
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, data.nbytes, data, GL.GL_DYNAMIC_DRAW)
+            self.capacity = data.nbytes
+        else:
+            GL.glBufferSubData(GL.GL_ARRAY_BUFFER, 0, data.nbytes, data)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        self.revision = instances.revision
+        self.count = len(instances)
+
+    def enable(self, attributes=INSTANCE_ATTRIBUTES, divisor=1):
+        """Point `attributes` at this buffer; divisor 0 reads one row per vertex"""
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        for location, size, offset in attributes:
+            GL.glEnableVertexAttribArray(location)
+            GL.glVertexAttribPointer(location, size, GL.GL_FLOAT, GL.GL_FALSE, _STRIDE,
+                                     ctypes.c_void_p(offset * 4))
+            if divisor:
+                self.divisor(location, divisor)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def disable(self, attributes=INSTANCE_ATTRIBUTES, divisor=1):
+        # Tanpa VAO divisor ikut state global: kembalikan ke 0
+        for location, _, _ in attributes:
+            if divisor:
+                self.divisor(location, 0)
+            GL.glDisableVertexAttribArray(location)
+
+    def draw(self, scene_mesh):
+        """Draw `count` copies of the bound `scene_mesh`"""
+        self._draw(scene_mesh.mode, scene_mesh.index_count, GL.GL_UNSIGNED_INT,
+                   ctypes.c_void_p(0), self.count)
+        if mesh.draw_counter is not None:
+            mesh.draw_counter(scene_mesh.index_count * self.count)
+
+    def draw_points(self, ranges=None):
+        """One point per instance (buffer enabled with POINT_ATTRIBUTES, divisor 0).
+
+        `ranges` = (firsts, counts) limits drawing to those rows, in one
+        glMultiDrawArrays call.
+        """
+        if ranges is None:
+            GL.glDrawArrays(GL.GL_POINTS, 0, self.count)
+            count = self.count
+        else:
+            firsts, counts = ranges
+            if not len(firsts):
+                return
+            GL.glMultiDrawArrays(GL.GL_POINTS, firsts, counts, len(firsts))
+            count = int(np.sum(counts))
+        if mesh.draw_counter is not None:
+            mesh.draw_counter(count)
+
+    def delete(self):
+        GL.glDeleteBuffers(1, [self.vbo])
+        self.vbo = 0
+
+
+class InstancedVertexArray(object):
+    """VAO over an InstanceBuffer (core profile).
+
+    With a VertexArrayMesh the VAO draws instanced copies of it; without
+    one it draws the instances as points.
+    """
+
+    def __init__(self, buffer, vertex_mesh=None):
+        self.mesh = vertex_mesh
+        self.buffer = buffer
+        self.vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self.vao)
+        if vertex_mesh is None:
+            buffer.enable(POINT_ATTRIBUTES, divisor=0)
+        else:
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vertex_mesh.vbo)
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, vertex_mesh.ibo)
+            for name, (size, offset) in vertex_mesh.layout.items():
+                location = mesh.ATTRIBUTE_LOCATIONS[name]
+                GL.glEnableVertexAttribArray(location)
+                GL.glVertexAttribPointer(location, size, GL.GL_FLOAT, GL.GL_FALSE,
+                                         vertex_mesh.stride, ctypes.c_void_p(offset * 4))
+            buffer.enable()
+        GL.glBindVertexArray(0)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def draw(self, instances, ranges=None):
+        self.buffer.sync(instances)
+        GL.glBindVertexArray(self.vao)
+        if self.mesh is None:
+            self.buffer.draw_points(ranges)
+        else:
+            self.buffer.draw(self.mesh)
+
+    def delete(self):
+        # Buffer dimiliki pemanggil (bisa dipakai beberapa VAO)
+        GL.glDeleteVertexArrays(1, [self.vao])
+        self.vao = 0
@@ -2,35 +2,74 @@
 
 from PyQt5 import QtCore, QtGui, QtWidgets, QtOpenGL
 from PyQt5.QtCore import Qt, QPointF, QRectF, pyqtSignal
-from OpenGL import GL,GLU
+from OpenGL import GL
 import math
 import random
 from PIL import Image
 import os
-
-class SceneGLWidget(QtOpenGL.QGLWidget):
+import sys
+import time
+
+import instancing
+import mesh
+import presets
+import timeline
+import video
+from capture import FrameCapture
+from core_renderer import CoreRenderer
+from mesh import Mesh, MeshCache, VertexArrayMesh
+from profiler import FrameProfiler, NullProfiler
+from recorder import record
+from scheduler import FrameScheduler
+from shaders import COMPAT_SOURCES, ShaderLibrary
+from textures import TextureLoader
+from transform_state import TransformState, transform_property
+from transforms import SceneMatrices, gl_matrix
+
+# Folder tekstur relatif terhadap file ini, bukan terhadap working directory
+TEXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "textures")
+
+# Scene yang dianimasikan (berputar terus); scene komposit ada di presets.py
+ANIMATED_SCENES = ['saturn', 'star', 'earth', 'moon', 'earth_moon', 'saturn_stars']
+SCENES = ['lightning', 'cloud', 'rainbow', 'rocket', 'rainbow_clouds', 'night_sky'] + ANIMATED_SCENES
+
+class SceneWidgetBase(object):
+    """State, input handling and signals shared by both scene renderers.
+
+    Mixed into a GL widget class: SceneGLWidget (QGLWidget, fixed-function
+    pipeline) or SceneCoreWidget (QOpenGLWidget, core profile + shaders).
+    """
     rotationChanged = pyqtSignal(float, float, float)
     translationChanged = pyqtSignal(float, float, float) # Ubah sinyal untuk menyertakan Z
     scaleChanged = pyqtSignal(float)
     scale3DChanged = pyqtSignal(float, float, float)  # Tambah sinyal untuk skala 3D
     colorChanged = pyqtSignal(float, float, float)
 
+    # Nilai transformasi disimpan di self.transform (TransformState)
+    rotation_x = transform_property('rotation_x')
+    rotation_y = transform_property('rotation_y')
+    rotation_z = transform_property('rotation_z')
+    translation_x = transform_property('translation_x')
+    translation_y = transform_property('translation_y')
+    translation_z = transform_property('translation_z')  # Tambah translasi Z
+    scale = transform_property('scale')
+    scale_x = transform_property('scale_x')  # Skala sumbu X
+    scale_y = transform_property('scale_y')  # Skala sumbu Y
+    scale_z = transform_property('scale_z')  # Skala sumbu Z
 
     def __init__(self, parent=None):
-        super(SceneGLWidget, self).__init__(parent)
+        super(SceneWidgetBase, self).__init__(parent)
         self.setMinimumSize(400, 400)
         self.setFocusPolicy(Qt.StrongFocus)  # Enable keyboard focus
         self.current_scene = 'none'
-        self.translation_x = 0
-        self.translation_y = 0
-        self.translation_z = 0  # Tambah translasi Z
-        self.rotation_x = 0
-        self.rotation_y = 0
-        self.rotation_z = 0
-        self.scale = 1.0
-        self.scale_x = 1.0  # Skala sumbu X
-        self.scale_y = 1.0  # Skala sumbu Y
-        self.scale_z = 1.0  # Skala sumbu Z
+
+        # Perubahan dalam satu putaran event loop digabung jadi satu
+        # notifikasi (dan satu repaint)
+        self.transform = TransformState(self)
+        self.transform.changed.connect(self.on_transform_changed)
+        # Matriks model-view / proyeksi di CPU, dihitung ulang hanya kalau berubah
+        self.matrices = SceneMatrices(self.transform)
+        self.paint_count = 0
         
         
         self.object_color = {
@@ -44,30 +83,69 @@ class SceneGLWidget(QtOpenGL.QGLWidget):
         # Mouse interaction variables
         self.last_pos = QtCore.QPoint()
         self.rotation_speed = 1.0
-        self.pan_speed = 0.01
         self.zoom_speed = 0.1
         self.is_rotating = False
         self.is_panning = False
 
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.update_animation)
-        self.timer.start(16)  # Sekitar 60 FPS
+        # Repaint hanya kalau ada perubahan atau animasi berjalan;
+        # animasi berhenti saat jendela tersembunyi / tidak aktif
+        self.spin_speed = 60.0  # derajat per detik (dulu 1 derajat per tick 16 ms)
+        self.scheduler = FrameScheduler(self)
+        # Animasi dari keyframe (timeline.py), dievaluasi dari waktu animasi
+        self.timeline = timeline.turntable(self.spin_speed)
+        self.animation_time = 0.0
 
         self.earth_texture = None
         self.moon_texture = None
         self.saturn_texture = None
-        self.saturn_ring_texture = None  # Tambahkan variabel untuk tekstur cincin
+        # Tekstur procedural (procedural.py), dibuat saat initializeGL
+        self.saturn_ring_texture = None
+        self.cloud_texture = None
+        self.rainbow_texture = None
+        self.star_glow_texture = None
+
+        # Tekstur di-decode di thread pool, di-upload di paintGL
+        # LANGIT_COMPRESS_TEXTURES=1 -> upload BC1/BC4 kalau driver mendukung
+        self.textures = TextureLoader(
+            compress=os.environ.get('LANGIT_COMPRESS_TEXTURES') == '1', parent=self)
+        self.textures.textureDecoded.connect(lambda path: self.update())
+
+        # Mesh disimpan di VBO (plus VAO di renderer core), kunci per bentuk
+        self.meshes = MeshCache(self.mesh_class)
+
+        # Level of detail: tessellasi mengikuti ukuran objek di layar
+        self.camera_distance = 5.0
+        self.fovy = 45.0
+        self.viewport_height = 400
+
+        # Scene graph per scene (presets.py), dibuat saat pertama digambar
+        self.scene_graphs = {}
+        # Frustum culling per node / sel instance (C untuk mematikan)
+        self.culling = os.environ.get('LANGIT_CULLING') != '0'
+
+        # Capture frame lewat ring PBO (capture.py): screenshot F12, rekam video F10
+        self.capture = FrameCapture(self)
+        self.capture_dir = os.environ.get('LANGIT_CAPTURE_DIR', 'captures')
+        self.recording = None
+        self.recording_timer = QtCore.QTimer(self)
+        self.recording_timer.setTimerType(Qt.PreciseTimer)
+        self.recording_timer.timeout.connect(self.update)
+        self.viewport_size = (400, 400)
+
+        # Profiling per frame (F3, atau LANGIT_PROFILE=1); NullProfiler kalau mati
+        self.profiler = NullProfiler()
+        self.profile_dump = os.environ.get('LANGIT_PROFILE_DUMP')
+        if os.environ.get('LANGIT_PROFILE') == '1':
+            self.set_profiling(True)
         
         self.setFocusPolicy(Qt.StrongFocus)
 
     def set_scene(self, scene_name):
         """Set the current scene to draw"""
         self.current_scene = scene_name
-        if scene_name in ['saturn', 'star', 'earth', 'moon']:
-            if not self.timer.isActive():
-                self.timer.start(16)
-        else:
-            self.timer.stop()
+        self.scheduler.set_animating(scene_name in ANIMATED_SCENES)
+        if scene_name not in ANIMATED_SCENES:
+            # Objek 2D selalu digambar menghadap kamera
             self.rotation_x = 0
             self.rotation_y = 0
             self.rotation_z = 0
@@ -76,139 +154,221 @@ class SceneGLWidget(QtOpenGL.QGLWidget):
     def set_object_color(self, r, g, b):
         """Set color for the current 2D object"""
         if self.current_scene in ['lightning', 'cloud', 'rocket']:  # Only for objects that support color change
+            previous = self.object_color[self.current_scene]
             self.object_color[self.current_scene] = (r, g, b)
             self.current_color = (r, g, b)
+            # Warna ada di node / kunci mesh: graph scene ini dibangun ulang
+            self.scene_graphs.pop(self.current_scene, None)
+            if self.current_scene == 'rocket' and tuple(previous) != (r, g, b):
+                # Mesh roket warna lama tidak dipakai lagi
+                if self.isVisible():
+                    self.makeCurrent()
+                self.meshes.discard(presets.rocket_key(previous))
             self.colorChanged.emit(r, g, b)
             self.update()
 
-    def update_animation(self):
-        if self.current_scene in ['saturn', 'star', 'earth', 'moon']:
-            self.rotation_x = (self.rotation_x + 1) % 360
-            self.rotation_y = (self.rotation_y + 1) % 360
-            self.rotation_z = (self.rotation_z + 1) % 360
-            self.update()
+    def set_profiling(self, enabled, hud=True):
+        """Turn frame profiling (and its HUD) on or off.
 
-    def initializeGL(self):
-        GL.glEnable(GL.GL_DEPTH_TEST)
-        GL.glEnable(GL.GL_TEXTURE_2D)
-        GL.glClearColor(0.1, 0.1, 0.1, 1.0)
-        
-        # Setup lighting
-        GL.glEnable(GL.GL_LIGHTING)
-        GL.glEnable(GL.GL_LIGHT0)
-        GL.glEnable(GL.GL_COLOR_MATERIAL)
-        
-        # Set light position and properties
-        GL.glLight(GL.GL_LIGHT0, GL.GL_POSITION, (5.0, 5.0, 5.0, 1.0))
-        GL.glLight(GL.GL_LIGHT0, GL.GL_AMBIENT, (0.2, 0.2, 0.2, 1.0))
-        GL.glLight(GL.GL_LIGHT0, GL.GL_DIFFUSE, (1.0, 1.0, 1.0, 1.0))
-        
-        # Load earth texture
-        # Pastikan Anda memiliki folder 'textures' dengan gambar yang sesuai
-        # Contoh: textures/earth.png, textures/moon.png, textures/saturn.png
-        self.earth_texture = self.load_texture(os.path.join("textures", "earth.png"))
-        self.moon_texture = self.load_texture(os.path.join("textures", "moon.png"))
-        self.saturn_texture = self.load_texture(os.path.join("textures", "saturn.png"))
-        self.saturn_ring_texture = self.load_texture(os.path.join("textures", "saturn.png"))  # Load tekstur cincin
-
-    def load_texture(self, image_path):
-        """Load texture from image file"""
-        if not os.path.exists(image_path):
-            print(f"Error: Texture file not found at {image_path}")
-            return None
-        try:
-            # Buka gambar menggunakan PIL
-            image = Image.open(image_path)
-            image = image.transpose(Image.FLIP_TOP_BOTTOM)
-            img_data = image.convert("RGBA").tobytes()
-            
-            # Generate texture ID
-            texture_id = GL.glGenTextures(1)
-            
-            # Bind dan set parameter tekstur
-            GL.glBindTexture(GL.GL_TEXTURE_2D, texture_id)
-            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
-            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
-            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, GL.GL_REPEAT)
-            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, GL.GL_REPEAT)
-            
-            # Upload tekstur
-            GL.glTexImage2D(
-                GL.GL_TEXTURE_2D, 0, GL.GL_RGBA,
-                image.width, image.height,
-                0, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, img_data
-            )
-            
-            return texture_id
-        except Exception as e:
-            print(f"Error loading texture from {image_path}: {e}")
+        Returns the profiler that was stopped when disabling, with its frames
+        (written to LANGIT_PROFILE_DUMP if set), otherwise None.
+        """
+        if enabled == self.profiler.enabled:
+            self.profiler.show_hud = enabled and hud
+            self.update()
             return None
+        finished = None
+        if enabled:
+            self.profiler = FrameProfiler()
+            self.profiler.show_hud = hud
+            mesh.draw_counter = self.profiler.count_draw
+            # Swap dilakukan sendiri di paintGL supaya waktunya ikut terukur
+            self.set_manual_swap(True)
+        else:
+            finished = self.profiler
+            if self.isVisible():
+                self.makeCurrent()  # Headless: konteks sudah aktif
+            finished.finish()
+            if self.profile_dump:
+                finished.dump(self.profile_dump)
+            finished.delete()
+            self.profiler = NullProfiler()
+            mesh.draw_counter = None
+            self.set_manual_swap(False)
+        self.update()
+        return finished
 
-    def resizeGL(self, w, h):
-        GL.glViewport(0, 0, w, h)
-        GL.glMatrixMode(GL.GL_PROJECTION)
-        GL.glLoadIdentity()
-        aspect = w / h if h != 0 else 1
-        # Gunakan gluPerspective untuk efek 3D yang lebih baik pada translasi Z
-        GLU.gluPerspective(45, aspect, 0.1, 100.0) # fovy, aspect, zNear, zFar
-        GL.glMatrixMode(GL.GL_MODELVIEW)
-        GL.glLoadIdentity()
-        # Set posisi kamera awal (misalnya sedikit menjauh)
-        GLU.gluLookAt(0, 0, 5,  # Posisi kamera (x, y, z)
-                      0, 0, 0,  # Titik yang dilihat kamera (center of scene)
-                      0, 1, 0)  # Vektor 'up'
+    def set_culling(self, enabled):
+        """Skip nodes and instance cells outside the view frustum"""
+        self.culling = bool(enabled)
+        self.update()
 
-    def paintGL(self):
-        # Reset state OpenGL
-        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
-        GL.glLoadIdentity() # Reset modelview matrix
+    def scene_graph(self, name=None):
+        """SceneGraph of scene `name` (default: the current one), or None"""
+        name = name or self.current_scene
+        graph = self.scene_graphs.get(name)
+        if graph is None and name in presets.PRESETS:
+            graph = self.scene_graphs[name] = presets.build(name, self)
+        return graph
+
+    def advance_animation(self, dt):
+        """Play the timeline of the current 3D scene on by `dt` seconds of wall time"""
+        if self.current_scene in ANIMATED_SCENES:
+            previous = self.animation_time
+            self.animation_time += dt
+            self.apply_timeline(self.animation_time, previous=previous)
+
+    def set_animation_time(self, time, values=None):
+        """Pose the current scene at `time` seconds of the timeline (scrubbing, export).
+
+        `values` can be one row of timeline.evaluate_many(...) for `time`.
+        """
+        self.animation_time = time
+        self.apply_timeline(time, values)
+        self.update()
 
-        # Set posisi kamera awal (penting untuk perspektif)
-        GLU.gluLookAt(0, 0, 5,  # Posisi kamera (x, y, z)
-                      0, 0, 0,  # Titik yang dilihat kamera (center of scene)
-                      0, 1, 0)  # Vektor 'up'
-        
-        GL.glDisable(GL.GL_TEXTURE_2D)  # Disable texture by default
-        GL.glColor3f(1.0, 1.0, 1.0)      # Reset color to white
-        
-        # Apply transformations (translasi Z akan lebih terlihat dengan gluPerspective)
-        GL.glTranslatef(self.translation_x, self.translation_y, self.translation_z)  # Tambah Z
-        GL.glRotatef(self.rotation_x, 1, 0, 0)
-        GL.glRotatef(self.rotation_y, 0, 1, 0)
-        GL.glRotatef(self.rotation_z, 0, 0, 1)
-        GL.glScalef(self.scale_x * self.scale, self.scale_y * self.scale, self.scale_z * self.scale)  # Skala 3D
-        
-        # Draw based on current scene
-        if self.current_scene == 'lightning':
-            GL.glDisable(GL.GL_LIGHTING)  # Disable lighting for 2D objects
-            self.draw_lightning()
-        elif self.current_scene == 'cloud':
-            GL.glDisable(GL.GL_LIGHTING)
-            self.draw_cloud()
-        elif self.current_scene == 'star':
-            GL.glEnable(GL.GL_LIGHTING)    # Enable lighting for 3D objects
-            self.draw_star()
-        elif self.current_scene == 'saturn':
-            GL.glEnable(GL.GL_LIGHTING)
-            self.draw_saturn()
-        elif self.current_scene == 'rainbow':
-            GL.glDisable(GL.GL_LIGHTING)
-            self.draw_rainbow()
-        elif self.current_scene == 'rocket':
-            GL.glDisable(GL.GL_LIGHTING)
-            self.draw_rocket()
-        elif self.current_scene == 'earth':
-            GL.glEnable(GL.GL_LIGHTING)
-            GL.glEnable(GL.GL_TEXTURE_2D)
-            self.draw_earth()
-            GL.glDisable(GL.GL_TEXTURE_2D)  # Disable texture after drawing earth
-        elif self.current_scene == 'moon':
-            GL.glEnable(GL.GL_LIGHTING)
-            self.draw_moon()
-
-        # Reset states after drawing
-        GL.glDisable(GL.GL_TEXTURE_2D)
-        GL.glDisable(GL.GL_LIGHTING)
+    def apply_timeline(self, time, values=None, previous=None):
+        """Apply the timeline at `time`; with `previous`, rotations move by the difference only"""
+        if values is None:
+            values = self.timeline.evaluate(time)
+        values = dict(values)
+        color = values.pop(timeline.COLOR_FIELD, None)
+        if previous is not None:
+            # Interaktif: rotasi dari mouse / keyboard selama animasi tetap berlaku
+            before = self.timeline.evaluate(previous)
+            for field in timeline.ANGLE_FIELDS:
+                if field in values:
+                    values[field] = (self.transform.values[field] + values[field] - before[field]) % 360
+        # Tanpa notifikasi: UI tidak perlu mengikuti animasi tiap frame
+        self.transform.set_values(notify=False, **{field: float(value) for field, value in values.items()})
+        graph = self.scene_graph()
+        if graph is not None:
+            graph.set_time(time)  # Node yang berputar sendiri (mis. orbit bulan)
+            if color is not None:
+                for node in graph.root.children:
+                    node.color = tuple(float(c) for c in color)
+
+    def on_transform_changed(self, groups):
+        """Forward one coalesced transform change to the UI and repaint once"""
+        transform = self.transform
+        if 'rotation' in groups:
+            self.rotationChanged.emit(*transform.group('rotation'))
+        if 'translation' in groups:
+            self.translationChanged.emit(*transform.group('translation'))
+        if 'scale' in groups:
+            self.scaleChanged.emit(self.scale)
+        if 'scale3d' in groups:
+            self.scale3DChanged.emit(*transform.group('scale3d'))
+        self.update()
+
+    def set_manual_swap(self, enabled):
+        """Let paintGL swap buffers itself so the swap can be timed (if supported)"""
+
+    def swap_buffers(self):
+        """Swap buffers from paintGL when manual swapping is on"""
+
+    def initialize_resources(self):
+        """Texture requests and mesh preloads; called from initializeGL"""
+        # Load textures asynchronously; scenes use a placeholder until ready.
+        # Pastikan Anda memiliki folder 'textures' di samping langit.py
+        # Contoh: textures/earth.png, textures/moon.png, textures/saturn.png
+        self.textures.initialize_gl()
+        self.earth_texture = self.textures.request(os.path.join(TEXTURE_DIR, "earth.png"))
+        self.moon_texture = self.textures.request(os.path.join(TEXTURE_DIR, "moon.png"))
+        self.saturn_texture = self.textures.request(os.path.join(TEXTURE_DIR, "saturn.png"))
+        # Tekstur procedural: dibuat di process pool sekali, lalu dari cache
+        self.saturn_ring_texture = self.textures.request_procedural(
+            'ring_band', 256, seed=5, wrap=GL.GL_CLAMP_TO_EDGE)
+        self.cloud_texture = self.textures.request_procedural('cloud_noise', 128, seed=11)
+        self.rainbow_texture = self.textures.request_procedural(
+            'rainbow_gradient', 256, wrap=GL.GL_CLAMP_TO_EDGE)
+        self.star_glow_texture = self.textures.request_procedural(
+            'star_glow', 64, seed=3, wrap=GL.GL_CLAMP_TO_EDGE)
+
+        # Upload mesh bola (level LOD normal) sekali saja, bukan setiap frame
+        self.meshes.sphere(1.0, 32, 32)   # Bumi
+        self.meshes.sphere(0.91, 32, 32)  # Saturnus
+
+    def begin_paint(self):
+        """Start of paintGL: frame counter and profiler frame"""
+        self.paint_count += 1
+        self.profiler.begin_frame()
+
+    def upload_textures(self):
+        """Upload textures that finished decoding since the last frame"""
+        if self.textures.loading:
+            with self.profiler.phase('textures'):
+                self.textures.upload_ready()
+
+    def end_paint(self):
+        """End of paintGL: frame capture, HUD, timed swap and the profiler frame"""
+        profiler = self.profiler
+        if self.capture.active:
+            # Sebelum HUD dan swap: frame yang direkam tanpa overlay
+            with profiler.phase('capture'):
+                self.capture.on_frame(self.paint_count, *self.viewport_size)
+        if profiler.enabled:
+            # HUD dan swap manual hanya untuk jendela yang tampil (bukan headless)
+            if self.isVisible():
+                if profiler.show_hud:
+                    with profiler.phase('hud'):
+                        self.draw_hud()
+                self.swap_buffers()
+            profiler.end_frame()
+
+    def capture_next(self, frames, callback):
+        """Hand the next `frames` frames to callback(CapturedFrame) on the capture thread"""
+        self.capture.capture_next(frames, callback)
+
+    def capture_path(self, kind, extension):
+        os.makedirs(self.capture_dir, exist_ok=True)
+        now = time.time()
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(now)) + f"{now % 1:.3f}"[1:]
+        return os.path.join(self.capture_dir, f"{self.current_scene}_{kind}_{stamp}{extension}")
+
+    def save_screenshot(self):
+        """Save the next frame as a PNG in capture_dir"""
+        path = self.capture_path('screenshot', '.png')
+
+        def save(frame):
+            Image.fromarray(frame.rgba, 'RGBA').save(path)
+            print(f"Screenshot saved to {path}")
+        self.capture_next(1, save)
+
+    def toggle_recording(self, fps=60.0):
+        """Start or stop recording the viewport to a video in capture_dir"""
+        if self.recording is None:
+            self.start_recording(fps)
+        else:
+            self.stop_recording()
+
+    def start_recording(self, fps=60.0):
+        width, height = self.viewport_size
+        path = self.capture_path('recording', '.mp4')
+        encoder = video.open_encoder(path, width, height, fps)
+        # Frame ditempatkan menurut waktu paint: diulang kalau terlambat, dibuang kalau kelebihan
+        self.recording = recording = video.PacedWriter(encoder, time.perf_counter())
+        self.capture_next(sys.maxsize, lambda frame: recording.write(frame.rgba, frame.time))
+        # Scene statis atau animasi yang dijeda tidak di-repaint sendiri: repaint pada laju rekaman
+        self.recording_timer.start(max(int(1000.0 / fps), 1))
+
+    def stop_recording(self):
+        recording, self.recording = self.recording, None
+        self.recording_timer.stop()
+        if self.isVisible():
+            self.makeCurrent()
+        self.capture.finish()
+        recording.close(time.perf_counter())
+        encoder = recording.encoder
+        print(f"Recording saved to {encoder.path} ({encoder.frames} frames, {recording.repeated} "
+              f"repeated, {recording.dropped} dropped); {self.capture.report()}")
+
+    def resize_recording(self):
+        """After a resize: the video keeps its frame size, so continue in a new file"""
+        if self.recording is not None and self.recording.size != self.viewport_size:
+            fps = self.recording.encoder.fps
+            self.stop_recording()
+            self.start_recording(fps)
 
     # Mouse interaction methods
     def mousePressEvent(self, event):
@@ -233,32 +393,19 @@ class SceneGLWidget(QtOpenGL.QGLWidget):
             self.rotation_x = (self.rotation_x + dy * self.rotation_speed) % 360
             self.rotation_y = (self.rotation_y + dx * self.rotation_speed) % 360
             
-            # Memberikan feedback melalui signal
-            self.rotationChanged.emit(self.rotation_x, self.rotation_y, self.rotation_z)
-            self.update()
-            
         if self.is_panning:
             # Pan (X and Y translation)
-            # Dapatkan matriks proyeksi saat ini untuk menghitung skala per pixel
-            GL.glMatrixMode(GL.GL_PROJECTION)
-            proj_matrix = GL.glGetDoublev(GL.GL_PROJECTION_MATRIX)
-            GL.glMatrixMode(GL.GL_MODELVIEW)
+            # Konversi perubahan pixel ke unit OpenGL pada kedalaman objek,
+            # dari matriks proyeksi yang di-cache (tanpa membaca balik dari GL)
+            depth = max(self.camera_distance - self.translation_z, 0.1)
+            pan_speed = self.matrices.units_per_pixel(depth, self.viewport_height)
             
-            # Konversi perubahan pixel ke unit OpenGL
-            # Ini akan lebih kompleks dengan proyeksi perspektif,
-            # untuk kesederhanaan, kita bisa menggunakan pan_speed tetap
+            new_x = self.translation_x + dx * pan_speed
+            new_y = self.translation_y - dy * pan_speed  # Invert y-axis untuk intuisi natural
             
-            new_x = self.translation_x + dx * self.pan_speed
-            new_y = self.translation_y - dy * self.pan_speed  # Invert y-axis untuk intuisi natural
-            
-            # Batasi translasi
-            # Batas ini perlu disesuaikan jika menggunakan gluPerspective
             self.translation_x = new_x
             self.translation_y = new_y
             
-            self.translationChanged.emit(self.translation_x, self.translation_y, self.translation_z)
-            self.update()
-            
         self.last_pos = event.pos()
         
     def wheelEvent(self, event):
@@ -270,14 +417,9 @@ class SceneGLWidget(QtOpenGL.QGLWidget):
             self.translation_z = max(-10.0, self.translation_z + self.zoom_speed) # Move closer (less negative Z)
         else: # Scroll down (zoom out)
             self.translation_z = min(10.0, self.translation_z - self.zoom_speed) # Move farther (more negative Z)
-        
-        self.translationChanged.emit(self.translation_x, self.translation_y, self.translation_z)
-        self.update()
 
     def keyPressEvent(self, event):
         """Handle keyboard input for rotation, scaling, and translation"""
-        print(f"Key pressed in GLWidget: {event.key()}") # Debugging: cek apakah event diterima
-
         rotation_step = 5.0
         scale_step = 0.1
         scale3d_step = 0.1  # Step untuk skala 3D
@@ -288,6 +430,26 @@ class SceneGLWidget(QtOpenGL.QGLWidget):
         if event.key() == Qt.Key_R:
             self.reset_transformations()
             return
+
+        # Profiler dan HUD
+        elif event.key() == Qt.Key_F3:
+            finished = self.set_profiling(not self.profiler.enabled)
+            if finished is not None:
+                print(finished.report())
+            return
+
+        # Frustum culling (untuk membandingkan performa)
+        elif event.key() == Qt.Key_C:
+            self.set_culling(not self.culling)
+            return
+
+        # Screenshot dan rekaman video (folder captures)
+        elif event.key() == Qt.Key_F12:
+            self.save_screenshot()
+            return
+        elif event.key() == Qt.Key_F10:
+            self.toggle_recording()
+            return
         
         # Translation controls (W, A, S, D, plus Maju/Mundur via Z-axis)
         elif event.key() == Qt.Key_A: # Kiri
@@ -341,671 +503,355 @@ class SceneGLWidget(QtOpenGL.QGLWidget):
             self.scale_z = max(0.1, self.scale_z - scale3d_step)
         else:
             super().keyPressEvent(event) # Panggil parent method jika tidak ditangani
-            return
-
-        # Update signals and redraw
-        self.rotationChanged.emit(self.rotation_x, self.rotation_y, self.rotation_z)
-        self.translationChanged.emit(self.translation_x, self.translation_y, self.translation_z) # Emit Z
-        self.scaleChanged.emit(self.scale)
-        self.scale3DChanged.emit(self.scale_x, self.scale_y, self.scale_z)
-        self.update()
+        # Sinyal dan repaint dikirim oleh on_transform_changed
 
     def reset_transformations(self):
         """Reset all transformations to default values"""
-        self.rotation_x = 0
-        self.rotation_y = 0
-        self.rotation_z = 0
-        self.translation_x = 0
-        self.translation_y = 0
-        self.translation_z = 0  # Reset Z
-        self.scale = 1.0
-        self.scale_x = 1.0
-        self.scale_y = 1.0
-        self.scale_z = 1.0
-        
-        # Emit signals to update UI
-        self.rotationChanged.emit(0, 0, 0)
-        self.translationChanged.emit(0, 0, 0) # Emit Z
-        self.scaleChanged.emit(1.0)
-        self.scale3DChanged.emit(1.0, 1.0, 1.0)
-        
-        self.update()
+        self.transform.reset()
     # Transformation methods
     def set_rotation_x(self, angle):
         self.rotation_x = angle
-        self.rotationChanged.emit(self.rotation_x, self.rotation_y, self.rotation_z)
-        self.update()
 
     def set_rotation_y(self, angle):
         self.rotation_y = angle
-        self.rotationChanged.emit(self.rotation_x, self.rotation_y, self.rotation_z)
-        self.update()
 
     def set_rotation_z(self, angle):
         self.rotation_z = angle
-        self.rotationChanged.emit(self.rotation_x, self.rotation_y, self.rotation_z)
-        self.update()
 
     def set_translation_x(self, x):
         self.translation_x = x
-        self.translationChanged.emit(self.translation_x, self.translation_y, self.translation_z) # Emit Z
-        self.update()
 
     def set_translation_y(self, y):
         self.translation_y = y
-        self.translationChanged.emit(self.translation_x, self.translation_y, self.translation_z) # Emit Z
-        self.update()
 
     def set_translation_z(self, z):
         # Batas translasi Z, sesuaikan dengan `gluPerspective` zNear dan zFar
         self.translation_z = max(-90.0, min(90.0, z)) # Sesuaikan rentang ini untuk perspektif
-        self.translationChanged.emit(self.translation_x, self.translation_y, self.translation_z)
-        self.update()
 
     def set_scale(self, scale):
         self.scale = max(0.1, min(2.0, scale))
-        self.scaleChanged.emit(self.scale)
-        self.update()
 
     def set_scale_x(self, sx):
         self.scale_x = max(0.1, min(2.0, sx))
-        self.scale3DChanged.emit(self.scale_x, self.scale_y, self.scale_z)
-        self.update()
 
     def set_scale_y(self, sy):
         self.scale_y = max(0.1, min(2.0, sy))
-        self.scale3DChanged.emit(self.scale_x, self.scale_y, self.scale_z)
-        self.update()
 
     def set_scale_z(self, sz):
         self.scale_z = max(0.1, min(2.0, sz))
-        self.scale3DChanged.emit(self.scale_x, self.scale_y, self.scale_z)
-        self.update()
-
-    def draw_lightning(self):
-        # Draw the filled lightning bolt
-        GL.glColor3f(1.0, 0.9, 0.1)  # Warna kuning terang
-        
-        # Points defining a more classic lightning bolt shape
-        points = [
-            (0.0, 1.0),      # Titik atas
-            (-0.2, 0.4),     # Miring ke kiri bawah
-            (0.1, 0.4),      # Sedikit kanan
-            (-0.3, -0.2),    # Miring ke kiri bawah
-            (0.0, -0.2),     # Ke kanan
-            (-0.5, -1.0)     # Ujung bawah
-        ]
-        
-            # Gambar isi petir
-        GL.glBegin(GL.GL_POLYGON)
-        for x, y in points:
-            GL.glVertex2f(x, y)
-        GL.glEnd()
-        # Glow yang lebih kompleks
-        glow_layers = [
-            (1.0, 1.0, 0.8, 0.4, 0.05),  # Cahaya terluar, sangat terang, transparan
-            (1.0, 1.0, 0.6, 0.6, 0.03),  # Lapisan kedua
-            (1.0, 0.9, 0.3, 0.8, 0.01)   # Lapisan terdalam, lebih padat
-        ]
-
-        # Aktifkan blending untuk transparansi
-        GL.glEnable(GL.GL_BLEND)
-        GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
-
-        for r, g, b, a, offset in glow_layers:
-            GL.glColor4f(r, g, b, a)
-            # Ketebalan garis bisa diatur agar terlihat seperti "blur"
-            GL.glLineWidth(5.0 * (1.0 - offset)) # Mengatur ketebalan berdasarkan offset
-
-            GL.glBegin(GL.GL_LINE_LOOP)
-            for x, y in points:
-                # Menggeser titik untuk menciptakan efek glow
-                GL.glVertex2f(x * (1.0 + offset), y * (1.0 + offset))
-            GL.glEnd()
-
-        GL.glDisable(GL.GL_BLEND) # Nonaktifkan blending setelah selesai
-
-    def draw_cloud(self):
-        """Draw cloud using OpenGL circles"""
-        color = self.object_color.get('cloud', (1.0, 1.0, 1.0))
-        GL.glColor3f(*color)
-        # Cloud parts with different positions and sizes
-        cloud_parts = [
-            (-0.6, 0, 0.5, 0.5),
-            (-0.3, 0.1, 0.6, 0.6),
-            (0.1, 0.4, 0.7, 0.7),
-            (0.5, 0.2, 0.6, 0.6),
-            (0.8, 0, 0.5, 0.5),
-            (0.2, -0.1, 0.8, 0.7)
-        ]
-
-        for x, y, w, h in cloud_parts:
-            self.draw_ellipse(x, y, w, h)
-
-    def draw_ellipse(self, x, y, width, height):
-        """Draw an ellipse using OpenGL triangle fan"""
-        GL.glBegin(GL.GL_TRIANGLE_FAN)
-        GL.glVertex2f(x, y)  # Center point
-        
-        segments = 36
-        for i in range(segments + 1):
-            theta = 2.0 * math.pi * i / segments
-            GL.glVertex2f(
-                x + width/2 * math.cos(theta),  
-                y + height/2 * math.sin(theta)
-            )
-        
-        GL.glEnd()
-
-    def draw_rainbow(self):
-        """Draw a 2D rainbow using concentric arcs with different colors"""
-        colors = [
-            (1.0, 0.0, 0.0),  # Red
-            (1.0, 0.5, 0.0),  # Orange
-            (1.0, 1.0, 0.0),  # Yellow
-            (0.0, 1.0, 0.0),  # Green
-            (0.0, 0.0, 1.0),  # Blue
-            (0.5, 0.0, 1.0),  # Indigo
-            (0.7, 0.0, 1.0)    # Violet
-        ]
-        
-        start_radius = 0.5  # Ubah dari 0.3 menjadi 0.5
-        thickness = 0.15    # Ubah dari 0.1 menjadi 0.15
-        segments = 50
-        start_angle = math.pi / 8  # Ubah dari pi/6 (30°) menjadi pi/8 (22.5°)
-        end_angle = math.pi - start_angle
-        
-        for i, color in enumerate(colors):
-            radius = start_radius + (i * thickness)
-            GL.glColor3f(*color)
-            
-            GL.glBegin(GL.GL_QUAD_STRIP)
-            for j in range(segments + 1):
-                theta = start_angle + (end_angle - start_angle) * j / segments
-                
-                # Inner vertex
-                x1 = radius * math.cos(theta)
-                y1 = radius * math.sin(theta)
-                GL.glVertex2f(x1, y1)
-                
-                # Outer vertex
-                x2 = (radius + thickness) * math.cos(theta)
-                y2 = (radius + thickness) * math.sin(theta)
-                GL.glVertex2f(x2, y2)
-                
-            GL.glEnd()
-
-    def draw_rocket(self):
-        """Draw a 2D rocket using OpenGL primitives"""
-        body_color = self.object_color.get('rocket', (0.8, 0.8, 0.8))
-        
-        # Badan roket (trapesium)
-        GL.glBegin(GL.GL_POLYGON)
-        GL.glColor3f(*body_color)  # Use the selected color
-        GL.glVertex2f(-0.1, -0.5)    # Kiri bawah
-        GL.glVertex2f(0.1, -0.5)     # Kanan bawah
-        GL.glVertex2f(0.2, 0.3)      # Kanan atas
-        GL.glVertex2f(-0.2, 0.3)     # Kiri atas
-        GL.glEnd()
-
-        # Kepala roket (segitiga)
-        GL.glBegin(GL.GL_TRIANGLES)
-        GL.glColor3f(1.0, 0.0, 0.0)  # Red
-        GL.glVertex2f(-0.2, 0.3)     # Kiri
-        GL.glVertex2f(0.2, 0.3)      # Kanan
-        GL.glVertex2f(0.0, 0.7)      # Puncak
-        GL.glEnd()
-
-        # Sayap kiri
-        GL.glBegin(GL.GL_TRIANGLES)
-        GL.glColor3f(0.6, 0.6, 0.6)  # Dark gray
-        GL.glVertex2f(-0.1, -0.3)    # Atas
-        GL.glVertex2f(-0.1, -0.5)    # Bawah
-        GL.glVertex2f(-0.3, -0.5)    # Ujung sayap
-        GL.glEnd()
-
-        # Sayap kanan
-        GL.glBegin(GL.GL_TRIANGLES)
-        GL.glColor3f(0.6, 0.6, 0.6)  # Dark gray
-        GL.glVertex2f(0.1, -0.3)     # Atas
-        GL.glVertex2f(0.1, -0.5)     # Bawah
-        GL.glVertex2f(0.3, -0.5)     # Ujung sayap
-        GL.glEnd()
-
-        # Jendela roket (lingkaran)
-        self.draw_circle(0.0, 0.0, 0.08, (0.2, 0.6, 1.0))  # Light blue window
-
-        # Api roket
-        GL.glBegin(GL.GL_TRIANGLES)
-        # Api tengah (merah)
-        GL.glColor3f(1.0, 0.0, 0.0)  # Red
-        GL.glVertex2f(-0.1, -0.5)
-        GL.glVertex2f(0.1, -0.5)
-        GL.glVertex2f(0.0, -0.8)
-        # Api kiri (kuning)
-        GL.glColor3f(1.0, 1.0, 0.0)  # Yellow
-        GL.glVertex2f(-0.15, -0.5)
-        GL.glVertex2f(-0.05, -0.5)
-        GL.glVertex2f(-0.1, -0.7)
-        # Api kanan (kuning)
-        GL.glVertex2f(0.05, -0.5)
-        GL.glVertex2f(0.15, -0.5)
-        GL.glVertex2f(0.1, -0.7)
-        GL.glEnd()
-
-    def draw_circle(self, x, y, radius, color):
-        """Helper method to draw a filled circle"""
-        GL.glColor3f(*color)
-        GL.glBegin(GL.GL_TRIANGLE_FAN)
-        GL.glVertex2f(x, y)
-        segments = 32
-        for i in range(segments + 1):
-            theta = 2.0 * math.pi * i / segments
-            dx = radius * math.cos(theta)
-            dy = radius * math.sin(theta)
-            GL.glVertex2f(x + dx, y + dy)
-        GL.glEnd()
-
-    def draw_star(self):
-        """Draw a 3D star with better depth and symmetry"""
-        outer_radius = 1.0
-        inner_radius = 0.4
-        depth = 0.3
-
-        # Create 10 points for star outline (alternating outer and inner)
-        points = []
-        for i in range(10):
-            angle = math.radians(i * 36)  # 360/10 = 36 degrees per point
-            radius = outer_radius if i % 2 == 0 else inner_radius
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-
-            # Give subtle 3D contour using sine wave pattern
-            z = math.sin(i * math.pi / 5) * (depth * 0.2)
-            points.append((x, y, z))
-
-        # --- Front face ---
-        GL.glBegin(GL.GL_TRIANGLE_FAN)
-        GL.glColor3f(1.0, 0.84, 0.0)
-        GL.glVertex3f(0, 0, depth)  # Center raised
-        for i, (x, y, z) in enumerate(points + [points[0]]):
-            if i % 2 == 0:
-                GL.glColor3f(1.0, 0.7, 0.0)
-            else:
-                GL.glColor3f(1.0, 0.9, 0.4)
-            GL.glVertex3f(x, y, z + depth * 0.1)
-        GL.glEnd()
-
-        # --- Back face ---
-        GL.glBegin(GL.GL_TRIANGLE_FAN)
-        GL.glColor3f(1.0, 0.84, 0.0)
-        GL.glVertex3f(0, 0, -depth)
-        for i, (x, y, z) in enumerate(reversed(points + [points[-1]])):
-            if i % 2 == 0:
-                GL.glColor3f(1.0, 0.5, 0.0)
-            else:
-                GL.glColor3f(1.0, 0.8, 0.3)
-            GL.glVertex3f(x, y, -z - depth * 0.1)
-        GL.glEnd()
-
-        # --- Sides ---
-        GL.glBegin(GL.GL_QUAD_STRIP)
-        for i in range(len(points) + 1):
-            idx = i % len(points)
-            x, y, z = points[idx]
-            zf = z + depth * 0.1
-            zb = -z - depth * 0.1
-
-            color_factor = i / len(points)
-            GL.glColor3f(1.0, 0.6 + 0.3 * color_factor, 0.2)
-            GL.glVertex3f(x, y, zf)
-            GL.glColor3f(1.0, 0.5 + 0.3 * color_factor, 0.0)
-            GL.glVertex3f(x, y, zb)
-        GL.glEnd()
-
-
-    def draw_cone(self, base, direction, radius, length, color):
-        """Helper function to draw a simple cone"""
-        GL.glPushMatrix()
-        GL.glTranslatef(*base)
-
-        dir_len = math.sqrt(sum(d**2 for d in direction))
-        if dir_len == 0:
-            dir_len = 1e-5  # avoid division by zero
-
-        ax, ay, az = 0, 0, 1
-        dx, dy, dz = [d / dir_len for d in direction]
-
-        rx = ay * dz - az * dy
-        ry = az * dx - ax * dz
-        rz = ax * dy - ay * dx
-        angle_rad = math.acos(dz)
-        angle_deg = math.degrees(angle_rad)
-
-        if rx != 0 or ry != 0 or rz != 0:
-            GL.glRotatef(angle_deg, rx, ry, rz)
 
-        GL.glColor3f(*color)
-        quadric = GLU.gluNewQuadric()
-        GLU.gluCylinder(quadric, radius, 0.0, length, 10, 1)
-        GLU.gluDeleteQuadric(quadric)
-
-        GL.glPopMatrix()
+class SceneGLWidget(SceneWidgetBase, QtOpenGL.QGLWidget):
+    """Fixed-function renderer: GL matrix stack, GL_LIGHT0, client-state arrays"""
+    mesh_class = Mesh
+    bound_mesh = None  # Mesh yang array-nya sedang aktif (lihat draw_mesh)
+    instancing_mode = None  # 'core', 'arb' atau None (satu draw call per instance)
 
-    def draw_saturn(self):
-        """Draw textured Saturn with rings"""
-        if self.saturn_texture is None:
-            return
+    def __init__(self, parent=None):
+        super(SceneGLWidget, self).__init__(parent)
+        self.glow_recordings = {}  # (titik, lapisan) -> recorder.Recording
 
-        GL.glPushMatrix()
+    def set_manual_swap(self, enabled):
+        self.setAutoBufferSwap(not enabled)
 
-        # Gambar bola Saturnus dengan tekstur
-        GL.glEnable(GL.GL_TEXTURE_2D)
-        GL.glBindTexture(GL.GL_TEXTURE_2D, self.saturn_texture)
-
-        radius = 0.91
-        stacks = 32
-        slices = 32
-
-        # Material properties untuk Saturnus
-        GL.glMaterialfv(GL.GL_FRONT, GL.GL_AMBIENT, [0.2, 0.2, 0.2, 1.0])
-        GL.glMaterialfv(GL.GL_FRONT, GL.GL_DIFFUSE, [1.0, 1.0, 1.0, 1.0])
-        GL.glMaterialfv(GL.GL_FRONT, GL.GL_SPECULAR, [0.3, 0.3, 0.3, 1.0])
-        GL.glMaterialf(GL.GL_FRONT, GL.GL_SHININESS, 5.0)
-
-        for i in range(stacks):
-            lat0 = math.pi * (-0.5 + float(i) / stacks)
-            lat1 = math.pi * (-0.5 + float(i + 1) / stacks)
-
-            GL.glBegin(GL.GL_QUAD_STRIP)
-            for j in range(slices + 1):
-                lng = 2 * math.pi * float(j - 1) / slices
-
-                # Koordinat tekstur
-                s = float(j) / slices
-                t1 = float(i) / stacks
-                t2 = float(i + 1) / stacks
-
-                # Vertex pertama
-                x = math.cos(lng) * math.cos(lat0)
-                y = math.sin(lng) * math.cos(lat0)
-                z = math.sin(lat0)
-                GL.glNormal3f(x, y, z)
-                GL.glTexCoord2f(s, t1)
-                GL.glVertex3f(x * radius, y * radius, z * radius)
-
-                # Vertex kedua
-                x = math.cos(lng) * math.cos(lat1)
-                y = math.sin(lng) * math.cos(lat1)
-                z = math.sin(lat1)
-                GL.glNormal3f(x, y, z)
-                GL.glTexCoord2f(s, t2)
-                GL.glVertex3f(x * radius, y * radius, z * radius)
-
-            GL.glEnd()
+    def swap_buffers(self):
+        if not self.autoBufferSwap():
+            with self.profiler.phase('swap'):
+                self.swapBuffers()
 
+    def draw_hud(self):
+        """Overlay the rolling profiler summary"""
+        GL.glDisable(GL.GL_LIGHTING)
         GL.glDisable(GL.GL_TEXTURE_2D)
+        GL.glDisable(GL.GL_DEPTH_TEST)
+        GL.glColor3f(0.2, 1.0, 0.2)
+        font = QtGui.QFont('Monospace', 9)
+        for i, line in enumerate(self.profiler.hud_lines()):
+            self.renderText(8, 16 + i * 14, line, font)
+        GL.glEnable(GL.GL_DEPTH_TEST)
 
-        # Gambar cincin
-        GL.glColor3f(0.6, 0.6, 0.6)
-        self.draw_ring(1.1, 1.6, 100)
-
-        GL.glPopMatrix()
+    def initializeGL(self):
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        GL.glEnable(GL.GL_TEXTURE_2D)
+        GL.glClearColor(0.1, 0.1, 0.1, 1.0)
+        
+        # Setup lighting
+        GL.glEnable(GL.GL_LIGHTING)
+        GL.glEnable(GL.GL_LIGHT0)
+        GL.glEnable(GL.GL_COLOR_MATERIAL)
+        
+        # Set light position and properties
+        GL.glLight(GL.GL_LIGHT0, GL.GL_POSITION, (5.0, 5.0, 5.0, 1.0))
+        GL.glLight(GL.GL_LIGHT0, GL.GL_AMBIENT, (0.2, 0.2, 0.2, 1.0))
+        GL.glLight(GL.GL_LIGHT0, GL.GL_DIFFUSE, (1.0, 1.0, 1.0, 1.0))
 
-    def draw_ring(self, inner_radius, outer_radius, segments):
-        """Draw Saturn's ring with texture"""
-        if self.saturn_ring_texture is None:
-            return
+        # Instancing butuh shader GLSL 1.20; tanpa itu jatuh ke loop per instance
+        self.instance_buffers = {}
+        self.compat_shaders = None
+        self.instancing_mode = instancing.instancing_support()
+        try:
+            self.compat_shaders = ShaderLibrary(COMPAT_SOURCES)
+        except RuntimeError as e:
+            print(f"Instancing shaders disabled: {e}", file=sys.stderr)
+            self.instancing_mode = None
 
-        thickness = 0.1  # Ketebalan cincin
+        self.initialize_resources()
 
-        GL.glEnable(GL.GL_TEXTURE_2D)
-        GL.glBindTexture(GL.GL_TEXTURE_2D, self.saturn_ring_texture)
+    def resizeGL(self, w, h):
+        GL.glViewport(0, 0, w, h)
+        self.viewport_size = (w, h)
+        self.resize_recording()
+        aspect = w / h if h != 0 else 1
+        self.viewport_height = max(h, 1)
+        # Proyeksi perspektif (seperti gluPerspective, zNear 0.1, zFar 100)
+        GL.glMatrixMode(GL.GL_PROJECTION)
+        GL.glLoadMatrixf(self.matrices.set_projection(self.fovy, aspect))
+        GL.glMatrixMode(GL.GL_MODELVIEW)
+        GL.glLoadMatrixf(self.matrices.model_view(self.camera_distance))
 
-        # Material properties untuk cincin
-        GL.glMaterialfv(GL.GL_FRONT_AND_BACK, GL.GL_AMBIENT, [0.2, 0.2, 0.2, 1.0])
-        GL.glMaterialfv(GL.GL_FRONT_AND_BACK, GL.GL_DIFFUSE, [1.0, 1.0, 1.0, 1.0])
-        GL.glMaterialfv(GL.GL_FRONT_AND_BACK, GL.GL_SPECULAR, [0.3, 0.3, 0.3, 1.0])
-        GL.glMaterialf(GL.GL_FRONT_AND_BACK, GL.GL_SHININESS, 50.0)
+    def paintGL(self):
+        profiler = self.profiler
+        self.begin_paint()
 
-        GL.glBegin(GL.GL_QUAD_STRIP)
-        for i in range(segments + 1):
-            theta = 2.0 * math.pi * i / segments
-            x = math.cos(theta) * 1.2
-            y = math.sin(theta) * 0.9
+        # Reset state OpenGL
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
 
-            # Koordinat tekstur
-            tex_s = float(i) / segments
+        # Upload tekstur yang sudah selesai di-decode
+        self.upload_textures()
 
-            # Normal vector untuk pencahayaan yang lebih baik
-            GL.glNormal3f(0, 0, 1)
+        with profiler.phase('transform'):
+            self.apply_transform()
 
-            # Bagian dalam cincin
-            GL.glTexCoord2f(tex_s, 0.0)
-            GL.glVertex3f(x * inner_radius, y * inner_radius, -thickness / 2)
+        graph = self.scene_graph()
+        if graph is not None:
+            with profiler.phase('draw_' + self.current_scene):
+                graph.render(self, self.matrices.model_view_matrix(self.camera_distance), self)
 
-            # Bagian luar cincin
-            GL.glTexCoord2f(tex_s, 1.0)
-            GL.glVertex3f(x * outer_radius, y * outer_radius, -thickness / 2)
+        self.end_paint()
 
-        GL.glEnd()
+    def apply_transform(self):
+        # Kamera (lookAt) + translasi, rotasi x/y/z dan skala 3D dalam satu matriks
+        GL.glLoadMatrixf(self.matrices.model_view(self.camera_distance))
+        
+        GL.glDisable(GL.GL_TEXTURE_2D)  # Disable texture by default
+        GL.glColor3f(1.0, 1.0, 1.0)      # Reset color to white
 
-        # Gambar sisi belakang cincin
-        GL.glBegin(GL.GL_QUAD_STRIP)
-        for i in range(segments + 1):
-            theta = 2.0 * math.pi * i / segments
-            x = math.cos(theta) * 1.2
-            y = math.sin(theta) * 0.9
+    def set_material(self, specular, shininess):
+        """Material of the lit scenes; ambient/diffuse follow glColor (GL_COLOR_MATERIAL)"""
+        face = GL.GL_FRONT_AND_BACK
+        GL.glMaterialfv(face, GL.GL_AMBIENT, [0.2, 0.2, 0.2, 1.0])
+        GL.glMaterialfv(face, GL.GL_DIFFUSE, [1.0, 1.0, 1.0, 1.0])
+        GL.glMaterialfv(face, GL.GL_SPECULAR, [specular, specular, specular, 1.0])
+        GL.glMaterialf(face, GL.GL_SHININESS, shininess)
+
+    # Backend scene graph (lihat scene_graph.py)
+
+    def apply_state(self, state, previous):
+        """Switch only the GL state that differs from the previous node's"""
+        if previous is None or state.lit != previous.lit:
+            (GL.glEnable if state.lit else GL.glDisable)(GL.GL_LIGHTING)
+        if previous is None or state.texture is not previous.texture:
+            if state.texture is None:
+                GL.glDisable(GL.GL_TEXTURE_2D)
+            else:
+                GL.glEnable(GL.GL_TEXTURE_2D)
+                GL.glBindTexture(GL.GL_TEXTURE_2D, state.texture.id)
+        if previous is None or state.blend != previous.blend:
+            if state.blend:
+                GL.glEnable(GL.GL_BLEND)
+                GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
+            else:
+                GL.glDisable(GL.GL_BLEND)
+        if state.lit and (previous is None or not previous.lit or
+                          (state.specular, state.shininess) != (previous.specular, previous.shininess)):
+            self.set_material(state.specular, state.shininess)
 
-            tex_s = float(i) / segments
-            GL.glNormal3f(0, 0, -1)
+    def finish_states(self, previous):
+        self.unbind_mesh()
+        GL.glDisable(GL.GL_TEXTURE_2D)
+        GL.glDisable(GL.GL_LIGHTING)
+        GL.glDisable(GL.GL_BLEND)
 
-            # Bagian luar cincin
-            GL.glTexCoord2f(tex_s, 1.0)
-            GL.glVertex3f(x * outer_radius, y * outer_radius, thickness / 2)
+    def load_model_view(self, model_view, node):
+        GL.glLoadMatrixf(gl_matrix(model_view))
 
-            # Bagian dalam cincin
-            GL.glTexCoord2f(tex_s, 0.0)
-            GL.glVertex3f(x * inner_radius, y * inner_radius, thickness / 2)
+    def draw_mesh(self, scene_mesh, color):
+        self.bind_mesh(scene_mesh)
+        GL.glColor3f(*color)
+        scene_mesh.draw_elements()
+
+    def bind_mesh(self, scene_mesh):
+        # Node berurutan dengan mesh yang sama cukup bind sekali
+        if scene_mesh is not self.bound_mesh:
+            self.unbind_mesh()
+            scene_mesh.bind()
+            self.bound_mesh = scene_mesh
+
+    def unbind_mesh(self):
+        if self.bound_mesh is not None:
+            self.bound_mesh.unbind()
+            self.bound_mesh = None
+
+    def draw_instanced(self, scene_mesh, instances, color, state):
+        self.bind_mesh(scene_mesh)
+        GL.glColor3f(*color)
+        if self.instancing_mode is None:
+            self.draw_instances_one_by_one(scene_mesh, instances, color)
+            return
+        buffer = self.instance_buffer(instances)
+        program = self.compat_shaders.use('instanced')
+        program.set_int('u_lit', state.lit)
+        buffer.enable()
+        buffer.draw(scene_mesh)
+        buffer.disable()
+        GL.glUseProgram(0)
+        self.compat_shaders.reset()
+
+    def instance_buffer(self, instances):
+        buffer = self.instance_buffers.get(instances)
+        if buffer is None:
+            buffer = self.instance_buffers[instances] = instancing.InstanceBuffer(self.instancing_mode)
+        buffer.sync(instances)
+        return buffer
+
+    def draw_instance_points(self, instances, color, radius, pixel_scale, max_radius, ranges=None,
+                             sprite=None):
+        self.unbind_mesh()
+        if self.compat_shaders is None:
+            # Tanpa shader: titik 1 pixel di posisi instance (yang besar juga ikut)
+            data = instances.data
+            GL.glColor3f(*color)
+            GL.glPointSize(1.0)
+            GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+            GL.glVertexPointer(3, GL.GL_FLOAT, data.strides[0], data)
+            if ranges is None:
+                GL.glDrawArrays(GL.GL_POINTS, 0, len(data))
+            elif len(ranges[0]):
+                GL.glMultiDrawArrays(GL.GL_POINTS, ranges[0], ranges[1], len(ranges[0]))
+            GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+            return
+        buffer = self.instance_buffer(instances)
+        program = self.compat_shaders.use('instance_points')
+        program.set_float('u_color', color[0], color[1], color[2], 1.0)
+        program.set_float('u_radius', radius)
+        program.set_float('u_pixel_scale', pixel_scale)
+        program.set_float('u_max_radius', max_radius)
+        use_sprite = sprite is not None and not sprite.failed
+        program.set_int('u_use_sprite', use_sprite)
+        if use_sprite:
+            program.set_int('u_sprite', 0)
+            GL.glBindTexture(GL.GL_TEXTURE_2D, sprite.id)
+        # gl_PointCoord di profil compatibility hanya ada dengan GL_POINT_SPRITE
+        GL.glEnable(GL.GL_VERTEX_PROGRAM_POINT_SIZE)
+        GL.glEnable(GL.GL_POINT_SPRITE)
+        buffer.enable(instancing.POINT_ATTRIBUTES, divisor=0)
+        buffer.draw_points(ranges)
+        buffer.disable(instancing.POINT_ATTRIBUTES, divisor=0)
+        GL.glDisable(GL.GL_POINT_SPRITE)
+        GL.glDisable(GL.GL_VERTEX_PROGRAM_POINT_SIZE)
+        if use_sprite:
+            GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+        GL.glUseProgram(0)
+        self.compat_shaders.reset()
+
+    def draw_instances_one_by_one(self, scene_mesh, instances, color):
+        """Fallback without instancing: the instance transform on the matrix stack"""
+        for x, y, z, scale, qx, qy, qz, qw, r, g, b in instances.data:
+            GL.glPushMatrix()
+            GL.glTranslatef(x, y, z)
+            sin_half = math.sqrt(max(1.0 - qw * qw, 0.0))
+            if sin_half > 1e-6:
+                GL.glRotatef(math.degrees(2.0 * math.acos(min(max(qw, -1.0), 1.0))),
+                             qx / sin_half, qy / sin_half, qz / sin_half)
+            GL.glScalef(scale, scale, scale)
+            GL.glColor3f(color[0] * r, color[1] * g, color[2] * b)
+            scene_mesh.draw_elements()
+            GL.glPopMatrix()
+
+    def draw_glow(self, points, layers):
+        self.unbind_mesh()
+        # Direkam sekali ke VBO (recorder.py), diputar ulang selama titik dan lapisan sama
+        key = (tuple(map(tuple, points)), tuple(map(tuple, layers)))
+        recording = self.glow_recordings.get(key)
+        if recording is None:
+            recording = self.glow_recordings[key] = record(draw_glow_lines, points, layers)
+        recording.replay()
+
+
+def draw_glow_lines(gl, points, layers):
+    """Immediate-mode glow outline, drawn through `gl` (a recorder.GLRecorder)"""
+    # Glow: beberapa garis di sekeliling objek, dari luar ke dalam
+    for r, g, b, a, offset in layers:
+        gl.glColor4f(r, g, b, a)
+        # Ketebalan garis bisa diatur agar terlihat seperti "blur"
+        gl.glLineWidth(5.0 * (1.0 - offset)) # Mengatur ketebalan berdasarkan offset
+
+        gl.glBegin(gl.GL_LINE_LOOP)
+        for x, y in points:
+            # Menggeser titik untuk menciptakan efek glow
+            gl.glVertex2f(x * (1.0 + offset), y * (1.0 + offset))
+        gl.glEnd()
 
-        GL.glEnd()
 
-        # Gambar sisi tepi cincin
-        GL.glBegin(GL.GL_QUAD_STRIP)
-        for i in range(segments + 1):
-            theta = 2.0 * math.pi * i / segments
-            x = math.cos(theta) * 1.2
-            y = math.sin(theta) * 0.9
+class SceneCoreWidget(SceneWidgetBase, QtWidgets.QOpenGLWidget):
+    """Core-profile renderer: VAOs, shaders and uniform buffers (core_renderer)"""
+    mesh_class = VertexArrayMesh
 
-            tex_s = float(i) / segments
+    def __init__(self, parent=None):
+        super(SceneCoreWidget, self).__init__(parent)
+        fmt = QtGui.QSurfaceFormat()
+        fmt.setVersion(3, 3)
+        fmt.setProfile(QtGui.QSurfaceFormat.CoreProfile)
+        fmt.setDepthBufferSize(24)
+        self.setFormat(fmt)
+        self.renderer = CoreRenderer(self)
 
-            # Tepi luar
-            GL.glTexCoord2f(tex_s, 0.0)
-            GL.glVertex3f(x * outer_radius, y * outer_radius, -thickness / 2)
-            GL.glTexCoord2f(tex_s, 1.0)
-            GL.glVertex3f(x * outer_radius, y * outer_radius, thickness / 2)
+    def initializeGL(self):
+        self.renderer.initialize()
+        self.initialize_resources()
 
-        GL.glEnd()
+    def resizeGL(self, w, h):
+        # QOpenGLWidget memberi ukuran dalam pixel logis
+        ratio = self.devicePixelRatioF()
+        w, h = int(w * ratio), int(h * ratio)
+        self.viewport_height = max(h, 1)
+        self.viewport_size = (w, h)
+        self.renderer.resize(w, h)
+        self.resize_recording()
 
-        # Gambar sisi tepi dalam
-        GL.glBegin(GL.GL_QUAD_STRIP)
-        for i in range(segments + 1):
-            theta = 2.0 * math.pi * i / segments
-            x = math.cos(theta) * 1.2
-            y = math.sin(theta) * 0.9
+    def paintGL(self):
+        self.begin_paint()
+        self.upload_textures()
+        self.renderer.render()
+        self.end_paint()
 
-            tex_s = float(i) / segments
+    def draw_hud(self):
+        """Overlay the rolling profiler summary with QPainter"""
+        painter = QtGui.QPainter(self)
+        painter.setPen(QtGui.QColor(51, 255, 51))
+        painter.setFont(QtGui.QFont('Monospace', 9))
+        for i, line in enumerate(self.profiler.hud_lines()):
+            painter.drawText(8, 16 + i * 14, line)
+        painter.end()
 
-            # Tepi dalam
-            GL.glTexCoord2f(tex_s, 1.0)
-            GL.glVertex3f(x * inner_radius, y * inner_radius, thickness / 2)
-            GL.glTexCoord2f(tex_s, 0.0)
-            GL.glVertex3f(x * inner_radius, y * inner_radius, -thickness / 2)
 
-        GL.glEnd()
+# Backend render, dipilih saat runtime (LANGIT_RENDERER atau --renderer)
+RENDERERS = {
+    'legacy': SceneGLWidget,
+    'core': SceneCoreWidget,
+}
 
-        GL.glDisable(GL.GL_TEXTURE_2D)
-        
-    def draw_earth(self):
-        """Draw textured Earth sphere"""
-        if self.earth_texture is None:
-            return
-            
-        GL.glPushMatrix()
-        GL.glEnable(GL.GL_TEXTURE_2D)
-        GL.glBindTexture(GL.GL_TEXTURE_2D, self.earth_texture)
-        
-        radius = 1.0
-        stacks = 32
-        slices = 32
-        
-        for i in range(stacks):
-            lat0 = math.pi * (-0.5 + float(i) / stacks)
-            lat1 = math.pi * (-0.5 + float(i + 1) / stacks)
-            
-            GL.glBegin(GL.GL_QUAD_STRIP)
-            for j in range(slices + 1):
-                lng = 2 * math.pi * float(j - 1) / slices
-                
-                # Koordinat tekstur
-                s = float(j) / slices
-                t1 = float(i) / stacks
-                t2 = float(i + 1) / stacks
-                
-                # Vertex pertama
-                x = math.cos(lng) * math.cos(lat0)
-                y = math.sin(lng) * math.cos(lat0)
-                z = math.sin(lat0)
-                GL.glNormal3f(x, y, z) # Normal untuk pencahayaan
-                GL.glTexCoord2f(s, t1)
-                GL.glVertex3f(x * radius, y * radius, z * radius)
-                
-                # Vertex kedua
-                x = math.cos(lng) * math.cos(lat1)
-                y = math.sin(lng) * math.cos(lat1)
-                z = math.sin(lat1)
-                GL.glNormal3f(x, y, z) # Normal untuk pencahayaan
-                GL.glTexCoord2f(s, t2)
-                GL.glVertex3f(x * radius, y * radius, z * radius)
-                
-            GL.glEnd()
-        
-        GL.glDisable(GL.GL_TEXTURE_2D)
-        GL.glPopMatrix()
 
-    def draw_moon(self):
-        """Draw moon shaped like a 3D crescent moon"""
-        if self.moon_texture is None:
-            return
-            
-        GL.glPushMatrix()
-        
-        # Enable texture and set material properties
-        GL.glEnable(GL.GL_TEXTURE_2D)
-        GL.glBindTexture(GL.GL_TEXTURE_2D, self.moon_texture)
-        
-        # Material properties for moon
-        GL.glMaterialfv(GL.GL_FRONT, GL.GL_AMBIENT, [0.2, 0.2, 0.2, 1.0])
-        GL.glMaterialfv(GL.GL_FRONT, GL.GL_DIFFUSE, [1.0, 1.0, 1.0, 1.0])
-        GL.glMaterialfv(GL.GL_FRONT, GL.GL_SPECULAR, [0.3, 0.3, 0.3, 1.0])
-        GL.glMaterialf(GL.GL_FRONT, GL.GL_SHININESS, 5.0)
-        
-        # Rotate to better view the crescent shape
-        GL.glRotatef(30, 1, 0, 0)  # Tilt forward
-        GL.glRotatef(20, 0, 1, 0)  # Rotate around y-axis
-        
-        # Draw the crescent shape
-        self.draw_c_shape(0.8, 0.3, 36)
-        
-        GL.glDisable(GL.GL_TEXTURE_2D)
-        GL.glPopMatrix()
+def create_scene_widget(renderer=None, parent=None):
+    """Scene widget for `renderer` ('legacy' or 'core'), default from LANGIT_RENDERER"""
+    renderer = renderer or os.environ.get('LANGIT_RENDERER', 'legacy')
+    if renderer not in RENDERERS:
+        raise ValueError(f"Unknown renderer '{renderer}', expected one of {sorted(RENDERERS)}")
+    return RENDERERS[renderer](parent)
 
-    def draw_c_shape(self, radius, thickness, segments):
-        """
-        Draw a 3D crescent moon shape (true crescent, not just a C)
-        - radius: outer radius of the crescent
-        - thickness: maximum thickness in the middle of the crescent
-        - segments: number of segments for circular parts
-        """
-        # Crescent parameters
-        start_angle = math.radians(45)
-        end_angle = math.radians(315)
-        height = thickness
-        angle_step = (end_angle - start_angle) / segments
-
-        # Crescent offset (controls how much the inner circle is shifted)
-        offset = radius * 0.45  # 0.4~0.5 gives a nice crescent
-
-        # Draw outer surface (outer arc)
-        GL.glBegin(GL.GL_QUAD_STRIP)
-        for i in range(segments + 1):
-            angle = start_angle + i * angle_step
-            cos_a = math.cos(angle)
-            sin_a = math.sin(angle)
-            s = float(i) / segments
-
-            # Outer arc (front)
-            GL.glNormal3f(cos_a, sin_a, 0)
-            GL.glTexCoord2f(s, 0)
-            GL.glVertex3f(radius * cos_a, radius * sin_a, -height/2)
-            GL.glTexCoord2f(s, 1)
-            GL.glVertex3f(radius * cos_a, radius * sin_a, height/2)
-        GL.glEnd()
-
-        # Draw inner surface (inner arc, shifted to create crescent)
-        GL.glBegin(GL.GL_QUAD_STRIP)
-        for i in range(segments + 1):
-            angle = start_angle + i * angle_step
-            cos_a = math.cos(angle)
-            sin_a = math.sin(angle)
-            s = float(i) / segments
-
-            # Inner arc (front, shifted)
-            GL.glNormal3f(-cos_a, -sin_a, 0)
-            GL.glTexCoord2f(s, 0)
-            GL.glVertex3f((radius - thickness) * cos_a + offset, (radius - thickness) * sin_a, -height/2)
-            GL.glTexCoord2f(s, 1)
-            GL.glVertex3f((radius - thickness) * cos_a + offset, (radius - thickness) * sin_a, height/2)
-        GL.glEnd()
-
-        # Draw top face (between outer and inner arcs)
-        GL.glBegin(GL.GL_QUAD_STRIP)
-        for i in range(segments + 1):
-            angle = start_angle + i * angle_step
-            cos_a = math.cos(angle)
-            sin_a = math.sin(angle)
-            s = float(i) / segments
-
-            # Top face
-            GL.glNormal3f(0, 0, 1)
-            # Inner (shifted)
-            GL.glTexCoord2f(s, 0)
-            GL.glVertex3f((radius - thickness) * cos_a + offset, (radius - thickness) * sin_a, height/2)
-            # Outer
-            GL.glTexCoord2f(s, 1)
-            GL.glVertex3f(radius * cos_a, radius * sin_a, height/2)
-        GL.glEnd()
-
-        # Draw bottom face (between outer and inner arcs)
-        GL.glBegin(GL.GL_QUAD_STRIP)
-        for i in range(segments + 1):
-            angle = start_angle + i * angle_step
-            cos_a = math.cos(angle)
-            sin_a = math.sin(angle)
-            s = float(i) / segments
-
-            # Bottom face
-            GL.glNormal3f(0, 0, -1)
-            # Outer
-            GL.glTexCoord2f(s, 1)
-            GL.glVertex3f(radius * cos_a, radius * sin_a, -height/2)
-            # Inner (shifted)
-            GL.glTexCoord2f(s, 0)
-            GL.glVertex3f((radius - thickness) * cos_a + offset, (radius - thickness) * sin_a, -height/2)
-        GL.glEnd()
 
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
+        self.main_window = MainWindow
         MainWindow.setObjectName("MainWindow")
         MainWindow.resize(1175, 746)
         MainWindow.setStyleSheet("background-color: rgb(0, 0, 0);")
@@ -1077,6 +923,29 @@ class Ui_MainWindow(object):
         self.left_panel_3d.addWidget(self.moon, 1, 1)
         
         self.left_panel.addWidget(self.groupBox_objek3d)
+
+        # Komposit (scene graph dengan beberapa objek)
+        self.groupBox_komposit = QtWidgets.QGroupBox("Komposit")
+        self.groupBox_komposit.setStyleSheet("background-color: rgb(255, 255, 255);")
+        self.left_panel_komposit = QtWidgets.QGridLayout(self.groupBox_komposit)
+
+        self.earth_moon = QtWidgets.QPushButton("Bumi + Bulan")
+        self.earth_moon.setStyleSheet("background-color: rgb(200, 200, 255);")
+        self.left_panel_komposit.addWidget(self.earth_moon, 0, 0)
+
+        self.saturn_stars = QtWidgets.QPushButton("Saturnus + Bintang")
+        self.saturn_stars.setStyleSheet("background-color: rgb(255, 255, 255);")
+        self.left_panel_komposit.addWidget(self.saturn_stars, 0, 1)
+
+        self.rainbow_clouds = QtWidgets.QPushButton("Pelangi + Awan")
+        self.rainbow_clouds.setStyleSheet("background-color: rgb(200, 255, 200);")
+        self.left_panel_komposit.addWidget(self.rainbow_clouds, 1, 0)
+
+        self.night_sky = QtWidgets.QPushButton("Langit Malam")
+        self.night_sky.setStyleSheet("background-color: rgb(200, 200, 255);")
+        self.left_panel_komposit.addWidget(self.night_sky, 1, 1)
+
+        self.left_panel.addWidget(self.groupBox_komposit)
           # Tambahkan Tab Control untuk transformasi yang lebih jelas
         self.transform_tabs = QtWidgets.QTabWidget()
         self.transform_tabs.setStyleSheet("background-color: rgb(255, 255, 255);")
@@ -1316,8 +1185,8 @@ class Ui_MainWindow(object):
         self.left_panel.addStretch()
         self.content_layout.addLayout(self.left_panel)
         
-        # OpenGL Widget
-        self.glWidget = SceneGLWidget()
+        # OpenGL Widget (backend dari LANGIT_RENDERER: legacy atau core)
+        self.glWidget = create_scene_widget()
         self.content_layout.addWidget(self.glWidget)
         self.content_layout.setStretch(1, 3)
         self.main_layout.addLayout(self.content_layout)
@@ -1339,6 +1208,10 @@ class Ui_MainWindow(object):
         self.saturn.clicked.connect(lambda: self.glWidget.set_scene('saturn'))
         self.earth.clicked.connect(lambda: self.glWidget.set_scene('earth'))
         self.moon.clicked.connect(lambda: self.glWidget.set_scene('moon'))
+        self.earth_moon.clicked.connect(lambda: self.glWidget.set_scene('earth_moon'))
+        self.saturn_stars.clicked.connect(lambda: self.glWidget.set_scene('saturn_stars'))
+        self.rainbow_clouds.clicked.connect(lambda: self.glWidget.set_scene('rainbow_clouds'))
+        self.night_sky.clicked.connect(lambda: self.glWidget.set_scene('night_sky'))
         
         # Translation controls (Buttons)
         self.kiri.clicked.connect(lambda: self.glWidget.set_translation_x(self.glWidget.translation_x - 0.1))
@@ -1389,39 +1262,35 @@ class Ui_MainWindow(object):
         self.glWidget.scaleChanged.connect(self.update_scale_ui)
         self.glWidget.scale3DChanged.connect(self.update_scale3d_ui) # Connect 3D scale signal
         self.glWidget.colorChanged.connect(self.update_color_demo)
+        self.glWidget.textures.progressChanged.connect(self.update_texture_progress)
         
         # Pastikan widget OpenGL memiliki fokus untuk input keyboard
         # Set focus policy and focus
         self.glWidget.setFocusPolicy(Qt.StrongFocus)
         self.glWidget.setFocus()
-        
-        # Connect to widget's focusInEvent untuk debugging
-        self.glWidget.focusInEvent = lambda event: print("OpenGL widget has gained focus")
+
+    def set_quietly(self, spin_box, value):
+        """setValue without valueChanged, so UI updates do not echo back into the model"""
+        blocked = spin_box.blockSignals(True)
+        spin_box.setValue(value)
+        spin_box.blockSignals(blocked)
 
     def update_translation_ui(self, x, y, z):
         """Update translation UI widgets with current values"""
-        self.translasi_x.setValue(x)
-        self.translasi_y.setValue(y)
-        self.translasi_z.setValue(z) # Update Z translation spin box
-        
-        # Debugging
-        print(f"Translation updated: x={x}, y={y}, z={z}")
+        self.set_quietly(self.translasi_x, x)
+        self.set_quietly(self.translasi_y, y)
+        self.set_quietly(self.translasi_z, z) # Update Z translation spin box
 
     def reset_all_transformations(self):
         """Reset all transformations and update UI"""
         self.glWidget.reset_transformations()
         
         # Reset UI controls
-        self.rotasi_x.setValue(0)
-        self.rotasi_y.setValue(0)
-        self.rotasi_z.setValue(0)
-        self.translasi_x.setValue(0)
-        self.translasi_y.setValue(0)
-        self.translasi_z.setValue(0) # Reset Z spin box
-        self.skala.setValue(1.0)
-        self.skala_x.setValue(1.0) # Reset 3D scale
-        self.skala_y.setValue(1.0) # Reset 3D scale
-        self.skala_z.setValue(1.0) # Reset 3D scale
+        for spin_box in (self.rotasi_x, self.rotasi_y, self.rotasi_z,
+                         self.translasi_x, self.translasi_y, self.translasi_z):
+            self.set_quietly(spin_box, 0)
+        for spin_box in (self.skala, self.skala_x, self.skala_y, self.skala_z):
+            self.set_quietly(spin_box, 1.0)
 
         
     def pick_color(self):
@@ -1435,18 +1304,25 @@ class Ui_MainWindow(object):
         """Update color demo frame with current color"""
         self.color_demo.setStyleSheet(f"background-color: rgb({int(r*255)}, {int(g*255)}, {int(b*255)});")
 
+    def update_texture_progress(self, loaded, total):
+        """Show texture loading progress in the window title"""
+        title = QtCore.QCoreApplication.translate("MainWindow", "OpenGL Viewer")
+        if loaded < total:
+            title += f" (memuat tekstur {loaded}/{total})"
+        self.main_window.setWindowTitle(title)
+
     def update_rotation_ui(self, x, y, z):
-        self.rotasi_x.setValue(x)
-        self.rotasi_y.setValue(y)
-        self.rotasi_z.setValue(z)
+        self.set_quietly(self.rotasi_x, x)
+        self.set_quietly(self.rotasi_y, y)
+        self.set_quietly(self.rotasi_z, z)
 
     def update_scale_ui(self, scale):
-        self.skala.setValue(scale)
+        self.set_quietly(self.skala, scale)
 
     def update_scale3d_ui(self, sx, sy, sz):
-        self.skala_x.setValue(sx)
-        self.skala_y.setValue(sy)
-        self.skala_z.setValue(sz)
+        self.set_quietly(self.skala_x, sx)
+        self.set_quietly(self.skala_y, sy)
+        self.set_quietly(self.skala_z, sz)
 
     def retranslateUi(self, MainWindow):
         _translate = QtCore.QCoreApplication.translate
@@ -1517,6 +1393,8 @@ def main():
     MainWindow = QtWidgets.QMainWindow()
     ui = Ui_MainWindow()
     ui.setupUi(MainWindow)
+    # Simpan hasil profiling (LANGIT_PROFILE_DUMP) saat aplikasi ditutup
+    app.aboutToQuit.connect(lambda: ui.glWidget.profiler.enabled and ui.glWidget.set_profiling(False))
     MainWindow.show()
     sys.exit(app.exec_())
 
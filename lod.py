@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Level-of-detail selection based on the on-screen size of an object"""
+
+import math
+
+
+def projected_radius(radius, distance, fovy, viewport_height):
+    """Approximate screen-space radius in pixels of a sphere seen in perspective.
+
+    `fovy` is the vertical field of view in degrees (as given to
+    gluPerspective), `distance` the eye-space distance to the sphere centre.
+    """
+    if distance <= radius:
+        return float('inf')  # Kamera di dalam objek
+    return radius / (distance * math.tan(math.radians(fovy) / 2.0)) * viewport_height / 2.0
+
+
+class LodSelector(object):
+    """Pick a tessellation level from a screen radius, with hysteresis.
+
+    `levels` is a list of (min_screen_radius_px, value) pairs; the finest
+    level whose threshold is reached wins. Switching to a finer level needs
+    the radius to pass the threshold by `hysteresis` (relative), and
+    switching back needs it to drop the same margin below, so the level does
+    not flicker while zooming around a boundary.
+    """
+
+    def __init__(self, levels, hysteresis=0.15):
+        self.levels = sorted(levels, key=lambda level: level[0])
+        self.hysteresis = hysteresis
+        self.index = None
+
+    def _target(self, screen_radius):
+        index = 0
+        for i, (threshold, _) in enumerate(self.levels):
+            if screen_radius >= threshold:
+                index = i
+        return index
+
+    def select(self, screen_radius):
+        target = self._target(screen_radius)
+        if self.index is None:
+            self.index = target
+        elif target > self.index:
+            while (self.index < len(self.levels) - 1 and
+                   screen_radius >= self.levels[self.index + 1][0] * (1.0 + self.hysteresis)):
+                self.index += 1
+        elif target < self.index:
+            while (self.index > 0 and
+                   screen_radius < self.levels[self.index][0] * (1.0 - self.hysteresis)):
+                self.index -= 1
+        return self.levels[self.index][1]
+
+
+# Radius layar benda berjari-jari 1 pada tampilan awal widget (jarak 5,
+# fovy 45, viewport 400 px): sekitar 97 px
+DEFAULT_UNIT_RADIUS = projected_radius(1.0, 5.0, 45.0, 400)
+# Ambang level normal di bawah objek terkecil pada tampilan awal (bulan sabit,
+# r 0.8, ~77 px), juga dengan margin hysteresis
+NORMAL_RADIUS = 0.6 * DEFAULT_UNIT_RADIUS
+COARSE_RADIUS = 0.25 * DEFAULT_UNIT_RADIUS
+# Level paling halus saat diameter objek mengisi tinggi viewport awal
+# (radius ~193 px); cincin Saturnus pada tampilan awal (~185 px) masih di bawahnya
+FINE_RADIUS = 2.0 * DEFAULT_UNIT_RADIUS
+
+# Tabel LOD per jenis objek: (radius layar minimum dalam pixel, parameter).
+# Bola 32x32, cincin 100 segmen dan sabit/elips 36 segmen adalah level pada
+# jarak pandang awal.
+LOD_TABLES = {
+    'sphere': [(0, (8, 8)), (COARSE_RADIUS, (16, 16)), (NORMAL_RADIUS, (32, 32)),
+               (FINE_RADIUS, (64, 64))],
+    'ring': [(0, 24), (COARSE_RADIUS, 48), (NORMAL_RADIUS, 100), (FINE_RADIUS, 200)],
+    'crescent': [(0, 12), (COARSE_RADIUS, 24), (NORMAL_RADIUS, 36), (FINE_RADIUS, 72)],
+    'ellipse': [(0, 12), (COARSE_RADIUS, 24), (NORMAL_RADIUS, 36), (FINE_RADIUS, 72)],
+}
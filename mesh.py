@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""GPU-resident meshes (VBO + IBO) built from geometry.MeshData.
+
+Mesh feeds the fixed-function pipeline through client-state pointers;
+VertexArrayMesh records generic attributes in a VAO for the core-profile
+renderer (shader attribute locations in ATTRIBUTE_LOCATIONS).
+"""
+
+import ctypes
+
+from OpenGL import GL
+
+import geometry
+from culling import BoundingBox
+
+_FLOAT_SIZE = 4
+
+# Dipasang oleh profiler: dipanggil (vertices) untuk tiap draw call; None = mati
+draw_counter = None
+
+
+_CLIENT_STATES = {
+    'positions': GL.GL_VERTEX_ARRAY,
+    'normals': GL.GL_NORMAL_ARRAY,
+    'uvs': GL.GL_TEXTURE_COORD_ARRAY,
+    'colors': GL.GL_COLOR_ARRAY,
+}
+
+
+def _enable_arrays(layout, stride, pointers):
+    """Enable client arrays for every attribute in layout, return the enabled states"""
+    enabled = []
+    for name, (size, _) in layout.items():
+        state = _CLIENT_STATES[name]
+        GL.glEnableClientState(state)
+        if name == 'positions':
+            GL.glVertexPointer(size, GL.GL_FLOAT, stride, pointers[name])
+        elif name == 'normals':
+            GL.glNormalPointer(GL.GL_FLOAT, stride, pointers[name])
+        elif name == 'uvs':
+            GL.glTexCoordPointer(size, GL.GL_FLOAT, stride, pointers[name])
+        else:
+            GL.glColorPointer(size, GL.GL_FLOAT, stride, pointers[name])
+        enabled.append(state)
+    return enabled
+
+
+class Mesh(object):
+    """Interleaved vertex buffer plus index buffer, drawn with one glDrawElements"""
+
+    def __init__(self, data, mode=GL.GL_TRIANGLES):
+        vertices, self.layout = geometry.interleave(data)
+        self.stride = vertices.shape[1] * _FLOAT_SIZE
+        self.vertex_count = vertices.shape[0]
+        self.index_count = data.indices.size
+        self.mode = mode
+        # Kotak lokal untuk culling, supaya geometri tidak perlu dibuat ulang
+        self.bounds = BoundingBox.of_points(data.positions)
+
+        self.vbo = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+        self.ibo = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, data.indices.nbytes, data.indices, GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def bind(self):
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        pointers = {name: ctypes.c_void_p(offset * _FLOAT_SIZE)
+                    for name, (_, offset) in self.layout.items()}
+        self._enabled = _enable_arrays(self.layout, self.stride, pointers)
+
+    def draw_elements(self):
+        """Draw while bound; several draws (e.g. per scene-graph node) can share one bind"""
+        GL.glDrawElements(self.mode, self.index_count, GL.GL_UNSIGNED_INT, ctypes.c_void_p(0))
+        if draw_counter is not None:
+            draw_counter(self.index_count)
+
+    def unbind(self):
+        for state in self._enabled:
+            GL.glDisableClientState(state)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        self.bind()
+        self.draw_elements()
+        self.unbind()
+
+    def delete(self):
+        GL.glDeleteBuffers(2, [self.vbo, self.ibo])
+        self.vbo = self.ibo = 0
+
+
+# Lokasi atribut yang dipakai semua shader di shaders.py
+ATTRIBUTE_LOCATIONS = {'positions': 0, 'normals': 1, 'uvs': 2, 'colors': 3}
+
+
+class VertexArrayMesh(object):
+    """Interleaved VBO + IBO bound in a vertex array object (core profile)"""
+
+    def __init__(self, data, mode=GL.GL_TRIANGLES):
+        vertices, self.layout = geometry.interleave(data)
+        self.stride = stride = vertices.shape[1] * _FLOAT_SIZE
+        self.vertex_count = vertices.shape[0]
+        self.index_count = data.indices.size
+        self.mode = mode
+        self.has_colors = 'colors' in self.layout
+        self.bounds = BoundingBox.of_points(data.positions)
+
+        self.vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self.vao)
+        self.vbo, self.ibo = GL.glGenBuffers(2)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, data.indices.nbytes, data.indices, GL.GL_STATIC_DRAW)
+        for name, (size, offset) in self.layout.items():
+            location = ATTRIBUTE_LOCATIONS[name]
+            GL.glEnableVertexAttribArray(location)
+            GL.glVertexAttribPointer(location, size, GL.GL_FLOAT, GL.GL_FALSE, stride,
+                                     ctypes.c_void_p(offset * _FLOAT_SIZE))
+        GL.glBindVertexArray(0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def bind(self):
+        GL.glBindVertexArray(self.vao)
+
+    def draw_elements(self):
+        GL.glDrawElements(self.mode, self.index_count, GL.GL_UNSIGNED_INT, ctypes.c_void_p(0))
+        if draw_counter is not None:
+            draw_counter(self.index_count)
+
+    def unbind(self):
+        GL.glBindVertexArray(0)
+
+    def draw(self):
+        self.bind()
+        self.draw_elements()
+
+    def delete(self):
+        GL.glDeleteVertexArrays(1, [self.vao])
+        GL.glDeleteBuffers(2, [self.vbo, self.ibo])
+        self.vao = self.vbo = self.ibo = 0
+
+
+class MeshCache(object):
+    """Meshes keyed by their build parameters so equal requests share buffers"""
+
+    def __init__(self, mesh_class=Mesh):
+        self.mesh_class = mesh_class
+        self._meshes = {}
+
+    def get(self, key, build, mode=GL.GL_TRIANGLES):
+        mesh = self._meshes.get(key)
+        if mesh is None:
+            mesh = self.mesh_class(build(), mode)
+            self._meshes[key] = mesh
+        return mesh
+
+    def sphere(self, radius, stacks, slices):
+        return self.get(('sphere', radius, stacks, slices),
+                        lambda: geometry.uv_sphere(radius, stacks, slices))
+
+    def discard(self, key):
+        """Delete the mesh under `key`, if any (context must be current)"""
+        mesh = self._meshes.pop(key, None)
+        if mesh is not None:
+            mesh.delete()
+
+    def clear(self):
+        for mesh in self._meshes.values():
+            mesh.delete()
+        self._meshes.clear()
+
+    def __len__(self):
+        return len(self._meshes)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""Preset scene graphs: the eight single-object scenes and composite skies.
+
+Every builder takes the scene widget (for its textures and object colors)
+and returns the top-level nodes of the scene; `build` wraps them in a
+SceneGraph. Composite presets reuse the single-object nodes with their own
+local transforms.
+"""
+
+import functools
+
+import numpy as np
+
+import geometry
+import instancing
+from scene_graph import (BLENDED, LIT, UNLIT, GlowDrawable, InstancedDrawable, LodMeshDrawable,
+                         MeshDrawable, SceneGraph, SceneNode, lit_state, unlit_state)
+from transforms import rotation, scaling, translation
+
+# Kemiringan bulan sabit (dulu glRotatef(30, 1,0,0); glRotatef(20, 0,1,0))
+MOON_TILT = rotation(30, 1, 0, 0) @ rotation(20, 0, 1, 0)
+
+
+def lightning_node(widget, local=None):
+    node = SceneNode('lightning', local=local)
+    node.add(SceneNode('lightning_bolt', MeshDrawable(('lightning',), geometry.lightning_bolt)))
+    # Glow digambar dengan blending, setelah semua objek opaque
+    node.add(SceneNode('lightning_glow',
+                       GlowDrawable(geometry.LIGHTNING_POINTS, geometry.LIGHTNING_GLOW), BLENDED))
+    return node
+
+
+def cloud_node(widget, local=None, name='cloud'):
+    # Bayangan awan dari tekstur noise (procedural.cloud_noise)
+    return SceneNode(name, LodMeshDrawable('ellipse', 1.1, ('cloud',), geometry.cloud),
+                     unlit_state(widget.cloud_texture),
+                     widget.object_color.get('cloud', (1.0, 1.0, 1.0)), local)
+
+
+def rainbow_node(widget, local=None):
+    # Satu busur; warna dan tepi yang memudar dari tekstur gradien, jadi blended
+    def build():
+        return geometry.arc_band(0.5, 0.5 + 0.15 * len(geometry.RAINBOW_COLORS),
+                                 np.pi / 8, np.pi - np.pi / 8, segments=50)
+    return SceneNode('rainbow', MeshDrawable(('rainbow_arc',), build),
+                     unlit_state(widget.rainbow_texture, blend=True), local=local)
+
+
+def rocket_key(body_color):
+    # Warna badan ada di warna vertex, jadi ikut kunci mesh
+    return ('rocket', tuple(body_color))
+
+
+def rocket_node(widget, local=None):
+    body_color = tuple(widget.object_color.get('rocket', (0.8, 0.8, 0.8)))
+    return SceneNode('rocket', MeshDrawable(rocket_key(body_color),
+                                            lambda: geometry.rocket(body_color)),
+                     UNLIT, local=local)
+
+
+STAR_KEY = ('star', 1.0, 0.4, 0.3)
+# Awan instanced memakai satu level tetap (LOD per instance tidak ada)
+CLOUD_INSTANCE_SEGMENTS = 24
+
+# InstanceSet dibuat sekali per parameter: graph yang dibangun ulang (mis.
+# setelah ganti warna) memakai buffer GPU yang sama
+star_field = functools.lru_cache(maxsize=None)(instancing.star_field)
+star_backdrop = functools.lru_cache(maxsize=None)(instancing.star_backdrop)
+cloud_bank = functools.lru_cache(maxsize=None)(instancing.cloud_bank)
+
+
+def star_node(widget, local=None, name='star'):
+    return SceneNode(name, MeshDrawable(STAR_KEY, lambda: geometry.star_prism(1.0, 0.4, 0.3)),
+                     LIT, local=local)
+
+
+# Warna rata-rata bintang bila digambar sebagai sprite titik (jauh, < 4 pixel)
+STAR_POINT_COLOR = (1.0, 0.85, 0.4)
+
+
+def star_instances_node(instances, name='star_field', local=None, point_color=None,
+                        point_sprite=None):
+    return SceneNode(name, InstancedDrawable(STAR_KEY, lambda: geometry.star_prism(1.0, 0.4, 0.3),
+                                             instances, point_color=point_color,
+                                             point_sprite=point_sprite),
+                     LIT, local=local)
+
+
+def saturn_node(widget, local=None):
+    node = SceneNode('saturn', local=local)
+    node.add(SceneNode('saturn_sphere',
+                       LodMeshDrawable('sphere', 0.91, ('sphere', 0.91),
+                                       lambda level: geometry.uv_sphere(0.91, *level)),
+                       lit_state(widget.saturn_texture, 0.3, 5.0)))
+    # Radius luar 1.6 diregangkan 1.2 pada sumbu x. Pita cincin transparan:
+    # digambar dengan blending, setelah bola dan objek opaque lain
+    node.add(SceneNode('saturn_ring',
+                       LodMeshDrawable('ring', 1.6 * 1.2, ('ring', 1.1, 1.6, 0.1),
+                                       lambda segments: geometry.saturn_ring(1.1, 1.6, segments, 0.1)),
+                       lit_state(widget.saturn_ring_texture, 0.3, 50.0, blend=True), (0.9, 0.9, 0.9)))
+    return node
+
+
+def earth_node(widget, local=None):
+    return SceneNode('earth', LodMeshDrawable('sphere', 1.0, ('sphere', 1.0),
+                                              lambda level: geometry.uv_sphere(1.0, *level)),
+                     lit_state(widget.earth_texture), local=local)
+
+
+def moon_node(widget, local=None):
+    local = MOON_TILT if local is None else local @ MOON_TILT
+    # Kunci cache: (radius, tebal, offset) plus jumlah segmen dari LOD
+    return SceneNode('moon', LodMeshDrawable('crescent', 0.8, ('crescent', 0.8, 0.3, 0.45),
+                                             lambda segments: geometry.crescent_prism(0.8, 0.3, segments, 0.45)),
+                     lit_state(widget.moon_texture, 0.3, 5.0), local=local)
+
+
+def earth_moon(widget):
+    """Spinning Earth with the crescent Moon on a circular orbit"""
+    earth = earth_node(widget, scaling(0.8, 0.8, 0.8))
+    earth.set_spin(20.0)
+    orbit = SceneNode('moon_orbit', local=rotation(15, 0, 0, 1))
+    orbit.set_spin(30.0)
+    orbit.add(moon_node(widget, translation(1.9, 0.0, 0.0) @ scaling(0.35, 0.35, 0.35)))
+    return [earth, orbit]
+
+
+def saturn_stars(widget, count=300, seed=7):
+    """Saturn inside a shell of small stars (fixed seed, same field every time)"""
+    return [saturn_node(widget), star_instances_node(star_field(count, seed))]
+
+
+def rainbow_clouds(widget):
+    """Rainbow arc with a row of clouds in front of its base"""
+    nodes = [rainbow_node(widget, translation(0.0, -0.3, 0.0) @ scaling(1.6, 1.6, 1.0))]
+    for i, (x, y) in enumerate([(-1.3, -0.9), (-0.55, -1.05), (0.2, -0.85), (0.95, -1.0)]):
+        # Sedikit di depan pelangi supaya tidak bertumpuk di bidang z yang sama
+        nodes.append(cloud_node(widget, translation(x, y, 0.05 + 0.01 * i) @ scaling(0.45, 0.45, 1.0),
+                                name=f'cloud_{i}'))
+    return nodes
+
+
+def night_sky(widget, stars=50000, clouds=200):
+    """Tens of thousands of stars behind a bank of clouds, all instanced"""
+    cloud_color = tuple(0.4 * c for c in widget.object_color.get('cloud', (1.0, 1.0, 1.0)))
+    bank = SceneNode('cloud_bank',
+                     InstancedDrawable(('cloud', CLOUD_INSTANCE_SEGMENTS),
+                                       lambda: geometry.cloud(CLOUD_INSTANCE_SEGMENTS),
+                                       cloud_bank(clouds)),
+                     UNLIT, cloud_color)
+    return [star_instances_node(star_backdrop(stars), 'star_backdrop', point_color=STAR_POINT_COLOR,
+                                point_sprite=widget.star_glow_texture),
+            bank]
+
+
+PRESETS = {
+    'lightning': lambda widget: [lightning_node(widget)],
+    'cloud': lambda widget: [cloud_node(widget)],
+    'rainbow': lambda widget: [rainbow_node(widget)],
+    'rocket': lambda widget: [rocket_node(widget)],
+    'star': lambda widget: [star_node(widget)],
+    'saturn': lambda widget: [saturn_node(widget)],
+    'earth': lambda widget: [earth_node(widget)],
+    'moon': lambda widget: [moon_node(widget)],
+    'earth_moon': earth_moon,
+    'saturn_stars': saturn_stars,
+    'rainbow_clouds': rainbow_clouds,
+    'night_sky': night_sky,
+}
+
+
+def build(name, widget):
+    """SceneGraph for preset `name`"""
+    graph = SceneGraph(name)
+    for node in PRESETS[name](widget):
+        graph.add(node)
+    return graph
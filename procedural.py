@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""Procedural textures generated with NumPy: noise, falloff and gradients.
+
+Every generator takes (size, seed) and returns bottom-row-first
+(h, w, channels) uint8 pixels, the layout texture_cache stores for image
+files. Output depends only on its arguments, so results are cached on disk
+under (name, size, seed) like a decoded file (TextureCache.load_generated)
+and `generate` can run in a worker process (TextureLoader uses a
+ProcessPoolExecutor). Nothing in here touches OpenGL.
+
+    ring_band        radial density / transparency of Saturn's rings (size x 1, RGBA)
+    cloud_noise      tileable fractal noise for cloud shading (size x size, grey)
+    star_glow        soft glow with four rays for star sprites (size x size, RGBA)
+    rainbow_gradient smooth spectrum across the rainbow arc (size x 1, RGBA)
+
+Bump VERSION when a generator changes its output; stale cache entries are
+then rebuilt.
+"""
+
+import numpy as np
+
+from geometry import RAINBOW_COLORS
+from texture_cache import TextureCache
+
+VERSION = 1
+
+
+def _fade(t):
+    # Kurva Perlin 6t^5 - 15t^4 + 10t^3: turunan pertama dan kedua nol di 0 dan 1
+    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+
+
+def gradient_noise(size, frequency, seed):
+    """Tileable 2D Perlin noise on a frequency x frequency lattice, roughly in [-0.7, 0.7]"""
+    angles = np.random.RandomState(seed).uniform(0.0, 2.0 * np.pi, (frequency, frequency))
+    gradients = np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+
+    coords = (np.arange(size) + 0.5) * (frequency / size)
+    cell = np.floor(coords).astype(np.int64)
+    t = coords - cell
+    y0, x0 = cell[:, None], cell[None, :]
+    # Lattice dibungkus: tekstur bisa diulang tanpa sambungan
+    y1, x1 = (y0 + 1) % frequency, (x0 + 1) % frequency
+    ty, tx = t[:, None], t[None, :]
+
+    def corner(gy, gx, dy, dx):
+        g = gradients[gy, gx]
+        return g[..., 0] * dx + g[..., 1] * dy
+
+    u, v = _fade(tx), _fade(ty)
+    top = corner(y0, x0, ty, tx) * (1 - u) + corner(y0, x1, ty, tx - 1) * u
+    bottom = corner(y1, x0, ty - 1, tx) * (1 - u) + corner(y1, x1, ty - 1, tx - 1) * u
+    return top * (1 - v) + bottom * v
+
+
+def fractal_noise(size, seed, octaves=5, frequency=4, persistence=0.5):
+    """Sum of gradient noise octaves (fBm), normalized to [0, 1]"""
+    total = np.zeros((size, size))
+    amplitude = 1.0
+    for octave in range(octaves):
+        cells = frequency * 2 ** octave
+        if cells > size:
+            break
+        total += amplitude * gradient_noise(size, cells, seed + octave)
+        amplitude *= persistence
+    low, high = total.min(), total.max()
+    return (total - low) / max(high - low, 1e-9)
+
+
+def radial_falloff(size, power=2.0):
+    """1 at the centre of a size x size square, 0 from the inscribed circle outwards"""
+    coords = (np.arange(size) + 0.5) / size * 2.0 - 1.0
+    r = np.hypot(coords[:, None], coords[None, :])
+    return np.clip(1.0 - r, 0.0, 1.0) ** power
+
+
+def _to_pixels(channels):
+    return np.ascontiguousarray(np.rint(np.clip(channels, 0.0, 1.0) * 255).astype(np.uint8))
+
+
+# Profil radial cincin Saturnus (ringlet C, B, divisi Cassini, A, celah
+# Encke) sebagai (awal, akhir, kerapatan); 0 = tepi dalam, 1 = tepi luar
+RING_BANDS = [
+    (0.00, 0.28, 0.25),  # Cincin C: tipis dan gelap
+    (0.28, 0.69, 0.90),  # Cincin B: paling rapat
+    (0.69, 0.76, 0.06),  # Divisi Cassini
+    (0.76, 1.00, 0.60),  # Cincin A
+    (0.94, 0.955, 0.0),  # Celah Encke
+]
+RING_COLOR = (0.91, 0.84, 0.70)
+
+
+def ring_band(size=256, seed=5):
+    """Ring density across u (inner to outer edge); alpha is the density"""
+    u = (np.arange(size) + 0.5) / size
+    density = np.zeros(size)
+    for start, end, value in RING_BANDS:
+        density[(u >= start) & (u < end)] = value
+    # Ringlet halus: noise acak yang dihaluskan
+    noise = np.random.RandomState(seed).uniform(-1.0, 1.0, size)
+    noise = np.convolve(noise, np.ones(5) / 5.0, mode='same')
+    density = np.clip(density * (1.0 + 0.35 * noise), 0.0, 1.0)
+    shade = 0.55 + 0.45 * density  # Bagian rapat juga lebih terang
+    rgba = np.concatenate([np.outer(shade, RING_COLOR), density[:, None]], axis=1)
+    return _to_pixels(rgba[None])
+
+
+def cloud_noise(size=128, seed=11):
+    """Soft grey shading for clouds, 1 in the bright parts"""
+    return _to_pixels((0.75 + 0.25 * fractal_noise(size, seed))[..., None])
+
+
+def star_glow(size=64, seed=3):
+    """Warm glow with four thin rays; alpha carries the shape"""
+    coords = (np.arange(size) + 0.5) / size * 2.0 - 1.0
+    y, x = coords[:, None], coords[None, :]
+    # Sinar sedikit diputar sesuai seed supaya tiap set bintang berbeda
+    angle = np.random.RandomState(seed).uniform(0.0, np.pi / 4)
+    ray_x = x * np.cos(angle) + y * np.sin(angle)
+    ray_y = y * np.cos(angle) - x * np.sin(angle)
+    rays = np.exp(-np.abs(ray_y) * 40.0) * (1.0 - np.abs(ray_x)) + \
+        np.exp(-np.abs(ray_x) * 40.0) * (1.0 - np.abs(ray_y))
+    intensity = np.clip(radial_falloff(size, 3.0) + 0.6 * np.clip(rays, 0.0, None) *
+                        radial_falloff(size, 1.0), 0.0, 1.0)
+    color = np.array([1.0, 0.9, 0.6]) + np.array([0.0, 0.1, 0.4]) * intensity[..., None]
+    return _to_pixels(np.concatenate([color, intensity[..., None]], axis=-1))
+
+
+def rainbow_gradient(size=256, seed=0):
+    """RAINBOW_COLORS blended smoothly from u = 0 (inner edge) to 1, edges faded out"""
+    u = (np.arange(size) + 0.5) / size
+    # Pusat tiap pita lama di (i + 0.5) / 7
+    centers = (np.arange(len(RAINBOW_COLORS)) + 0.5) / len(RAINBOW_COLORS)
+    colors = np.asarray(RAINBOW_COLORS)
+    rgb = np.stack([np.interp(u, centers, colors[:, c]) for c in range(3)], axis=-1)
+    edge = np.clip(np.minimum(u, 1.0 - u) / 0.06, 0.0, 1.0)
+    alpha = edge * edge * (3.0 - 2.0 * edge)
+    return _to_pixels(np.concatenate([rgb, alpha[:, None]], axis=1)[None])
+
+
+GENERATORS = {
+    'ring_band': ring_band,
+    'cloud_noise': cloud_noise,
+    'star_glow': star_glow,
+    'rainbow_gradient': rainbow_gradient,
+}
+
+
+def cache_key(name, size, seed):
+    return f'procedural/{name}/{size}/{seed}'
+
+
+def build(name, size, seed):
+    return GENERATORS[name](size, seed)
+
+
+def generate(name, size, seed, cache_dir=None):
+    """Build texture `name` into the texture cache at `cache_dir` (worker process entry point)"""
+    TextureCache(cache_dir).load_generated(cache_key(name, size, seed), VERSION,
+                                           lambda: build(name, size, seed))
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""Per-frame instrumentation for SceneGLWidget.
+
+A FrameProfiler records, for every painted frame, the CPU time of each
+named phase (transform setup, texture uploads, the scene's draw_* call,
+buffer swap), the GPU time of the whole frame through GL_TIME_ELAPSED
+queries when the context supports them, and draw-call / vertex counts.
+The last `history` frames are kept for a rolling p50/p95/p99 summary, an
+on-screen HUD and JSON/CSV dumps.
+
+NullProfiler has the same interface and does nothing; it is what the
+widget holds while profiling is off.
+"""
+
+import csv
+import ctypes
+import json
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+from OpenGL import GL
+from OpenGL.raw.GL.VERSION.GL_3_3 import glGetQueryObjectui64v
+
+PERCENTILES = (50, 95, 99)
+# Jumlah query GPU yang bergiliran; hasil dibaca beberapa frame kemudian
+# supaya tidak menunggu GPU selesai
+_QUERY_RING = 4
+# Hasil query di atas ini dianggap tidak valid (beberapa driver software
+# mengembalikan nilai acak untuk frame pertama)
+_MAX_GPU_MS = 10000.0
+
+
+class _NullPhase(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class NullProfiler(object):
+    """Profiler stand-in used while profiling is disabled"""
+
+    enabled = False
+    show_hud = False
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def count_draw(self, vertices, calls=1):
+        pass
+
+    def count_culling(self, culled, instances_culled=0):
+        pass
+
+
+class _Phase(object):
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        phases = self.record['phases']
+        phases[self.name] = phases.get(self.name, 0.0) + (time.perf_counter() - self.start) * 1000.0
+        return False
+
+
+def gpu_timer_supported():
+    """Whether GL_TIME_ELAPSED queries are available in the current context"""
+    from textures import gl_version, has_extension
+    return gl_version() >= (3, 3) or has_extension('GL_ARB_timer_query') or \
+        has_extension('GL_EXT_timer_query')
+
+
+class FrameProfiler(object):
+    """Collects timings and counts for the last `history` frames"""
+
+    enabled = True
+
+    def __init__(self, history=600, gpu=True):
+        self.frames = deque(maxlen=history)
+        self.gpu = gpu
+        self.show_hud = False
+        self.current = None
+        self.frame_index = 0
+        self._queries = None
+        self._in_flight = deque()  # (query id, frame record)
+        self._frame_start = 0.0
+        self._result = ctypes.c_uint64()
+
+    def _init_queries(self):
+        if self.gpu and gpu_timer_supported():
+            self._queries = list(GL.glGenQueries(_QUERY_RING))
+        else:
+            self.gpu = False
+            self._queries = []
+
+    def begin_frame(self):
+        """Start a frame record; call with the GL context current"""
+        if self._queries is None:
+            self._init_queries()
+        self.current = {
+            'frame': self.frame_index,
+            'cpu_ms': 0.0,
+            'gpu_ms': None,
+            'draw_calls': 0,
+            'vertices': 0,
+            'culled': 0,
+            'instances_culled': 0,
+            'phases': OrderedDict(),
+        }
+        self.frame_index += 1
+        self._collect_queries(wait=False)
+        if self.gpu and self._queries:
+            query = self._queries.pop()
+            GL.glBeginQuery(GL.GL_TIME_ELAPSED, query)
+            self._in_flight.append((query, self.current))
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self.current is None:
+            return
+        self.current['cpu_ms'] = (time.perf_counter() - self._frame_start) * 1000.0
+        if self._in_flight and self._in_flight[-1][1] is self.current:
+            GL.glEndQuery(GL.GL_TIME_ELAPSED)
+        self.frames.append(self.current)
+        self.current = None
+
+    def _collect_queries(self, wait):
+        """Move finished GPU timings into their frame records"""
+        while self._in_flight:
+            query, record = self._in_flight[0]
+            if record is self.current:
+                break
+            if not wait and not GL.glGetQueryObjectuiv(query, GL.GL_QUERY_RESULT_AVAILABLE):
+                # Semua query sudah terpakai: tunggu yang tertua daripada kehilangan frame
+                if self._queries:
+                    break
+            # Wrapper PyOpenGL tidak mengenal array uint64, jadi pakai fungsi raw
+            glGetQueryObjectui64v(query, GL.GL_QUERY_RESULT, ctypes.byref(self._result))
+            gpu_ms = self._result.value / 1e6
+            record['gpu_ms'] = gpu_ms if gpu_ms < _MAX_GPU_MS else None
+            self._in_flight.popleft()
+            self._queries.append(query)
+
+    def finish(self):
+        """Wait for outstanding GPU timings (context must be current)"""
+        if self._in_flight:
+            self._collect_queries(wait=True)
+
+    def phase(self, name):
+        """Context manager adding the CPU time of its block to phase `name`"""
+        if self.current is None:
+            return _NULL_PHASE
+        return _Phase(self.current, name)
+
+    def count_draw(self, vertices, calls=1):
+        if self.current is not None:
+            self.current['draw_calls'] += calls
+            self.current['vertices'] += vertices
+
+    def count_culling(self, culled, instances_culled=0):
+        """Scene nodes and instances skipped by frustum culling this frame"""
+        if self.current is not None:
+            self.current['culled'] += culled
+            self.current['instances_culled'] += instances_culled
+
+    def phase_names(self):
+        names = OrderedDict()
+        for record in self.frames:
+            for name in record['phases']:
+                names[name] = None
+        return list(names)
+
+    def summary(self):
+        """Percentiles of every metric over the recorded frames"""
+        if not self.frames:
+            return {}
+        columns = OrderedDict()
+        columns['cpu_ms'] = [record['cpu_ms'] for record in self.frames]
+        gpu = [record['gpu_ms'] for record in self.frames if record['gpu_ms'] is not None]
+        if gpu:
+            columns['gpu_ms'] = gpu
+        for name in self.phase_names():
+            # Hanya frame yang benar-benar menjalankan fase ini
+            columns[name] = [record['phases'][name] for record in self.frames
+                             if name in record['phases']]
+        columns['draw_calls'] = [record['draw_calls'] for record in self.frames]
+        columns['vertices'] = [record['vertices'] for record in self.frames]
+
+        result = OrderedDict()
+        for name, values in columns.items():
+            values = np.asarray(values, dtype=np.float64)
+            stats = OrderedDict(('p%d' % p, float(v))
+                                for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES)))
+            stats['mean'] = float(values.mean())
+            result[name] = stats
+        return result
+
+    def hud_lines(self):
+        """Short text lines for the on-screen overlay"""
+        if not self.frames:
+            return ["profiler: no frames yet"]
+        stats = self.summary()
+        last = self.frames[-1]
+        lines = [f"frames {len(self.frames)}  draws {last['draw_calls']}  verts {last['vertices']}  "
+                 f"culled {last['culled']}+{last['instances_culled']}"]
+        for name, values in stats.items():
+            if name in ('draw_calls', 'vertices'):
+                continue
+            lines.append(f"{name:<14} p50 {values['p50']:6.2f}  p95 {values['p95']:6.2f}  "
+                         f"p99 {values['p99']:6.2f} ms")
+        return lines
+
+    def report(self):
+        return "\n".join(self.hud_lines())
+
+    def dump_json(self, path):
+        with open(path, 'w') as f:
+            json.dump({'summary': self.summary(), 'frames': list(self.frames)}, f, indent=2)
+
+    def dump_csv(self, path):
+        phases = self.phase_names()
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'cpu_ms', 'gpu_ms', 'draw_calls', 'vertices', 'culled',
+                             'instances_culled'] + phases)
+            for record in self.frames:
+                writer.writerow([record['frame'], f"{record['cpu_ms']:.4f}",
+                                 '' if record['gpu_ms'] is None else f"{record['gpu_ms']:.4f}",
+                                 record['draw_calls'], record['vertices'], record['culled'],
+                                 record['instances_culled']] +
+                                [f"{record['phases'][name]:.4f}" if name in record['phases'] else ''
+                                 for name in phases])
+
+    def dump(self, path):
+        """Write JSON or CSV depending on the file extension"""
+        if path.lower().endswith('.csv'):
+            self.dump_csv(path)
+        else:
+            self.dump_json(path)
+
+    def delete(self):
+        """Release the GPU query objects (context must be current)"""
+        queries = (self._queries or []) + [query for query, _ in self._in_flight]
+        if queries:
+            GL.glDeleteQueries(len(queries), queries)
+        self._queries = None
+        self._in_flight.clear()
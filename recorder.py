@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Record immediate-mode line art once and replay it from a vertex buffer.
+
+`record(draw, *args)` calls `draw(gl, *args)` with a GLRecorder as `gl`:
+glBegin / glVertex / glColor / glEnd and glLineWidth (between primitives)
+are captured instead of executed. Consecutive primitives with the same mode
+and line width become one batch; all batches share one VBO and every batch
+is drawn with a single glMultiDrawArrays:
+
+    recording = record(draw_glow_lines, points, layers)
+    recording.replay()      # every frame while points and layers are unchanged
+
+Any other GL call raises RecordingError.
+"""
+
+import ctypes
+
+import numpy as np
+from OpenGL import GL
+
+import mesh
+
+_FLOAT_SIZE = 4
+# Baris vertex terekam: posisi xyz lalu warna rgba
+_LAYOUT = {'positions': (3, 0), 'colors': (4, 3)}
+_STRIDE = 7 * _FLOAT_SIZE
+
+
+class RecordingError(Exception):
+    """The recorded code used a GL call that cannot be replayed"""
+
+
+class GLRecorder(object):
+    """Stand-in for the OpenGL.GL module, passed to the draw function being recorded"""
+
+    def __init__(self):
+        self.batches = []  # (mode, line width, [vertex rows per primitive])
+        self._line_width = None
+        self._mode = None
+        self._vertices = None
+        self._color = (1.0, 1.0, 1.0, 1.0)
+
+    def __getattr__(self, name):
+        # Konstanta (GL_LINE_LOOP, ...) boleh dibaca; fungsi lain tidak bisa diputar ulang
+        if name.startswith('GL_'):
+            return getattr(GL, name)
+        raise RecordingError(f"{name} cannot be recorded")
+
+    def glBegin(self, mode):
+        if self._mode is not None:
+            raise RecordingError("glBegin inside glBegin/glEnd")
+        self._mode = int(mode)
+        self._vertices = []
+
+    def glEnd(self):
+        if self._mode is None:
+            raise RecordingError("glEnd without glBegin")
+        if self._vertices:
+            if self.batches and self.batches[-1][:2] == (self._mode, self._line_width):
+                self.batches[-1][2].append(self._vertices)
+            else:
+                self.batches.append((self._mode, self._line_width, [self._vertices]))
+        self._mode = self._vertices = None
+
+    def glVertex3f(self, x, y, z):
+        if self._mode is None:
+            raise RecordingError("glVertex outside glBegin/glEnd")
+        self._vertices.append((x, y, z) + self._color)
+
+    def glVertex2f(self, x, y):
+        self.glVertex3f(x, y, 0.0)
+
+    def glColor4f(self, r, g, b, a):
+        self._color = (r, g, b, a)
+
+    def glColor3f(self, r, g, b):
+        self._color = (r, g, b, 1.0)
+
+    def glLineWidth(self, width):
+        if self._mode is not None:
+            raise RecordingError("glLineWidth inside glBegin/glEnd")
+        self._line_width = float(width)
+
+    def finish(self):
+        if self._mode is not None:
+            raise RecordingError("glBegin without glEnd")
+        return Recording(self.batches)
+
+
+class Recording(object):
+    """Captured primitives in one VBO, replayed batch by batch"""
+
+    def __init__(self, batches):
+        rows = [vertex for _, _, primitives in batches for primitive in primitives
+                for vertex in primitive]
+        self.vertices = np.array(rows, dtype=np.float32).reshape(-1, 7)
+        self.batches = []
+        first = 0
+        for mode, line_width, primitives in batches:
+            counts = np.array([len(primitive) for primitive in primitives], dtype=np.int32)
+            firsts = first + np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int32)
+            self.batches.append((mode, line_width, firsts, counts))
+            first += int(counts.sum())
+        self.vbo = None
+
+    def replay(self):
+        if not len(self.vertices):
+            return
+        if self.vbo is None:
+            self.vbo = GL.glGenBuffers(1)
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL.GL_STATIC_DRAW)
+        else:
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        pointers = {name: ctypes.c_void_p(offset * _FLOAT_SIZE)
+                    for name, (_, offset) in _LAYOUT.items()}
+        enabled = mesh._enable_arrays(_LAYOUT, _STRIDE, pointers)
+        for mode, line_width, firsts, counts in self.batches:
+            if line_width is not None:
+                GL.glLineWidth(line_width)
+            GL.glMultiDrawArrays(mode, firsts, counts, len(firsts))
+            if mesh.draw_counter is not None:
+                mesh.draw_counter(int(counts.sum()))
+        for client_state in enabled:
+            GL.glDisableClientState(client_state)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        # Seperti immediate mode: warna terakhir tetap jadi warna saat ini
+        GL.glColor4f(*self.vertices[-1, 3:7])
+
+    def delete(self):
+        if self.vbo is not None:
+            GL.glDeleteBuffers(1, [self.vbo])
+            self.vbo = None
+
+
+def record(draw, *args):
+    """Call draw(recorder, *args) and return the Recording of its GL calls"""
+    recorder = GLRecorder()
+    draw(recorder, *args)
+    return recorder.finish()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""Parallel frame export: several headless renderers, one writer.
+
+The coordinator splits each scene's frame range into chunks of consecutive
+frames. Worker processes take chunks from a queue, so faster workers simply
+take more. Each worker has its own offscreen GL context and
+HeadlessRenderer (render_headless.py), so every frame is drawn by the
+viewer's own widget code. Finished frames travel through a ring of
+shared-memory slots rather than pipes. The coordinator is the only writer:
+a PNG sequence, or a raw RGBA stream written strictly in frame order.
+
+An interrupted job can continue with --resume: PNG frames that exist are
+skipped (they are written under a temporary name first), and a raw file is
+cut back to its last whole frame and appended to.
+
+Contoh:
+    python render_farm.py saturn earth --frames 3600 --workers 8 --out frames
+    python render_farm.py saturn --frames 3600 --workers 8 --out frames --resume
+    python render_farm.py earth_moon --frames 900 --fps 30 --format rgba --out - | \\
+        ffmpeg -f rawvideo -pix_fmt rgba -s 512x512 -r 30 -i - earth_moon.mp4
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from render_headless import BACKENDS, WRITERS, parse_size
+
+# Frame berurutan per tugas: cukup kecil untuk pembagian merata, cukup besar
+# supaya antrean tidak sibuk
+CHUNK = 8
+# Slot shared memory per worker: satu diisi selagi yang lain ditulis
+SLOTS_PER_WORKER = 2
+
+
+def _worker(settings, tasks, free_slots, done, memory_name):
+    """Worker process: render chunks from `tasks` into free shared-memory slots"""
+    width, height = settings['size']
+    # Stdout bisa jadi stream frame milik koordinator (--out -): pesan worker ke stderr
+    sys.stdout = sys.stderr
+    memory = shared_memory.SharedMemory(name=memory_name)
+    slots = np.ndarray((settings['slots'], height, width, 4), dtype=np.uint8, buffer=memory.buf)
+    renderer = None
+    try:
+        # llvmpipe memakai thread per core; dengan satu proses per core itu hanya berebut
+        if settings['single_threaded']:
+            os.environ.setdefault('LP_NUM_THREADS', '1')
+        from render_headless import HeadlessRenderer
+        renderer = HeadlessRenderer(width, height, settings['backend'], settings['renderer'])
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            scene, indices = task
+            for index in indices:
+                rgba = renderer.frame(scene, index, settings['frames'], settings['axis'], settings['fps'])
+                slot = free_slots.get()
+                slots[slot] = rgba
+                done.put((index, slot))
+    except Exception as e:
+        done.put(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        del slots
+        memory.close()
+        if renderer is not None:
+            renderer.close()
+
+
+class RenderFarm(object):
+    """Worker processes plus the shared frame slots; render scenes with `render`"""
+
+    def __init__(self, workers, width, height, frames, backend='auto', renderer='legacy',
+                 axis='y', fps=None):
+        self.width = width
+        self.height = height
+        self.frames = frames
+        slot_count = workers * SLOTS_PER_WORKER
+        self.memory = shared_memory.SharedMemory(create=True, size=slot_count * height * width * 4)
+        self.slots = np.ndarray((slot_count, height, width, 4), dtype=np.uint8, buffer=self.memory.buf)
+
+        # spawn: tiap worker mulai bersih, tanpa konteks GL / Qt milik proses induk
+        context = multiprocessing.get_context('spawn')
+        self.tasks = context.Queue()
+        self.free_slots = context.Queue()
+        self.done = context.Queue()
+        for slot in range(slot_count):
+            self.free_slots.put(slot)
+        settings = {'size': (width, height), 'slots': slot_count, 'frames': frames, 'axis': axis,
+                    'fps': fps, 'backend': backend, 'renderer': renderer,
+                    'single_threaded': workers > 1}
+        self.workers = [context.Process(target=_worker, name=f'render-farm-{i}', daemon=True,
+                                        args=(settings, self.tasks, self.free_slots, self.done,
+                                              self.memory.name))
+                        for i in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def render(self, scene, writer, skip=()):
+        """Render every frame of `scene` not in `skip` and hand it to `writer`; returns the count"""
+        remaining = [i for i in range(self.frames) if i not in skip]
+        for start in range(0, len(remaining), CHUNK):
+            self.tasks.put((scene, remaining[start:start + CHUNK]))
+
+        # Stream raw / video harus berurutan; frame yang datang lebih awal disalin dan slotnya dilepas
+        ordered = writer.ordered
+        waiting = {}
+        pending = iter(remaining)
+        next_index = next(pending, None)
+        for _ in remaining:
+            index, slot = self._receive()
+            if not ordered:
+                writer.write(index, self.slots[slot])
+                self.free_slots.put(slot)
+                continue
+            if index != next_index:
+                waiting[index] = self.slots[slot].copy()
+                self.free_slots.put(slot)
+                continue
+            writer.write(index, self.slots[slot])
+            self.free_slots.put(slot)
+            next_index = next(pending, None)
+            while next_index in waiting:
+                writer.write(next_index, waiting.pop(next_index))
+                next_index = next(pending, None)
+        return len(remaining)
+
+    def _receive(self):
+        while True:
+            try:
+                message = self.done.get(timeout=1.0)
+            except queue.Empty:
+                dead = [worker.name for worker in self.workers if not worker.is_alive()]
+                if dead:
+                    raise RuntimeError(f"Render worker {dead[0]} exited unexpectedly")
+                continue
+            if message[0] == 'error':
+                raise RuntimeError(f"Render worker failed: {message[1]}")
+            return message
+
+    def close(self):
+        for _ in self.workers:
+            self.tasks.put(None)
+        for worker in self.workers:
+            worker.join(timeout=10.0)
+            if worker.is_alive():
+                worker.terminate()
+        del self.slots
+        self.memory.close()
+        self.memory.unlink()
+
+    def terminate(self):
+        """Stop the workers right away (interrupted job); frames written so far stay"""
+        for worker in self.workers:
+            worker.terminate()
+        for worker in self.workers:
+            worker.join()
+        del self.slots
+        self.memory.close()
+        self.memory.unlink()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render langit scenes with several processes")
+    parser.add_argument('scenes', nargs='+', help="scene names, or 'all'")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="render processes (default: one per core)")
+    parser.add_argument('--frames', type=int, default=360, help="frames per scene (one full turn)")
+    parser.add_argument('--size', type=parse_size, default=(512, 512), help="WIDTHxHEIGHT")
+    parser.add_argument('--axis', choices='xyz', default='y', help="turntable axis")
+    parser.add_argument('--fps', type=float,
+                        help="play the viewer's animation timeline at this rate instead of a turntable")
+    parser.add_argument('--format', choices=sorted(WRITERS), default='png')
+    parser.add_argument('--out', default='frames', help="output directory, or '-' for raw stdout")
+    parser.add_argument('--resume', action='store_true',
+                        help="keep frames already written by an interrupted run and render the rest")
+    parser.add_argument('--backend', choices=[b for b in BACKENDS if b != 'qt'], default='auto')
+    parser.add_argument('--renderer', choices=['legacy', 'core'],
+                        default=os.environ.get('LANGIT_RENDERER', 'legacy'),
+                        help="fixed-function (legacy) or core-profile shader renderer")
+    args = parser.parse_args(argv)
+
+    if args.out == '-' and args.format != 'rgba':
+        parser.error("--out - is only supported with --format rgba")
+    if args.out == '-' and args.resume:
+        parser.error("--resume needs an output directory")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    import langit  # Hanya untuk daftar scene; proses ini sendiri tidak menggambar
+    scenes = langit.SCENES if args.scenes == ['all'] else args.scenes
+    for scene in scenes:
+        if scene not in langit.SCENES:
+            parser.error(f"Unknown scene '{scene}' (choose from {', '.join(langit.SCENES)})")
+
+    width, height = args.size
+    farm = RenderFarm(args.workers, width, height, args.frames, args.backend, args.renderer,
+                      args.axis, args.fps)
+    try:
+        for scene in scenes:
+            writer = WRITERS[args.format](args.out, scene, resume=args.resume, frame_size=args.size,
+                                          fps=args.fps)
+            skip = writer.completed(args.frames) if args.resume else set()
+            start = time.perf_counter()
+            try:
+                rendered = farm.render(scene, writer, skip)
+            finally:
+                writer.close()
+            elapsed = time.perf_counter() - start
+            print(f"{scene}: {rendered} frames {width}x{height} in {elapsed:.2f} s "
+                  f"({rendered / max(elapsed, 1e-9):.1f} frames/s, {len(skip)} already done, "
+                  f"{args.workers} workers, renderer {args.renderer})",
+                  file=sys.stderr)
+    except KeyboardInterrupt:
+        farm.terminate()
+        print("Interrupted; run again with --resume to render the remaining frames", file=sys.stderr)
+        return 130
+    except BaseException:
+        farm.terminate()
+        raise
+    farm.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
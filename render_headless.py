@@ -0,0 +1,459 @@
+# -*- coding: utf-8 -*-
+"""Headless frame export for the langit scenes.
+
+Renders turntable frames of any scene into an offscreen framebuffer and
+writes them as a PNG sequence or as one raw RGBA stream, without opening a
+window. Works on machines without a display through EGL (surfaceless Mesa)
+or OSMesa software GL.
+
+Contoh:
+    python render_headless.py earth --frames 360 --size 512x512 --out frames
+    python render_headless.py earth_moon --frames 180 --fps 30 --out frames
+    python render_headless.py saturn --frames 3000 --format rgba --out - | \\
+        ffmpeg -f rawvideo -pix_fmt rgba -s 512x512 -i - saturn.mp4
+"""
+
+import argparse
+import ctypes
+import functools
+import os
+import sys
+import time
+
+BACKENDS = ['auto', 'egl', 'osmesa', 'qt']
+
+
+def select_platform(backend):
+    """Resolve 'auto' and prepare the environment; must run before importing OpenGL"""
+    if backend == 'auto':
+        has_display = os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')
+        backend = 'qt' if has_display else 'egl'
+    if backend == 'egl':
+        os.environ['PYOPENGL_PLATFORM'] = 'egl'
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+    elif backend == 'osmesa':
+        os.environ['PYOPENGL_PLATFORM'] = 'osmesa'
+    if backend != 'qt':
+        # SceneGLWidget tetap butuh QApplication, tapi tidak butuh layar
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return backend
+
+
+class EglContext(object):
+    """Desktop GL context on an EGL pbuffer (surfaceless Mesa works without a display)"""
+
+    def __init__(self, width, height, core=False):
+        from OpenGL import EGL
+        self.EGL = EGL
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        if not EGL.eglInitialize(self.display, None, None):
+            raise RuntimeError("eglInitialize failed")
+        attribs = (EGL.EGLint * 9)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_NONE, 0, 0)
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        EGL.eglChooseConfig(self.display, attribs, ctypes.pointer(config), 1, ctypes.pointer(count))
+        if count.value == 0:
+            raise RuntimeError("No EGL config with desktop OpenGL support")
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context_attribs = None
+        if core:
+            context_attribs = (EGL.EGLint * 7)(
+                EGL.EGL_CONTEXT_MAJOR_VERSION, 3,
+                EGL.EGL_CONTEXT_MINOR_VERSION, 3,
+                EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+                EGL.EGL_NONE)
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, context_attribs)
+        if not self.context:
+            raise RuntimeError("eglCreateContext failed" + (" (OpenGL 3.3 core)" if core else ""))
+        surface_attribs = (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE)
+        self.surface = EGL.eglCreatePbufferSurface(self.display, config, surface_attribs)
+        if not EGL.eglMakeCurrent(self.display, self.surface, self.surface, self.context):
+            raise RuntimeError("eglMakeCurrent failed")
+
+    def release(self):
+        EGL = self.EGL
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroySurface(self.display, self.surface)
+        EGL.eglDestroyContext(self.display, self.context)
+        EGL.eglTerminate(self.display)
+
+
+class OsMesaContext(object):
+    """Pure software context through OSMesa"""
+
+    def __init__(self, width, height, core=False):
+        from OpenGL import GL, arrays, osmesa
+        self.osmesa = osmesa
+        if core:
+            attribs = (ctypes.c_int * 11)(
+                osmesa.OSMESA_FORMAT, osmesa.OSMESA_RGBA, osmesa.OSMESA_DEPTH_BITS, 24,
+                osmesa.OSMESA_PROFILE, osmesa.OSMESA_CORE_PROFILE,
+                osmesa.OSMESA_CONTEXT_MAJOR_VERSION, 3, osmesa.OSMESA_CONTEXT_MINOR_VERSION, 3, 0)
+            self.context = osmesa.OSMesaCreateContextAttribs(attribs, None)
+        else:
+            self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        if not self.context:
+            raise RuntimeError("OSMesaCreateContextExt failed")
+        self.buffer = arrays.GLubyteArray.zeros((height, width, 4))
+        if not osmesa.OSMesaMakeCurrent(self.context, self.buffer, GL.GL_UNSIGNED_BYTE, width, height):
+            raise RuntimeError("OSMesaMakeCurrent failed")
+
+    def release(self):
+        self.osmesa.OSMesaDestroyContext(self.context)
+
+
+class QtContext(object):
+    """QOpenGLContext on a QOffscreenSurface (needs a QPA platform with GL)"""
+
+    def __init__(self, width, height, core=False):
+        from PyQt5 import QtGui
+        fmt = QtGui.QSurfaceFormat()
+        fmt.setDepthBufferSize(24)
+        if core:
+            fmt.setVersion(3, 3)
+            fmt.setProfile(QtGui.QSurfaceFormat.CoreProfile)
+        self.surface = QtGui.QOffscreenSurface()
+        self.surface.setFormat(fmt)
+        self.surface.create()
+        self.context = QtGui.QOpenGLContext()
+        self.context.setFormat(fmt)
+        if not self.context.create() or not self.context.makeCurrent(self.surface):
+            raise RuntimeError("Could not create an offscreen Qt OpenGL context")
+
+    def release(self):
+        self.context.doneCurrent()
+        self.surface.destroy()
+
+
+CONTEXTS = {'egl': EglContext, 'osmesa': OsMesaContext, 'qt': QtContext}
+
+
+class Framebuffer(object):
+    """Color + depth renderbuffers that every backend renders into"""
+
+    def __init__(self, width, height):
+        from OpenGL import GL
+        self.GL = GL
+        self.width = width
+        self.height = height
+        self.fbo = GL.glGenFramebuffers(1)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.fbo)
+        self.color, self.depth = GL.glGenRenderbuffers(2)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, self.color)
+        GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_RGBA8, width, height)
+        GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0,
+                                     GL.GL_RENDERBUFFER, self.color)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, self.depth)
+        GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_DEPTH_COMPONENT24, width, height)
+        GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_DEPTH_ATTACHMENT,
+                                     GL.GL_RENDERBUFFER, self.depth)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, 0)
+        status = GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER)
+        if status != GL.GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f"Framebuffer incomplete (status 0x{int(status):x})")
+
+    def read_rgba(self):
+        """Read the frame back as a top-down (height, width, 4) uint8 array"""
+        import numpy as np
+        GL = self.GL
+        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
+        data = GL.glReadPixels(0, 0, self.width, self.height, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE)
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 4)[::-1]
+
+    def delete(self):
+        GL = self.GL
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
+        GL.glDeleteRenderbuffers(2, [self.color, self.depth])
+        GL.glDeleteFramebuffers(1, [self.fbo])
+
+
+def turntable_rotation(index, frames, axis='y'):
+    """(x, y, z) rotation of frame `index` in a revolution of `frames` frames"""
+    rotation = [0.0, 0.0, 0.0]
+    rotation['xyz'.index(axis)] = 360.0 * index / frames
+    return tuple(rotation)
+
+
+class HeadlessRenderer(object):
+    """Drives a scene widget's GL code in an offscreen context.
+
+    The widget is never shown; its initializeGL/resizeGL/paintGL are called
+    directly while our own context and framebuffer are current, so the scene
+    and transform state are exactly those of the interactive viewer.
+    `renderer` picks the widget ('legacy' or 'core', see langit.RENDERERS);
+    'core' gets an OpenGL 3.3 core-profile context.
+    """
+
+    def __init__(self, width, height, backend='auto', renderer='legacy', readback='pbo'):
+        backend = select_platform(backend)
+        from PyQt5 import QtWidgets
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+        import langit
+        import video
+        self.backend = backend
+        self.width = width
+        self.height = height
+        self.renderer = renderer
+        self.context = CONTEXTS[backend](width, height, core=(renderer == 'core'))
+        self.framebuffer = Framebuffer(width, height)
+        # Urutan frame (turntable / animation) dibaca lewat PBO: frame N diambil saat N+1 digambar
+        self.reader = None
+        if readback == 'pbo' and video.PixelBufferReader.supported():
+            self.reader = video.PixelBufferReader(width, height)
+        self.widget = langit.create_scene_widget(renderer)
+        self.widget.scheduler.stop()  # Animasi dikendalikan dari sini, bukan dari scheduler
+        self.widget.initializeGL()
+        self.widget.textures.wait()  # Semua frame harus memakai tekstur asli
+        self.widget.resizeGL(width, height)
+
+    def render(self, scene, rotation=(0.0, 0.0, 0.0)):
+        """Render one frame of `scene` and return it as an RGBA array"""
+        self._pose(scene, rotation)
+        return self.paint()
+
+    def render_at(self, scene, time, values=None):
+        """Render `scene` at `time` seconds of the widget's timeline"""
+        self._pose_at(scene, time, values)
+        return self.paint()
+
+    def frame(self, scene, index, frames, axis='y', fps=None):
+        """Frame `index` of a turntable of `frames` frames, or of the timeline at `fps`"""
+        if fps:
+            return self.render_at(scene, index / fps)
+        return self.render(scene, turntable_rotation(index, frames, axis))
+
+    def _pose(self, scene, rotation):
+        widget = self.widget
+        if widget.current_scene != scene:
+            widget.set_scene(scene)
+        widget.rotation_x, widget.rotation_y, widget.rotation_z = rotation
+
+    def _pose_at(self, scene, time, values=None):
+        widget = self.widget
+        if widget.current_scene != scene:
+            widget.set_scene(scene)
+            widget.reset_transformations()
+        widget.set_animation_time(time, values)
+
+    def paint(self):
+        from OpenGL import GL
+        self.widget.paintGL()
+        GL.glFinish()
+        return self.framebuffer.read_rgba()
+
+    def _stream(self, poses):
+        """Paint every (index, pose) and yield (index, rgba), through the PBOs if available"""
+        if self.reader is None:
+            for index, pose in poses:
+                pose()
+                yield index, self.paint()
+            return
+        for index, pose in poses:
+            pose()
+            self.widget.paintGL()
+            yield from self.reader.read(index)
+        yield from self.reader.flush()
+
+    def turntable(self, scene, frames, axis='y'):
+        """Yield (index, rgba) for a full revolution of `scene` around `axis`"""
+        return self._stream((i, functools.partial(self._pose, scene, turntable_rotation(i, frames, axis)))
+                            for i in range(frames))
+
+    def animation(self, scene, frames, fps=30.0, start=0.0):
+        """Yield (index, rgba) of `scene` playing the widget's timeline at `fps`.
+
+        Frame i shows time start + i / fps, exactly what the interactive
+        viewer shows at that animation time.
+        """
+        import numpy as np
+        widget = self.widget
+        if widget.current_scene != scene:
+            widget.set_scene(scene)
+        widget.reset_transformations()
+        times = start + np.arange(frames) / fps
+        # Semua frame dievaluasi sekaligus, lalu dipakai baris per baris
+        table = widget.timeline.evaluate_many(times)
+        return self._stream((i, functools.partial(self._pose_at, scene, float(time),
+                                                  {field: values[i] for field, values in table.items()}))
+                            for i, time in enumerate(times))
+
+    def close(self):
+        if self.reader is not None:
+            self.reader.delete()
+        self.framebuffer.delete()
+        self.context.release()
+
+
+class PngSequenceWriter(object):
+    ordered = False  # Frame boleh ditulis dalam urutan apa pun
+
+    def __init__(self, out_dir, scene, resume=False, frame_size=None, fps=None):
+        os.makedirs(out_dir, exist_ok=True)
+        self.pattern = os.path.join(out_dir, scene + "_{:05d}.png")
+
+    def write(self, index, rgba):
+        from PIL import Image
+        path = self.pattern.format(index)
+        # Tulis ke file sementara dulu: file .png yang ada selalu lengkap (untuk --resume)
+        Image.fromarray(rgba, 'RGBA').save(path + '.tmp', 'PNG', compress_level=1)
+        os.replace(path + '.tmp', path)
+
+    def completed(self, frames):
+        """Indices of the frames that are already on disk"""
+        return {i for i in range(frames) if os.path.exists(self.pattern.format(i))}
+
+    def close(self):
+        pass
+
+
+class RawWriter(object):
+    """Concatenated top-down RGBA frames, to a file or '-' for stdout.
+
+    With `resume` an existing file is cut back to its last whole frame and
+    appended to; `frame_size` (width, height) is needed for that.
+    """
+
+    ordered = True
+
+    def __init__(self, out, scene, resume=False, frame_size=None, fps=None):
+        self.done = 0
+        if out == '-':
+            self.stream = sys.stdout.buffer
+            self.owned = False
+            return
+        os.makedirs(out, exist_ok=True)
+        path = os.path.join(out, scene + ".rgba")
+        if resume and os.path.exists(path):
+            frame_bytes = frame_size[0] * frame_size[1] * 4
+            self.done = os.path.getsize(path) // frame_bytes
+            self.stream = open(path, 'r+b')
+            self.stream.truncate(self.done * frame_bytes)
+            self.stream.seek(0, os.SEEK_END)
+        else:
+            self.stream = open(path, 'wb')
+        self.owned = True
+
+    def write(self, index, rgba):
+        self.stream.write(rgba.tobytes())
+
+    def completed(self, frames):
+        return set(range(min(self.done, frames)))
+
+    def close(self):
+        if self.owned:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+class VideoWriter(object):
+    """<out>/<scene>.<extension> through video.open_encoder (ffmpeg, else APNG)"""
+
+    ordered = True
+
+    def __init__(self, out, scene, resume=False, frame_size=None, fps=None, extension='.mp4'):
+        import video
+        os.makedirs(out, exist_ok=True)
+        width, height = frame_size
+        self.encoder = video.open_encoder(os.path.join(out, scene + extension), width, height,
+                                          fps or DEFAULT_VIDEO_FPS)
+
+    def write(self, index, rgba):
+        self.encoder.write(rgba)
+
+    def completed(self, frames):
+        return set()  # Video tidak bisa dilanjutkan, selalu dibuat ulang
+
+    def close(self):
+        self.encoder.close()
+
+
+# Turntable tidak punya waktu animasi; video-nya diputar dengan laju ini
+DEFAULT_VIDEO_FPS = 30.0
+
+WRITERS = {'png': PngSequenceWriter, 'rgba': RawWriter,
+           'mp4': functools.partial(VideoWriter, extension='.mp4'),
+           'apng': functools.partial(VideoWriter, extension='.png'),
+           'gif': functools.partial(VideoWriter, extension='.gif')}
+
+
+def parse_size(text):
+    try:
+        width, height = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Size must look like 512x512, got '{text}'")
+    return width, height
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render langit scenes without a window")
+    parser.add_argument('scenes', nargs='+', help="scene names, or 'all'")
+    parser.add_argument('--frames', type=int, default=360, help="frames per scene (one full turn)")
+    parser.add_argument('--size', type=parse_size, default=(512, 512), help="WIDTHxHEIGHT")
+    parser.add_argument('--axis', choices='xyz', default='y', help="turntable axis")
+    parser.add_argument('--fps', type=float,
+                        help="play the viewer's animation timeline at this rate instead of a turntable")
+    parser.add_argument('--format', choices=sorted(WRITERS), default='png',
+                        help="PNG sequence, raw RGBA, or one video per scene (mp4 needs ffmpeg)")
+    parser.add_argument('--out', default='frames', help="output directory, or '-' for raw stdout")
+    parser.add_argument('--backend', choices=BACKENDS, default='auto')
+    parser.add_argument('--readback', choices=['pbo', 'sync'], default='pbo',
+                        help="read frames asynchronously through pixel buffer objects, or with glReadPixels")
+    parser.add_argument('--renderer', choices=['legacy', 'core'],
+                        default=os.environ.get('LANGIT_RENDERER', 'legacy'),
+                        help="fixed-function (legacy) or core-profile shader renderer")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="record per-frame timings and write them as JSON or CSV")
+    args = parser.parse_args(argv)
+
+    if args.out == '-' and args.format != 'rgba':
+        parser.error("--out - is only supported with --format rgba")
+
+    width, height = args.size
+    renderer = HeadlessRenderer(width, height, args.backend, args.renderer, args.readback)
+    import langit
+    scenes = langit.SCENES if args.scenes == ['all'] else args.scenes
+    for scene in scenes:
+        if scene not in langit.SCENES:
+            parser.error(f"Unknown scene '{scene}' (choose from {', '.join(langit.SCENES)})")
+    if args.profile:
+        renderer.widget.profile_dump = args.profile
+        renderer.widget.set_profiling(True, hud=False)
+
+    try:
+        for scene in scenes:
+            writer = WRITERS[args.format](args.out, scene, frame_size=args.size, fps=args.fps)
+            render_time = 0.0
+            start = time.perf_counter()
+            if args.fps:
+                frames = renderer.animation(scene, args.frames, args.fps)
+            else:
+                frames = renderer.turntable(scene, args.frames, args.axis)
+            while True:
+                t0 = time.perf_counter()
+                item = next(frames, None)
+                render_time += time.perf_counter() - t0
+                if item is None:
+                    break
+                writer.write(*item)
+            writer.close()
+            elapsed = time.perf_counter() - start
+            print(f"{scene}: {args.frames} frames {width}x{height} in {elapsed:.2f} s "
+                  f"({args.frames / elapsed:.1f} frames/s, render only "
+                  f"{args.frames / max(render_time, 1e-9):.1f} frames/s, backend {renderer.backend}, "
+                  f"renderer {renderer.renderer})",
+                  file=sys.stderr)
+        if args.profile:
+            print(renderer.widget.set_profiling(False).report(), file=sys.stderr)
+    finally:
+        renderer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+"""Scene graph: several objects per frame with hierarchical transforms.
+
+A SceneGraph is a tree of SceneNode. Every node has a local 4x4 matrix
+(row-major, see transforms.py) and optionally a drawable plus the
+RenderState it needs. World matrices are cached per node; changing a local
+matrix marks only that subtree dirty, and `SceneGraph.update` skips subtrees
+that are clean.
+
+Drawing goes through a small backend interface implemented by both
+renderers (SceneGLWidget and core_renderer.CoreRenderer):
+
+    apply_state(state, previous)    # previous is None for the first node
+    load_model_view(matrix, node)   # row-major view @ world
+    draw_mesh(mesh, color)          # a mesh from widget.meshes
+    draw_glow(points, layers)       # wide line loops around a 2D outline
+    draw_instanced(mesh, instances, color, state)  # instancing.InstanceSet copies
+    draw_instance_points(instances, color, radius, pixel_scale, max_radius, ranges, sprite)
+    finish_states(previous)         # back to the default state
+
+The draw list is sorted by state (opaque before blended, then lighting,
+texture and material), so consecutive nodes with equal state cost no GL
+state changes. Sorting is stable: nodes with equal state keep the order in
+which they were added, which matters for overlapping 2D shapes.
+
+Drawables report a local bounding box through `local_bounds(meshes)`
+(mesh boxes come from the widget's MeshCache); nodes keep world boxes for
+themselves and their subtree, so `render` culls whole subtrees against the
+view frustum (see culling.py) while `widget.culling` is on.
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from culling import INSIDE, OUTSIDE, BoundingBox, Frustum, InstanceGrid
+from instancing import InstanceSet, pixel_radii
+from lod import LOD_TABLES, LodSelector, projected_radius
+from transforms import identity, rotation
+
+
+RenderState = namedtuple('RenderState', ['blend', 'lit', 'texture', 'specular', 'shininess'])
+
+# 2D tanpa lighting; objek 3D memakai lighting dengan material tanpa specular
+UNLIT = RenderState(False, False, None, 0.0, 0.0)
+LIT = RenderState(False, True, None, 0.0, 0.0)
+BLENDED = RenderState(True, False, None, 0.0, 0.0)
+
+
+def lit_state(texture=None, specular=0.0, shininess=0.0, blend=False):
+    return RenderState(blend, True, texture, specular, shininess)
+
+
+def unlit_state(texture=None, blend=False):
+    return RenderState(blend, False, texture, 0.0, 0.0)
+
+
+def state_sort_key(state):
+    texture = state.texture
+    return (state.blend, state.lit, texture.path if texture is not None else '',
+            state.specular, state.shininess)
+
+
+class MeshDrawable(object):
+    """A mesh from the widget's MeshCache, built on first use"""
+
+    def __init__(self, key, build):
+        self.key = key
+        self.build = build
+
+    def local_bounds(self, meshes):
+        # Dari mesh di cache (dibuat sekarang kalau belum ada), tanpa membangun geometri lagi
+        return meshes.get(self.key, self.build).bounds
+
+    def draw(self, backend, node, model_view, widget):
+        backend.draw_mesh(widget.meshes.get(self.key, self.build), node.color)
+
+
+class LodMeshDrawable(object):
+    """A mesh whose tessellation follows the node's size on screen.
+
+    `build(level)` makes the MeshData for a level of LOD_TABLES[kind]; the
+    mesh is cached under key + level. Each node keeps its own LodSelector
+    so hysteresis works per object.
+    """
+
+    def __init__(self, kind, radius, key, build):
+        self.kind = kind
+        self.radius = radius
+        self.key = key
+        self.build = build
+        self._bounds = None
+
+    def local_bounds(self, meshes):
+        # Level paling halus: tessellation kasar bisa sedikit di dalam bentuk aslinya
+        if self._bounds is None:
+            self._bounds = BoundingBox.of_points(self.build(LOD_TABLES[self.kind][-1][1]).positions)
+        return self._bounds
+
+    def level(self, node, model_view, widget):
+        selector = node.lod_selector
+        if selector is None:
+            selector = node.lod_selector = LodSelector(LOD_TABLES[self.kind])
+        # Skala terbesar dari kolom matriks, jarak dari posisi di ruang mata
+        scale = float(np.linalg.norm(model_view[:3, :3], axis=0).max())
+        distance = float(np.linalg.norm(model_view[:3, 3]))
+        return selector.select(projected_radius(self.radius * scale, distance,
+                                                widget.fovy, widget.viewport_height))
+
+    def draw(self, backend, node, model_view, widget):
+        level = self.level(node, model_view, widget)
+        # Level tuple (stacks, slices) ikut kunci apa adanya, sama seperti MeshCache.sphere
+        level_key = level if isinstance(level, tuple) else (level,)
+        mesh = widget.meshes.get(self.key + level_key, lambda: self.build(level))
+        backend.draw_mesh(mesh, node.color)
+
+
+class InstancedDrawable(object):
+    """Many copies of one mesh (instancing.InstanceSet) in a single draw call.
+
+    With `point_color`, instances whose screen radius is below
+    `point_radius` pixels are drawn as points of that color instead, shaded
+    by the `point_sprite` texture if given; only the larger ones are drawn
+    as meshes. With culling on, the instances are
+    sorted into an InstanceGrid once and only cells inside the frustum are
+    drawn. Both selections are redone only when the view changes. `radius`
+    is the bounding radius of the mesh.
+
+    The instances are reordered by the grid; after `instances.update`, call
+    `node.mark_dirty()` so the node's bounds follow.
+    """
+
+    def __init__(self, key, build, instances, radius=1.0, point_color=None, point_radius=4.0,
+                 point_sprite=None):
+        self.key = key
+        self.build = build
+        self.instances = instances
+        self.radius = radius
+        self.point_color = point_color
+        self.point_radius = point_radius
+        self.point_sprite = point_sprite
+        self.subset = InstanceSet(np.zeros((0, 3)))  # Instance yang digambar sebagai mesh
+        self.ranges = None  # (firsts, counts) sel yang terlihat, untuk titik
+        self.visible = len(instances)
+        self._grid = None
+        self._grid_revision = None
+        self._select_key = None
+
+    def local_bounds(self, meshes):
+        instances = self.instances
+        if not len(instances):
+            return None
+        reach = (instances.scales * self.radius)[:, None]
+        return BoundingBox(np.min(instances.positions - reach, axis=0),
+                           np.max(instances.positions + reach, axis=0))
+
+    def grid(self):
+        instances = self.instances
+        if self._grid is None or self._grid_revision != instances.revision:
+            grid = InstanceGrid(instances.positions, instances.scales * self.radius)
+            # Set yang sudah terurut (mis. dipakai ulang graph baru) tidak perlu di-upload lagi
+            if (grid.order != np.arange(len(grid.order))).any():
+                instances.replace(instances.data[grid.order])
+            self._grid = grid
+            self._grid_revision = instances.revision
+        return self._grid
+
+    def _select(self, model_view, widget, radius, pixel_scale):
+        """Recompute the visible cell ranges and the instances drawn as meshes"""
+        instances = self.instances
+        if widget.culling:
+            grid = self.grid()  # Bisa mengurutkan ulang instances: ambil data sesudahnya
+            frustum = Frustum(widget.matrices.projection @ model_view)
+            firsts, counts = self.ranges = grid.visible_ranges(frustum)
+            rows = np.concatenate([np.arange(f, f + c) for f, c in zip(firsts, counts)]) \
+                if len(firsts) else np.zeros(0, dtype=np.int64)
+            data = instances.data[rows]
+            self.visible = len(rows)
+            if self.point_color is None:
+                # Tanpa titik: uji tiap instance juga, bukan hanya selnya
+                data = data[frustum.spheres_visible(data[:, 0:3], data[:, 3] * self.radius)]
+                self.visible = len(data)
+        else:
+            data = instances.data
+            self.ranges = None
+            self.visible = len(instances)
+        if self.point_color is not None:
+            pixels = pixel_radii(data, model_view, radius, pixel_scale)
+            # Sedikit tumpang tindih dengan batas di shader: tidak ada instance yang hilang
+            data = data[pixels >= self.point_radius * 0.99]
+        self.subset.replace(data)
+
+    def draw(self, backend, node, model_view, widget):
+        instances = self.instances
+        if not len(instances):
+            return
+        if self.point_color is None and not widget.culling:
+            self.visible = len(instances)
+            backend.draw_instanced(widget.meshes.get(self.key, self.build), instances,
+                                   node.color, node.state)
+            return
+
+        radius = self.radius * float(np.linalg.norm(model_view[:3, :3], axis=0).max())
+        pixel_scale = widget.viewport_height / 2.0 / math.tan(math.radians(widget.fovy) / 2.0)
+        key = (model_view.tobytes(), widget.matrices.projection.tobytes(), pixel_scale,
+               self.point_radius, widget.culling, instances.revision)
+        if key != self._select_key:
+            self._select(model_view, widget, radius, pixel_scale)
+            # grid() bisa menaikkan revision (urutan baru); simpan kunci sesudahnya
+            self._select_key = key[:-1] + (instances.revision,)
+        if self.point_color is not None and self.visible:
+            color = tuple(c * p for c, p in zip(node.color, self.point_color))
+            backend.draw_instance_points(instances, color, radius, pixel_scale, self.point_radius,
+                                         self.ranges, self.point_sprite)
+        if len(self.subset):
+            backend.draw_instanced(widget.meshes.get(self.key, self.build), self.subset,
+                                   node.color, node.state)
+
+
+class GlowDrawable(object):
+    """Translucent line loops around a 2D outline, one per (r, g, b, a, offset) layer"""
+
+    def __init__(self, points, layers):
+        self.points = tuple(points)
+        self.layers = tuple(layers)
+        self._bounds = None
+
+    def local_bounds(self, meshes):
+        if self._bounds is None:
+            scale = 1.0 + max(layer[4] for layer in self.layers)
+            # Garis glow beberapa pixel lebarnya: beri sedikit ruang
+            self._bounds = BoundingBox.of_points(np.asarray(self.points) * scale, pad=0.05)
+        return self._bounds
+
+    def draw(self, backend, node, model_view, widget):
+        backend.draw_glow(self.points, self.layers)
+
+
+class SceneNode(object):
+    """Tree node with a local transform, an optional drawable and its state"""
+
+    def __init__(self, name, drawable=None, state=UNLIT, color=(1.0, 1.0, 1.0), local=None):
+        self.name = name
+        self.drawable = drawable
+        self.state = state
+        self.color = color
+        self.local = identity() if local is None else np.asarray(local, dtype=np.float32)
+        self.world = identity()
+        self.world_revision = 0
+        self.visible = True
+        self.parent = None
+        self.children = []
+        self.lod_selector = None
+        # Kotak dunia dari drawable sendiri dan dari seluruh subtree (untuk culling)
+        self.bounds = None
+        self.subtree_bounds = None
+        self._cull_frame = -1
+        # Animasi sederhana: rotasi (derajat per detik) di atas local awal
+        self.spin = None
+        self._base = self.local
+        self._angle = 0.0
+        self._dirty = True
+        self._subtree_dirty = True
+        self._draw_list = None  # Hanya dipakai di root
+
+    def add(self, child):
+        """Attach `child` and return it"""
+        child.parent = self
+        self.children.append(child)
+        child.mark_dirty()
+        self._structure_changed()
+        return child
+
+    def set_local(self, matrix):
+        self.local = self._base = np.asarray(matrix, dtype=np.float32)
+        self.mark_dirty()
+
+    def set_spin(self, degrees_per_second, axis=(0.0, 1.0, 0.0)):
+        self.spin = (degrees_per_second, axis)
+        self._structure_changed()
+
+    def set_visible(self, visible):
+        self.visible = visible
+        self._structure_changed()
+
+    def mark_dirty(self):
+        """World matrix (and bounds) of this subtree must be recomputed"""
+        self._dirty = self._subtree_dirty = True
+        # Leluhur ditandai sampai yang sudah kotor (leluhurnya pasti ikut kotor)
+        node = self.parent
+        while node is not None and not node._subtree_dirty:
+            node._subtree_dirty = True
+            node = node.parent
+
+    def _structure_changed(self):
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        node._draw_list = None
+
+    def _update(self, parent_world, parent_changed, meshes):
+        if not (parent_changed or self._subtree_dirty):
+            return 0
+        changed = parent_changed or self._dirty
+        updates = 0
+        if changed:
+            self.world = self.local if parent_world is None else parent_world @ self.local
+            self.world_revision += 1
+            updates = 1
+            if self.drawable is not None:
+                local = self.drawable.local_bounds(meshes)
+                self.bounds = local.transformed(self.world) if local is not None else None
+        self._dirty = self._subtree_dirty = False
+        for child in self.children:
+            updates += child._update(self.world, changed, meshes)
+        self.subtree_bounds = BoundingBox.union(
+            [self.bounds] + [child.subtree_bounds for child in self.children])
+        return updates
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class SceneGraph(object):
+    """A root node plus the cached, state-sorted draw list"""
+
+    def __init__(self, name):
+        self.name = name
+        self.root = SceneNode(name)
+        self.stats = {'nodes': 0, 'drawn': 0, 'state_changes': 0, 'world_updates': 0,
+                      'culled': 0, 'cull_tests': 0, 'instances': 0, 'instances_culled': 0}
+        self._cull_frame = 0
+        self.time = 0.0  # Waktu animasi node yang berputar sendiri
+
+    def add(self, node, parent=None):
+        return (parent or self.root).add(node)
+
+    def find(self, name):
+        return next((node for node in self.root.walk() if node.name == name), None)
+
+    @property
+    def animated(self):
+        return any(node.spin is not None for node in self.root.walk())
+
+    def advance(self, dt):
+        """Advance spinning nodes by `dt` seconds"""
+        self.set_time(self.time + dt)
+
+    def set_time(self, time):
+        """Pose spinning nodes at `time` seconds (angle = speed * time, not accumulated)"""
+        self.time = time
+        for node in self.root.walk():
+            if node.spin is not None:
+                speed, axis = node.spin
+                node._angle = (speed * time) % 360.0
+                node.local = node._base @ rotation(node._angle, *axis)
+                node.mark_dirty()
+
+    def update(self, meshes):
+        """Recompute dirty world matrices and bounds; returns how many were rebuilt.
+
+        `meshes` is the widget's MeshCache, which holds the mesh drawables' boxes.
+        """
+        updates = self.root._update(None, False, meshes)
+        self.stats['world_updates'] = updates
+        return updates
+
+    def draw_list(self):
+        """Visible drawable nodes sorted by state, rebuilt after structural changes"""
+        draw_list = self.root._draw_list
+        if draw_list is None:
+            nodes = []
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                if not node.visible:
+                    continue
+                if node.drawable is not None:
+                    nodes.append(node)
+                stack.extend(reversed(node.children))
+            draw_list = self.root._draw_list = sorted(nodes, key=lambda n: state_sort_key(n.state))
+            self.stats['nodes'] = sum(1 for _ in self.root.walk())
+        return draw_list
+
+    def cull(self, frustum):
+        """Stamp the nodes whose own box touches `frustum`; returns the frame stamp.
+
+        A subtree box outside the frustum skips the whole subtree; otherwise
+        the children are visited and the node's own box decides whether its
+        drawable is stamped.
+        """
+        frame = self._cull_frame = self._cull_frame + 1
+        tests = 0
+        stack = [(self.root, False)]
+        while stack:
+            node, inside = stack.pop()
+            if not node.visible:
+                continue
+            if not inside and node.subtree_bounds is not None:
+                tests += 1
+                result = frustum.test_box(node.subtree_bounds)
+                if result == OUTSIDE:
+                    continue
+                # Subtree seluruhnya di dalam: anak-anaknya tidak perlu diuji lagi
+                inside = result == INSIDE
+            stack.extend((child, inside) for child in node.children)
+            # Tanpa anak, kotak sendiri sama dengan kotak subtree yang sudah diuji
+            if not inside and node.children and node.bounds is not None:
+                tests += 1
+                if frustum.test_box(node.bounds) == OUTSIDE:
+                    continue
+            node._cull_frame = frame
+        self.stats['cull_tests'] = tests
+        return frame
+
+    def render(self, backend, view, widget):
+        """Draw every visible node through `backend`; `view` is the row-major camera/model matrix"""
+        self.update(widget.meshes)
+        frame = None
+        if widget.culling:
+            frame = self.cull(Frustum(widget.matrices.projection @ view))
+        else:
+            self.stats['cull_tests'] = 0
+        previous = None
+        drawn = state_changes = culled = 0
+        instances = instances_culled = 0
+        for node in self.draw_list():
+            state = node.state
+            texture = state.texture
+            if texture is not None and texture.failed:
+                continue
+            if frame is not None and node._cull_frame != frame:
+                culled += 1
+                continue
+            if state != previous:
+                backend.apply_state(state, previous)
+                previous = state
+                state_changes += 1
+            model_view = view @ node.world
+            backend.load_model_view(model_view, node)
+            node.drawable.draw(backend, node, model_view, widget)
+            drawn += 1
+            if isinstance(node.drawable, InstancedDrawable):
+                instances += len(node.drawable.instances)
+                instances_culled += len(node.drawable.instances) - node.drawable.visible
+        if previous is not None:
+            backend.finish_states(previous)
+        self.stats.update(drawn=drawn, state_changes=state_changes, culled=culled,
+                          instances=instances, instances_culled=instances_culled)
+        widget.profiler.count_culling(culled, instances_culled)
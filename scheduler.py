@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Frame scheduling for SceneGLWidget.
+
+Repaints are requested only when something changed (Qt's update() already
+coalesces those) or while an animation runs. Animation is advanced by
+elapsed wall time, so a dropped frame does not slow the spin down, and it
+pauses while the widget is hidden, minimized, fully obscured or (optionally)
+while the application is not active.
+
+When the widget offers a `frameSwapped` signal (QOpenGLWidget) the next
+animation frame is requested right after each swap, which paces it to
+vsync; otherwise a precise QTimer is used, and only while animating.
+"""
+
+from PyQt5 import QtCore, QtWidgets
+from PyQt5.QtCore import Qt
+
+# Langkah waktu maksimum per frame, supaya setelah jeda animasi tidak melompat
+MAX_STEP = 0.1
+
+
+class FrameScheduler(QtCore.QObject):
+    def __init__(self, widget, interval_ms=16, pause_when_inactive=True):
+        super(FrameScheduler, self).__init__(widget)
+        self.widget = widget
+        self.pause_when_inactive = pause_when_inactive
+        self.animating = False
+        self.paused = False
+        self.enabled = True
+        self.last_time = None
+        self.clock = QtCore.QElapsedTimer()
+        self.clock.start()
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._tick)
+
+        self.vsync = hasattr(widget, 'frameSwapped')
+        if self.vsync:
+            widget.frameSwapped.connect(self._tick)
+
+        self._watched_window = None
+        widget.installEventFilter(self)
+        app = QtWidgets.QApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(self._update_paused)
+
+    def set_animating(self, animating):
+        """Start or stop the continuous animation"""
+        if animating == self.animating:
+            return
+        self.animating = animating
+        self._restart()
+
+    def stop(self):
+        """Disable scheduling entirely (the owner drives frames itself)"""
+        self.enabled = False
+        self.timer.stop()
+
+    def _should_pause(self):
+        widget = self.widget
+        if not widget.isVisible() or widget.window().isMinimized():
+            return True
+        if widget.visibleRegion().isEmpty():
+            return True  # Tertutup jendela lain
+        if self.pause_when_inactive:
+            app = QtWidgets.QApplication.instance()
+            if app is not None and app.applicationState() != Qt.ApplicationActive:
+                return True
+        return False
+
+    def _update_paused(self, *args):
+        paused = self._should_pause()
+        if paused != self.paused:
+            self.paused = paused
+            self._restart()
+
+    def _restart(self):
+        self.timer.stop()
+        if not (self.enabled and self.animating and not self.paused):
+            return
+        self.last_time = self.clock.elapsed() / 1000.0
+        if self.vsync:
+            self.widget.update()
+        else:
+            self.timer.start()
+
+    def _tick(self):
+        if not (self.enabled and self.animating and not self.paused):
+            self.timer.stop()
+            return
+        now = self.clock.elapsed() / 1000.0
+        dt = min(now - self.last_time, MAX_STEP)
+        self.last_time = now
+        self.widget.advance_animation(dt)
+        self.widget.update()
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if obj is self.widget and kind == QtCore.QEvent.Show:
+            # Pantau juga jendela induk untuk minimize / restore
+            window = self.widget.window()
+            if window is not self._watched_window and window is not self.widget:
+                if self._watched_window is not None:
+                    self._watched_window.removeEventFilter(self)
+                window.installEventFilter(self)
+                self._watched_window = window
+        if kind in (QtCore.QEvent.Show, QtCore.QEvent.Hide, QtCore.QEvent.WindowStateChange,
+                    QtCore.QEvent.Expose, QtCore.QEvent.WindowActivate,
+                    QtCore.QEvent.WindowDeactivate):
+            QtCore.QTimer.singleShot(0, self._update_paused)
+        return False
@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+"""GLSL 3.30 core shader library and uniform buffers for the core renderer.
+
+Programs:
+
+* unlit -- vertex color times u_color, optionally textured (the 2D scenes)
+* lit   -- textured Blinn-Phong evaluated per vertex with the exact
+           fixed-function formula (GL_LIGHT0 + GL_COLOR_MATERIAL), so the
+           3D scenes look the same as with the legacy renderer
+* glow  -- screen-space thick lines (core profile has no wide lines)
+* instanced -- lit or unlit copies of one mesh placed by per-instance
+           attributes (instancing.INSTANCE_ATTRIBUTES)
+* instance_points -- the same instances as star-shaped point sprites sized
+           by their screen radius; instances of at least u_max_radius
+           pixels are dropped (drawn as meshes instead)
+
+All programs share two std140 uniform blocks: Transforms (binding 0) and
+Light (binding 1), filled through UniformBuffer. Attribute locations follow
+mesh.ATTRIBUTE_LOCATIONS.
+
+COMPAT_SOURCES holds GLSL 1.20 programs for the fixed-function renderer;
+they read the built-in matrix, light and material state instead.
+"""
+
+import numpy as np
+from OpenGL import GL
+
+TRANSFORMS_BINDING = 0
+LIGHT_BINDING = 1
+
+_TRANSFORMS_BLOCK = """
+layout(std140) uniform Transforms {
+    mat4 model_view;
+    mat4 projection;
+    mat4 normal_matrix;  // mat3 invers-transpos, disimpan sebagai mat4 (std140)
+    vec4 viewport;       // lebar, tinggi (pixel)
+};
+"""
+
+_LIGHT_BLOCK = """
+layout(std140) uniform Light {
+    vec4 light_position;  // ruang mata
+    vec4 light_ambient;
+    vec4 light_diffuse;
+    vec4 light_specular;
+    vec4 scene_ambient;   // GL_LIGHT_MODEL_AMBIENT
+};
+"""
+
+_HEADER = "#version 330 core\n"
+
+UNLIT_VERTEX = _HEADER + _TRANSFORMS_BLOCK + """
+layout(location = 0) in vec3 a_position;
+layout(location = 2) in vec2 a_uv;
+layout(location = 3) in vec3 a_color;
+uniform vec4 u_color;
+out vec4 v_color;
+out vec2 v_uv;
+
+void main() {
+    v_color = vec4(a_color, 1.0) * u_color;
+    v_uv = a_uv;
+    gl_Position = projection * model_view * vec4(a_position, 1.0);
+}
+"""
+
+COLOR_FRAGMENT = _HEADER + """
+in vec4 v_color;
+out vec4 frag_color;
+
+void main() {
+    frag_color = v_color;
+}
+"""
+
+_SHADE = """
+uniform vec3 u_specular;
+uniform float u_shininess;
+
+vec3 shade(vec3 eye, vec3 n, vec3 material) {
+    vec3 l = normalize(light_position.xyz - eye);
+    float diffuse = max(dot(n, l), 0.0);
+    vec3 color = (scene_ambient.rgb + light_ambient.rgb) * material
+               + diffuse * light_diffuse.rgb * material;
+    if (diffuse > 0.0) {
+        // Viewer di tak hingga (GL_LIGHT_MODEL_LOCAL_VIEWER = false)
+        vec3 h = normalize(l + vec3(0.0, 0.0, 1.0));
+        color += pow(max(dot(n, h), 1e-6), u_shininess) * light_specular.rgb * u_specular;
+    }
+    return min(color, vec3(1.0));
+}
+"""
+
+LIT_VERTEX = _HEADER + _TRANSFORMS_BLOCK + _LIGHT_BLOCK + _SHADE + """
+layout(location = 0) in vec3 a_position;
+layout(location = 1) in vec3 a_normal;
+layout(location = 2) in vec2 a_uv;
+layout(location = 3) in vec3 a_color;
+uniform vec4 u_color;
+out vec4 v_color;
+out vec2 v_uv;
+
+void main() {
+    vec4 eye = model_view * vec4(a_position, 1.0);
+    // Tanpa normalize: pipeline lama tidak mengaktifkan GL_NORMALIZE
+    vec3 n = mat3(normal_matrix) * a_normal;
+    // GL_COLOR_MATERIAL: ambient dan diffuse material mengikuti warna vertex
+    v_color = vec4(shade(eye.xyz, n, a_color * u_color.rgb), u_color.a);
+    v_uv = a_uv;
+    gl_Position = projection * eye;
+}
+"""
+
+# Dipakai unlit dan lit: warna vertex kali tekstur (seperti GL_MODULATE)
+TEXTURE_FRAGMENT = _HEADER + """
+in vec4 v_color;
+in vec2 v_uv;
+uniform sampler2D u_texture;
+uniform bool u_use_texture;
+out vec4 frag_color;
+
+void main() {
+    frag_color = u_use_texture ? v_color * texture(u_texture, v_uv) : v_color;
+}
+"""
+
+GLOW_VERTEX = _HEADER + _TRANSFORMS_BLOCK + """
+layout(location = 0) in vec3 a_position;
+layout(location = 1) in vec3 a_other;  // ujung lain dari segmen
+layout(location = 2) in float a_side;  // -1 / +1: sisi kiri / kanan garis
+uniform float u_width;                 // pixel
+uniform float u_scale;
+
+void main() {
+    mat4 mvp = projection * model_view;
+    vec4 a = mvp * vec4(a_position * u_scale, 1.0);
+    vec4 b = mvp * vec4(a_other * u_scale, 1.0);
+    vec2 half_viewport = viewport.xy * 0.5;
+    vec2 dir = normalize(b.xy / b.w * half_viewport - a.xy / a.w * half_viewport);
+    vec2 offset = vec2(-dir.y, dir.x) * a_side * u_width * 0.5;
+    gl_Position = a + vec4(offset / half_viewport * a.w, 0.0, 0.0);
+}
+"""
+
+GLOW_FRAGMENT = _HEADER + """
+uniform vec4 u_color;
+out vec4 frag_color;
+
+void main() {
+    frag_color = u_color;
+}
+"""
+
+_ROTATE = """
+vec3 rotate(vec4 q, vec3 v) {
+    return v + 2.0 * cross(q.xyz, cross(q.xyz, v) + q.w * v);
+}
+"""
+
+INSTANCED_VERTEX = _HEADER + _TRANSFORMS_BLOCK + _LIGHT_BLOCK + _SHADE + _ROTATE + """
+layout(location = 0) in vec3 a_position;
+layout(location = 1) in vec3 a_normal;
+layout(location = 3) in vec3 a_color;
+layout(location = 5) in vec4 i_offset_scale;  // posisi, skala
+layout(location = 6) in vec4 i_rotation;      // quaternion
+layout(location = 7) in vec3 i_color;
+uniform vec4 u_color;
+uniform bool u_lit;
+out vec4 v_color;
+
+void main() {
+    vec3 position = rotate(i_rotation, a_position) * i_offset_scale.w + i_offset_scale.xyz;
+    vec4 eye = model_view * vec4(position, 1.0);
+    vec3 material = a_color * u_color.rgb * i_color;
+    if (u_lit) {
+        // Invers-transpos skala instance = 1 / skala, sama seperti node biasa
+        vec3 n = mat3(normal_matrix) * rotate(i_rotation, a_normal) / i_offset_scale.w;
+        material = shade(eye.xyz, n, material);
+    }
+    v_color = vec4(material, u_color.a);
+    gl_Position = projection * eye;
+}
+"""
+
+_POINT_BODY = """
+uniform vec4 u_color;
+uniform float u_radius;       // radius mesh dikali skala model-view
+uniform float u_pixel_scale;  // tinggi viewport / 2 / tan(fovy / 2)
+uniform float u_max_radius;   // instance sebesar ini (pixel) digambar sebagai mesh
+
+vec4 place_point(vec4 eye, vec4 clip) {
+    float radius = u_radius * i_offset_scale.w * u_pixel_scale / length(eye.xyz);
+    gl_PointSize = max(2.0 * radius, 1.0);
+    v_size = gl_PointSize;
+    // Titik lebih kecil dari satu pixel diredupkan, bukan dibulatkan ke 1 pixel penuh
+    v_color = vec4(u_color.rgb * i_color * clamp(2.0 * radius, 0.3, 1.0), u_color.a);
+    // Instance besar dibuang keluar clip volume
+    return radius < u_max_radius ? clip : vec4(2.0, 2.0, 2.0, 1.0);
+}
+"""
+
+INSTANCE_POINTS_VERTEX = _HEADER + _TRANSFORMS_BLOCK + """
+layout(location = 0) in vec4 i_offset_scale;
+layout(location = 7) in vec3 i_color;
+out vec4 v_color;
+out float v_size;
+""" + _POINT_BODY + """
+void main() {
+    vec4 eye = model_view * vec4(i_offset_scale.xyz, 1.0);
+    gl_Position = place_point(eye, projection * eye);
+}
+"""
+
+_STAR_SPRITE = """
+// Sprite kecil cukup kotak; yang lebih besar dipotong jadi bintang 5 sudut
+// (radius luar 1, dalam 0.4 seperti geometry.star_prism), ujung ke atas
+bool outside_star(vec2 coord, float size) {
+    if (size < 3.0) {
+        return false;
+    }
+    vec2 p = coord * 2.0 - 1.0;
+    float sector = 6.2831853 / 5.0;
+    float angle = abs(fract(atan(p.x, -p.y) / sector + 0.5) - 0.5) * sector;
+    // Jarak tepi lurus antara ujung luar dan sudut dalam, dalam koordinat polar
+    return length(p) > 0.3283299 / cos(angle - 1.2362614);
+}
+
+// Sprite bintang (procedural.star_glow): inti terang, tepi hangat dan redup
+uniform sampler2D u_sprite;
+uniform bool u_use_sprite;
+
+vec4 sprite_glow(vec4 color, vec2 coord, float size) {
+    if (!u_use_sprite || size < 3.0) {
+        return color;
+    }
+    vec4 glow = texture(u_sprite, coord);
+    return vec4(color.rgb * glow.rgb * (0.5 + 0.5 * glow.a), color.a);
+}
+"""
+
+POINT_FRAGMENT = _HEADER + _STAR_SPRITE + """
+in vec4 v_color;
+in float v_size;
+out vec4 frag_color;
+
+void main() {
+    if (outside_star(gl_PointCoord, v_size)) {
+        discard;
+    }
+    frag_color = sprite_glow(v_color, gl_PointCoord, v_size);
+}
+"""
+
+SOURCES = {
+    'unlit': (UNLIT_VERTEX, TEXTURE_FRAGMENT),
+    'lit': (LIT_VERTEX, TEXTURE_FRAGMENT),
+    'glow': (GLOW_VERTEX, GLOW_FRAGMENT),
+    'instanced': (INSTANCED_VERTEX, COLOR_FRAGMENT),
+    'instance_points': (INSTANCE_POINTS_VERTEX, POINT_FRAGMENT),
+}
+
+COMPAT_INSTANCED_VERTEX = "#version 120\n" + _ROTATE + """
+attribute vec4 i_offset_scale;
+attribute vec4 i_rotation;
+attribute vec3 i_color;
+uniform bool u_lit;
+varying vec4 v_color;
+
+void main() {
+    vec3 position = rotate(i_rotation, gl_Vertex.xyz) * i_offset_scale.w + i_offset_scale.xyz;
+    vec4 eye = gl_ModelViewMatrix * vec4(position, 1.0);
+    vec3 color = gl_Color.rgb * i_color;
+    if (u_lit) {
+        // Rumus GL_LIGHT0 + GL_COLOR_MATERIAL, seperti shade() di atas
+        vec3 n = gl_NormalMatrix * rotate(i_rotation, gl_Normal) / i_offset_scale.w;
+        vec3 l = normalize(gl_LightSource[0].position.xyz - eye.xyz);
+        float diffuse = max(dot(n, l), 0.0);
+        vec3 lit = (gl_LightModel.ambient.rgb + gl_LightSource[0].ambient.rgb) * color
+                 + diffuse * gl_LightSource[0].diffuse.rgb * color;
+        if (diffuse > 0.0) {
+            vec3 h = normalize(l + vec3(0.0, 0.0, 1.0));
+            lit += pow(max(dot(n, h), 1e-6), gl_FrontMaterial.shininess)
+                 * gl_LightSource[0].specular.rgb * gl_FrontMaterial.specular.rgb;
+        }
+        color = min(lit, vec3(1.0));
+    }
+    v_color = vec4(color, gl_Color.a);
+    gl_Position = gl_ProjectionMatrix * eye;
+}
+"""
+
+COMPAT_INSTANCE_POINTS_VERTEX = """#version 120
+attribute vec4 i_offset_scale;
+attribute vec3 i_color;
+varying vec4 v_color;
+varying float v_size;
+""" + _POINT_BODY + """
+void main() {
+    vec4 eye = gl_ModelViewMatrix * vec4(i_offset_scale.xyz, 1.0);
+    gl_Position = place_point(eye, gl_ProjectionMatrix * eye);
+}
+"""
+
+COMPAT_COLOR_FRAGMENT = """#version 120
+varying vec4 v_color;
+
+void main() {
+    gl_FragColor = v_color;
+}
+"""
+
+# GLSL 1.20: texture() bernama texture2D()
+COMPAT_POINT_FRAGMENT = "#version 120\n#define texture texture2D\n" + _STAR_SPRITE + """
+varying vec4 v_color;
+varying float v_size;
+
+void main() {
+    if (outside_star(gl_PointCoord, v_size)) {
+        discard;
+    }
+    gl_FragColor = sprite_glow(v_color, gl_PointCoord, v_size);
+}
+"""
+
+# GLSL 1.20 tidak punya layout(location): atribut diikat sebelum link
+COMPAT_SOURCES = {
+    'instanced': (COMPAT_INSTANCED_VERTEX, COMPAT_COLOR_FRAGMENT,
+                  {'i_offset_scale': 5, 'i_rotation': 6, 'i_color': 7}),
+    'instance_points': (COMPAT_INSTANCE_POINTS_VERTEX, COMPAT_POINT_FRAGMENT,
+                        {'i_offset_scale': 0, 'i_color': 7}),
+}
+
+
+def _compile_shader(kind, source, name):
+    shader = GL.glCreateShader(kind)
+    GL.glShaderSource(shader, source)
+    GL.glCompileShader(shader)
+    if not GL.glGetShaderiv(shader, GL.GL_COMPILE_STATUS):
+        log = GL.glGetShaderInfoLog(shader)
+        GL.glDeleteShader(shader)
+        raise RuntimeError(f"Shader '{name}' failed to compile:\n{log.decode(errors='replace')}")
+    return shader
+
+
+class ShaderProgram(object):
+    """Linked program with cached uniform locations and bound uniform blocks"""
+
+    def __init__(self, name, vertex_source, fragment_source, attributes=None):
+        self.name = name
+        shaders = [_compile_shader(GL.GL_VERTEX_SHADER, vertex_source, name),
+                   _compile_shader(GL.GL_FRAGMENT_SHADER, fragment_source, name)]
+        self.program = GL.glCreateProgram()
+        for shader in shaders:
+            GL.glAttachShader(self.program, shader)
+        for attribute, location in (attributes or {}).items():
+            GL.glBindAttribLocation(self.program, location, attribute)
+        GL.glLinkProgram(self.program)
+        for shader in shaders:
+            GL.glDetachShader(self.program, shader)
+            GL.glDeleteShader(shader)
+        if not GL.glGetProgramiv(self.program, GL.GL_LINK_STATUS):
+            log = GL.glGetProgramInfoLog(self.program)
+            raise RuntimeError(f"Program '{name}' failed to link:\n{log.decode(errors='replace')}")
+
+        # Konteks GL 2.1 tidak punya uniform block sama sekali
+        blocks = (('Transforms', TRANSFORMS_BINDING), ('Light', LIGHT_BINDING))
+        for block, binding in blocks if GL.glGetUniformBlockIndex else ():
+            index = GL.glGetUniformBlockIndex(self.program, block)
+            if index != GL.GL_INVALID_INDEX:
+                GL.glUniformBlockBinding(self.program, index, binding)
+        self._locations = {}
+
+    def location(self, uniform):
+        location = self._locations.get(uniform)
+        if location is None:
+            location = self._locations[uniform] = GL.glGetUniformLocation(self.program, uniform)
+        return location
+
+    def set_float(self, uniform, *values):
+        setter = (GL.glUniform1f, GL.glUniform2f, GL.glUniform3f, GL.glUniform4f)[len(values) - 1]
+        setter(self.location(uniform), *values)
+
+    def set_int(self, uniform, value):
+        GL.glUniform1i(self.location(uniform), int(value))
+
+    def delete(self):
+        GL.glDeleteProgram(self.program)
+        self.program = 0
+
+
+class ShaderLibrary(object):
+    """Compiles every program in `sources`; tracks the one in use"""
+
+    def __init__(self, sources=SOURCES):
+        self.programs = {name: ShaderProgram(name, *source) for name, source in sources.items()}
+        self.current = None
+
+    def use(self, name):
+        program = self.programs[name]
+        if program is not self.current:
+            GL.glUseProgram(program.program)
+            self.current = program
+        return program
+
+    def reset(self):
+        """Forget the bound program (after something else, e.g. QPainter, used GL)"""
+        self.current = None
+
+    def delete(self):
+        for program in self.programs.values():
+            program.delete()
+        self.programs = {}
+        self.current = None
+
+
+class UniformBuffer(object):
+    """std140 uniform buffer bound to a fixed binding point"""
+
+    def __init__(self, binding, floats):
+        self.binding = binding
+        self.nbytes = floats * 4
+        self.buffer = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_UNIFORM_BUFFER, self.buffer)
+        GL.glBufferData(GL.GL_UNIFORM_BUFFER, self.nbytes, None, GL.GL_DYNAMIC_DRAW)
+        GL.glBindBuffer(GL.GL_UNIFORM_BUFFER, 0)
+        self.bind()
+
+    def bind(self):
+        GL.glBindBufferBase(GL.GL_UNIFORM_BUFFER, self.binding, self.buffer)
+
+    def update(self, data, offset=0):
+        data = np.ascontiguousarray(data, dtype=np.float32)
+        GL.glBindBuffer(GL.GL_UNIFORM_BUFFER, self.buffer)
+        GL.glBufferSubData(GL.GL_UNIFORM_BUFFER, offset, data.nbytes, data)
+        GL.glBindBuffer(GL.GL_UNIFORM_BUFFER, 0)
+
+    def delete(self):
+        GL.glDeleteBuffers(1, [self.buffer])
+        self.buffer = 0
+
+
+# mat4 model_view, mat4 projection, mat4 normal_matrix, vec4 viewport
+TRANSFORMS_FLOATS = 16 * 3 + 4
+# Lima vec4
+LIGHT_FLOATS = 4 * 5
+
+
+def pack_light(position, ambient, diffuse, specular, scene_ambient):
+    return np.concatenate([np.asarray(v, dtype=np.float32)
+                           for v in (position, ambient, diffuse, specular, scene_ambient)])
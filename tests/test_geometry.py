@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Shapes, normals and index ranges of the geometry.py generators (no GL needed)"""
+
+import os
+import sys
+import unittest
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import geometry  # noqa: E402
+
+
+def generated():
+    """(name, MeshData) for every generator the scenes use"""
+    return [
+        ('uv_sphere', geometry.uv_sphere(0.9, 12, 16)),
+        ('ellipse_fan', geometry.ellipse_fan(0.2, -0.1, 0.8, 0.5, 20, (1.0, 0.5, 0.0))),
+        ('arc_band', geometry.arc_band(0.5, 1.55, np.pi / 8, np.pi - np.pi / 8, 50)),
+        ('cloud', geometry.cloud(24)),
+        ('lightning_bolt', geometry.lightning_bolt()),
+        ('rocket', geometry.rocket((0.3, 0.6, 0.9))),
+        ('star_prism', geometry.star_prism(1.0, 0.4, 0.3)),
+        ('saturn_ring', geometry.saturn_ring(1.1, 1.6, 40, 0.1)),
+        ('crescent_prism', geometry.crescent_prism(0.8, 0.3, 36, 0.45)),
+    ]
+
+
+def triangles(mesh):
+    positions = mesh.positions.astype(np.float64)
+    return positions[mesh.indices.reshape(-1, 3)]
+
+
+class MeshDataTest(unittest.TestCase):
+    def test_arrays(self):
+        for name, mesh in generated():
+            with self.subTest(name):
+                count = len(mesh.positions)
+                self.assertEqual(mesh.positions.shape, (count, 3))
+                self.assertEqual(mesh.positions.dtype, np.float32)
+                self.assertTrue(mesh.positions.flags['C_CONTIGUOUS'])
+                if mesh.normals is not None:
+                    self.assertEqual(mesh.normals.shape, (count, 3))
+                if mesh.uvs is not None:
+                    self.assertEqual(mesh.uvs.shape, (count, 2))
+                if mesh.colors is not None:
+                    self.assertEqual(mesh.colors.shape, (count, 3))
+
+    def test_index_range(self):
+        for name, mesh in generated():
+            with self.subTest(name):
+                self.assertEqual(mesh.indices.dtype, np.uint32)
+                self.assertEqual(mesh.indices.ndim, 1)
+                self.assertEqual(mesh.indices.size % 3, 0)
+                self.assertLess(int(mesh.indices.max()), len(mesh.positions))
+                # Tiap vertex dipakai oleh paling sedikit satu segitiga
+                self.assertEqual(len(np.unique(mesh.indices)), len(mesh.positions))
+
+    def test_unit_normals(self):
+        for name, mesh in generated():
+            with self.subTest(name):
+                lengths = np.linalg.norm(mesh.normals, axis=1)
+                np.testing.assert_allclose(lengths, 1.0, atol=1e-5)
+
+    def test_no_degenerate_triangles(self):
+        for name, mesh in generated():
+            if name == 'uv_sphere':
+                continue  # Baris kutub memang berimpit
+            with self.subTest(name):
+                a, b, c = np.moveaxis(triangles(mesh), 1, 0)
+                area = np.linalg.norm(np.cross(b - a, c - a), axis=1)
+                self.assertGreater(area.min(), 1e-9)
+
+
+class GeneratorTest(unittest.TestCase):
+    def test_uv_sphere(self):
+        stacks, slices, radius = 12, 16, 0.9
+        mesh = geometry.uv_sphere(radius, stacks, slices)
+        self.assertEqual(len(mesh.positions), (stacks + 1) * (slices + 1))
+        self.assertEqual(mesh.indices.size, stacks * slices * 6)
+        np.testing.assert_allclose(mesh.positions, mesh.normals * radius, atol=1e-6)
+        self.assertTrue(((mesh.uvs >= 0.0) & (mesh.uvs <= 1.0)).all())
+
+    def test_flat_shapes_face_the_viewer(self):
+        for mesh in (geometry.ellipse_fan(0.0, 0.0, 1.0, 1.0, 12),
+                     geometry.arc_band(0.5, 1.0, 0.3, 2.8, 10), geometry.cloud(12)):
+            self.assertTrue((mesh.positions[:, 2] == 0.0).all())
+            np.testing.assert_array_equal(mesh.normals, [[0.0, 0.0, 1.0]] * len(mesh.normals))
+
+    def test_arc_band_layout(self):
+        segments = 10
+        mesh = geometry.arc_band(0.5, 1.0, 0.3, 2.8, segments)
+        self.assertEqual(len(mesh.positions), 2 * (segments + 1))
+        self.assertEqual(mesh.indices.size, 6 * segments)
+        radii = np.linalg.norm(mesh.positions[:, :2], axis=1).reshape(-1, 2)
+        np.testing.assert_allclose(radii, [[0.5, 1.0]] * (segments + 1), atol=1e-6)
+        # u radial (0 dalam, 1 luar), v sepanjang busur
+        np.testing.assert_array_equal(mesh.uvs[:, 0].reshape(-1, 2), [[0.0, 1.0]] * (segments + 1))
+        np.testing.assert_allclose(mesh.uvs[::2, 1], np.arange(segments + 1) / segments, atol=1e-6)
+
+    def test_rocket_body_color(self):
+        mesh = geometry.rocket((0.3, 0.6, 0.9))
+        np.testing.assert_allclose(mesh.colors[:4], [[0.3, 0.6, 0.9]] * 4, atol=1e-6)
+
+    def test_crescent_is_closed_and_wound_outwards(self):
+        mesh = geometry.crescent_prism(0.8, 0.3, 36, 0.45)
+        tris = triangles(mesh)
+        # Setiap sisi (menurut posisi) dipakai sekali ke tiap arah: tertutup dan konsisten
+        edges = Counter()
+        for tri in np.round(tris, 5):
+            for i in range(3):
+                edges[(tuple(tri[i]), tuple(tri[(i + 1) % 3]))] += 1
+        for (a, b), count in edges.items():
+            self.assertEqual(edges[(b, a)], count)
+        # Volume bertanda positif: normal segitiga mengarah ke luar
+        a, b, c = np.moveaxis(tris, 1, 0)
+        self.assertGreater(np.einsum('ij,ij->i', a, np.cross(b, c)).sum() / 6.0, 0.0)
+        # Normal vertex searah dengan normal segitiganya
+        face = np.cross(b - a, c - a)
+        vertex = mesh.normals[mesh.indices.reshape(-1, 3)].sum(axis=1)
+        self.assertTrue((np.einsum('ij,ij->i', face, vertex) > 0.0).all())
+
+    def test_weld_splits_only_hard_creases(self):
+        def hinge(degrees):
+            # Dua segitiga berbagi sisi sumbu y; yang kedua ditekuk `degrees` derajat
+            angle = np.radians(degrees)
+            first = geometry.polygon([(0.0, 0.0), (-1.0, 0.0), (0.0, 1.0)][::-1])
+            normal = (np.sin(angle), 0.0, np.cos(angle))
+            positions = np.array([[0.0, 0.0, 0.0], [np.cos(angle), 0.0, -np.sin(angle)],
+                                  [0.0, 1.0, 0.0]], dtype=np.float32)
+            second = geometry.MeshData(positions, np.array([normal] * 3, dtype=np.float32),
+                                       np.zeros((3, 2), dtype=np.float32), None,
+                                       np.arange(3, dtype=np.uint32))
+            return geometry.merge([first, second])
+
+        soft = geometry.weld(hinge(10.0))
+        self.assertEqual(len(soft.positions), 4)
+        self.assertEqual(int(soft.indices.max()), 3)
+        np.testing.assert_allclose(np.linalg.norm(soft.normals, axis=1), 1.0, atol=1e-6)
+        hard = geometry.weld(hinge(90.0))
+        self.assertEqual(len(hard.positions), 6)
+
+    def test_merge_rebases_indices(self):
+        first = geometry.ellipse_fan(0.0, 0.0, 1.0, 1.0, 8)
+        second = geometry.ellipse_fan(1.0, 0.0, 1.0, 1.0, 6)
+        merged = geometry.merge([first, second])
+        self.assertEqual(len(merged.positions), len(first.positions) + len(second.positions))
+        np.testing.assert_array_equal(merged.indices[:first.indices.size], first.indices)
+        np.testing.assert_array_equal(merged.indices[first.indices.size:],
+                                      second.indices + len(first.positions))
+        with self.assertRaises(ValueError):
+            geometry.merge([first, geometry.ellipse_fan(0.0, 0.0, 1.0, 1.0, 8, (1.0, 0.0, 0.0))])
+
+    def test_interleave_layout(self):
+        mesh = geometry.uv_sphere(1.0, 4, 4)
+        vertices, layout = geometry.interleave(mesh)
+        self.assertEqual(layout, {'positions': (3, 0), 'normals': (3, 3), 'uvs': (2, 6)})
+        self.assertEqual(vertices.shape, (len(mesh.positions), 8))
+        np.testing.assert_array_equal(vertices[:, 6:8], mesh.uvs)
+
+
+if __name__ == '__main__':
+    unittest.main()
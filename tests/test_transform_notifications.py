@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""One coalesced notification and one repaint per input event.
+
+Runs headless under QT_QPA_PLATFORM=offscreen:
+
+    python -m pytest -q tests
+
+The offscreen platform usually has no OpenGL context, so paintGL (and
+paint_count) never runs; repaints are then counted as the paint events the
+widget receives, one per paintGL on a real display.
+"""
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5 import QtCore, QtGui, QtTest, QtWidgets  # noqa: E402
+from PyQt5.QtCore import Qt  # noqa: E402
+
+import langit  # noqa: E402
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+class PaintCounter(QtCore.QObject):
+    """Event filter counting the paint events of one widget"""
+
+    def __init__(self, widget):
+        super(PaintCounter, self).__init__(widget)
+        self.widget = widget
+        self.events = 0
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint:
+            self.events += 1
+        return False
+
+    @property
+    def paints(self):
+        if self.widget.paint_count:
+            return self.widget.paint_count
+        return self.events
+
+
+class TransformNotificationTest(unittest.TestCase):
+    renderer = 'legacy'
+
+    def setUp(self):
+        self.previous_renderer = os.environ.get('LANGIT_RENDERER')
+        os.environ['LANGIT_RENDERER'] = self.renderer
+        self.window = QtWidgets.QMainWindow()
+        self.ui = langit.Ui_MainWindow()
+        self.ui.setupUi(self.window)
+        self.widget = self.ui.glWidget
+        self.counter = PaintCounter(self.widget)
+        self.window.show()
+        QtTest.QTest.qWaitForWindowExposed(self.window)
+        self.settle()
+
+    def tearDown(self):
+        self.window.close()
+        self.window.deleteLater()
+        self.settle()
+        if self.previous_renderer is None:
+            os.environ.pop('LANGIT_RENDERER', None)
+        else:
+            os.environ['LANGIT_RENDERER'] = self.previous_renderer
+
+    def settle(self):
+        # Notifikasi dikirim pada putaran event loop berikutnya, repaint sesudahnya
+        for _ in range(10):
+            QtTest.QTest.qWait(10)
+
+    def assertOneEach(self, event):
+        notifications = self.widget.transform.notifications
+        paints = self.counter.paints
+        event()
+        self.settle()
+        self.assertEqual(self.widget.transform.notifications - notifications, 1)
+        self.assertEqual(self.counter.paints - paints, 1)
+
+    def test_key_press(self):
+        def press():
+            QtTest.QTest.keyClick(self.widget, Qt.Key_D)
+        self.assertOneEach(press)
+        self.assertAlmostEqual(self.widget.translation_x, 0.1)
+
+    def test_mouse_drag(self):
+        def drag():
+            QtTest.QTest.mousePress(self.widget, Qt.LeftButton, pos=QtCore.QPoint(100, 100))
+            # QTest.mouseMove tidak membawa tombol yang ditekan
+            move = QtGui.QMouseEvent(QtCore.QEvent.MouseMove, QtCore.QPointF(130, 110),
+                                     Qt.LeftButton, Qt.LeftButton, Qt.NoModifier)
+            QtWidgets.QApplication.sendEvent(self.widget, move)
+            QtTest.QTest.mouseRelease(self.widget, Qt.LeftButton, pos=QtCore.QPoint(130, 110))
+        self.assertOneEach(drag)
+        self.assertNotEqual(self.widget.transform.group('rotation'), (0.0, 0.0, 0.0))
+
+    def test_spin_box_change(self):
+        self.assertOneEach(lambda: self.ui.translasi_x.setValue(0.7))
+        self.assertAlmostEqual(self.widget.translation_x, 0.7)
+
+
+class CoreTransformNotificationTest(TransformNotificationTest):
+    renderer = 'core'
+
+
+if __name__ == '__main__':
+    unittest.main()
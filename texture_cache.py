@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""Persistent on-disk cache of decoded, GPU-ready texture data.
+
+Each source image gets one cache file holding its pixels already flipped
+for OpenGL, in the smallest fitting channel layout (1 for grayscale, 3 for
+RGB, 4 only when there is real alpha), plus a full box-filtered mip chain.
+Block-compressed variants (BC1/BC4, see texture_compress) are stored as
+separate entries next to it.
+Cache files are memory-mapped on load, so the arrays handed to
+glTexImage2D point straight into the page cache without a PIL decode.
+
+An entry records the source's mtime and size; when either changes the
+entry is rebuilt. Generated textures (procedural.py) are stored the same
+way under a key, with the generator version in place of the mtime. No GL
+calls are made here.
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image
+
+from texture_compress import ENCODERS, FORMAT_FOR_CHANNELS
+
+MAGIC = b'LTEX'
+VERSION = 1
+
+# magic, version, channels, level count, pixel format, source mtime_ns, source size, width, height
+_HEADER = struct.Struct('<4sHBBBxqqII')
+# offset, nbytes, width, height
+_LEVEL = struct.Struct('<QQII')
+_ALIGN = 16
+
+FORMAT_RAW = 'raw'
+_FORMAT_CODES = {FORMAT_RAW: 0, 'bc1': 1, 'bc4': 2}
+_FORMAT_NAMES = {code: name for name, code in _FORMAT_CODES.items()}
+
+# format: 'raw' or a compressed format name ('bc1', 'bc4')
+# levels: list of (width, height, uint8 array) from level 0 (full size) down to 1x1;
+# raw levels are (h, w, channels) arrays, compressed ones flat block streams
+TextureData = namedtuple('TextureData', ['width', 'height', 'channels', 'format', 'levels'])
+
+# Pengganti os.stat untuk tekstur buatan: versi generator sebagai "mtime"
+_Stamp = namedtuple('_Stamp', ['st_mtime_ns', 'st_size'])
+
+
+def default_cache_dir():
+    return os.environ.get('LANGIT_TEXTURE_CACHE') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'langit', 'textures')
+
+
+def _image_channels(image):
+    """Pick the PIL mode / channel count that holds the image without loss"""
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+    if image.mode in ('1', 'L', 'I', 'I;16', 'F') or (image.mode == 'LA' and not has_alpha):
+        return 'L', 1
+    if image.mode == 'P' and not has_alpha:
+        return 'RGB', 3
+    if has_alpha:
+        return 'RGBA', 4
+    return 'RGB', 3
+
+
+def decode_pixels(image_path):
+    """Decode an image into a bottom-row-first (h, w, channels) uint8 array"""
+    image = Image.open(image_path)
+    mode, channels = _image_channels(image)
+    image = image.transpose(Image.FLIP_TOP_BOTTOM).convert(mode)
+    pixels = np.asarray(image, dtype=np.uint8)
+    return pixels.reshape(image.height, image.width, channels)
+
+
+def build_mip_chain(pixels):
+    """Box-filtered mip levels from full size down to 1x1 (odd edges are dropped)"""
+    levels = [np.ascontiguousarray(pixels)]
+    image = pixels.astype(np.float32)
+    while image.shape[0] > 1 or image.shape[1] > 1:
+        h, w = image.shape[:2]
+        if h > 1:
+            image = (image[0:h // 2 * 2:2] + image[1:h // 2 * 2:2]) * 0.5
+        if w > 1:
+            image = (image[:, 0:w // 2 * 2:2] + image[:, 1:w // 2 * 2:2]) * 0.5
+        levels.append(np.ascontiguousarray(np.rint(image).astype(np.uint8)))
+    return levels
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class TextureCache(object):
+    """Maps source image paths (and generated texture keys) to memory-mapped TextureData"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or default_cache_dir()
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, source_path, fmt=FORMAT_RAW):
+        return self._entry(os.path.abspath(source_path), fmt)
+
+    def _entry(self, identity, fmt=FORMAT_RAW):
+        key = hashlib.sha1(identity.encode('utf-8')).hexdigest()[:20]
+        if fmt != FORMAT_RAW:
+            key += '-' + fmt
+        return os.path.join(self.directory, key + '.tex')
+
+    def load(self, source_path, compression=()):
+        """Return TextureData for `source_path`, rebuilding entries when stale.
+
+        `compression` lists the block formats the caller can upload; the
+        texture is returned compressed when one of them fits its channels.
+        """
+        identity = os.path.abspath(source_path)
+        stat = os.stat(source_path)
+        raw = self._load_raw(identity, stat, lambda: decode_pixels(source_path))
+        return self._compressed(identity, stat, raw, compression)
+
+    def load_generated(self, key, version, build=None, compression=()):
+        """TextureData for generated pixels, cached under `key` until `version` changes.
+
+        `build()` returns (h, w, channels) uint8 pixels; without it a missing
+        entry returns None.
+        """
+        identity = 'generated:' + key
+        stamp = _Stamp(version, 0)
+        raw = self._load_raw(identity, stamp, build)
+        if raw is None:
+            return None
+        return self._compressed(identity, stamp, raw, compression)
+
+    def _compressed(self, identity, stat, raw, compression):
+        fmt = FORMAT_FOR_CHANNELS.get(raw.channels)
+        if fmt is None or fmt not in compression:
+            return raw
+
+        entry = self._entry(identity, fmt)
+        data = self._read(entry, stat)
+        if data is not None:
+            return data
+        encode = ENCODERS[fmt]
+        levels = [(w, h, encode(level)) for w, h, level in raw.levels]
+        data = TextureData(raw.width, raw.height, raw.channels, fmt, levels)
+        self._try_store(entry, stat, data)
+        return data
+
+    def _load_raw(self, identity, stat, build):
+        entry = self._entry(identity)
+        data = self._read(entry, stat)
+        if data is not None:
+            self.hits += 1
+            return data
+        if build is None:
+            return None
+
+        self.misses += 1
+        pixels = build()
+        levels = [(lvl.shape[1], lvl.shape[0], lvl) for lvl in build_mip_chain(pixels)]
+        data = TextureData(pixels.shape[1], pixels.shape[0], pixels.shape[2], FORMAT_RAW, levels)
+        self._try_store(entry, stat, data)
+        return data
+
+    def _try_store(self, entry, stat, data):
+        try:
+            self.store(entry, stat, data)
+        except OSError as e:
+            # Cache hanya optimasi: kalau gagal menulis, tetap pakai data di memori
+            print(f"Warning: could not write texture cache {entry}: {e}", file=sys.stderr)
+
+    def _read(self, entry, stat):
+        try:
+            mapped = np.memmap(entry, dtype=np.uint8, mode='r')
+        except (OSError, ValueError):
+            return None
+        if mapped.size < _HEADER.size:
+            return None
+        magic, version, channels, count, code, mtime_ns, size, width, height = \
+            _HEADER.unpack_from(mapped, 0)
+        if (magic != MAGIC or version != VERSION or code not in _FORMAT_NAMES or
+                mtime_ns != stat.st_mtime_ns or size != stat.st_size):
+            return None
+        fmt = _FORMAT_NAMES[code]
+
+        levels = []
+        for i in range(count):
+            offset, nbytes, w, h = _LEVEL.unpack_from(mapped, _HEADER.size + i * _LEVEL.size)
+            if offset + nbytes > mapped.size:
+                return None  # File terpotong
+            view = mapped[offset:offset + nbytes]
+            if fmt == FORMAT_RAW:
+                view = view.reshape(h, w, channels)
+            levels.append((w, h, view))
+        return TextureData(width, height, channels, fmt, levels)
+
+    def store(self, entry, stat, data):
+        """Write `data` as the cache entry for a source with the given stat"""
+        os.makedirs(self.directory, exist_ok=True)
+        table_end = _HEADER.size + len(data.levels) * _LEVEL.size
+        offset = _aligned(table_end)
+        table = []
+        for w, h, level in data.levels:
+            table.append((offset, level.nbytes, w, h))
+            offset = _aligned(offset + level.nbytes)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, data.channels, len(data.levels), _FORMAT_CODES[data.format],
+                                     stat.st_mtime_ns, stat.st_size, data.width, data.height))
+                for row in table:
+                    f.write(_LEVEL.pack(*row))
+                for (level_offset, _, _, _), (_, _, level) in zip(table, data.levels):
+                    f.seek(level_offset)
+                    f.write(np.ascontiguousarray(level).tobytes())
+            os.chmod(tmp_path, 0o644)
+            # Ganti atomik supaya pembaca lain tidak melihat file setengah jadi
+            os.replace(tmp_path, entry)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith('.tex'):
+                os.unlink(os.path.join(self.directory, name))
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""CPU-side block compression (S3TC/BC1 and RGTC1/BC4) with NumPy.
+
+These are simple bounding-box encoders: fast enough to run once when a
+texture cache entry is built, with quality comparable to a driver's
+on-the-fly compression. Output is the raw block stream expected by
+glCompressedTexImage2D. No GL calls are made here.
+"""
+
+import numpy as np
+
+# GL enum values, duplicated here so the module stays GL-free
+GL_COMPRESSED_RGB_S3TC_DXT1_EXT = 0x83F0
+GL_COMPRESSED_RED_RGTC1 = 0x8DBB
+
+BLOCK_BYTES = {'bc1': 8, 'bc4': 8}
+
+
+def compressed_size(width, height, fmt):
+    return ((width + 3) // 4) * ((height + 3) // 4) * BLOCK_BYTES[fmt]
+
+
+def _blocks(pixels):
+    """Split (h, w, c) into (bh, bw, 16, c) 4x4 blocks, replicating edges as padding"""
+    h, w, c = pixels.shape
+    ph, pw = (-h) % 4, (-w) % 4
+    if ph or pw:
+        pixels = np.pad(pixels, ((0, ph), (0, pw), (0, 0)), mode='edge')
+    bh, bw = pixels.shape[0] // 4, pixels.shape[1] // 4
+    blocks = pixels.reshape(bh, 4, bw, 4, c).transpose(0, 2, 1, 3, 4)
+    return blocks.reshape(bh, bw, 16, c)
+
+
+def _pack_indices(indices, bits):
+    """Pack per-texel palette indices (..., 16) little-endian into an integer"""
+    shifts = np.arange(16, dtype=np.uint64) * np.uint64(bits)
+    return np.bitwise_or.reduce(indices.astype(np.uint64) << shifts, axis=-1)
+
+
+def encode_bc1(pixels):
+    """Encode (h, w, 3) uint8 RGB into BC1 (DXT1, opaque 4-color mode)"""
+    blocks = _blocks(pixels).astype(np.float32)
+    lo = blocks.min(axis=2)
+    hi = blocks.max(axis=2)
+    # Sedikit menyempitkan bounding box mengurangi error rata-rata
+    inset = (hi - lo) / 16.0
+    lo, hi = lo + inset, hi - inset
+
+    def to_565(color):
+        r = np.clip(np.rint(color[..., 0] * 31 / 255), 0, 31).astype(np.uint16)
+        g = np.clip(np.rint(color[..., 1] * 63 / 255), 0, 63).astype(np.uint16)
+        b = np.clip(np.rint(color[..., 2] * 31 / 255), 0, 31).astype(np.uint16)
+        return (r << 11) | (g << 5) | b
+
+    def from_565(packed):
+        r = (packed >> 11) & 31
+        g = (packed >> 5) & 63
+        b = packed & 31
+        return np.stack([r * 255 / 31, g * 255 / 63, b * 255 / 31], axis=-1).astype(np.float32)
+
+    color0 = to_565(hi)
+    color1 = to_565(lo)
+    p0, p1 = from_565(color0), from_565(color1)
+    palette = np.stack([p0, p1, (2 * p0 + p1) / 3, (p0 + 2 * p1) / 3], axis=2)  # (bh, bw, 4, 3)
+
+    distance = ((blocks[:, :, :, None, :] - palette[:, :, None, :, :]) ** 2).sum(axis=-1)
+    indices = distance.argmin(axis=-1)
+    # color0 == color1 akan memicu mode 3 warna; pakai index 0 saja untuk blok rata
+    indices[color0 == color1] = 0
+
+    out = np.empty(color0.shape, dtype=[('c0', '<u2'), ('c1', '<u2'), ('idx', '<u4')])
+    out['c0'] = color0
+    out['c1'] = color1
+    out['idx'] = _pack_indices(indices, 2).astype(np.uint32)
+    return np.ascontiguousarray(out).view(np.uint8).reshape(-1)
+
+
+def encode_bc4(pixels):
+    """Encode (h, w, 1) uint8 grayscale into BC4 (RGTC1 unsigned, 8-value mode)"""
+    blocks = _blocks(pixels)[..., 0].astype(np.float32)  # (bh, bw, 16)
+    red0 = blocks.max(axis=2)
+    red1 = blocks.min(axis=2)
+    weights = np.array([0, 7, 1, 2, 3, 4, 5, 6], dtype=np.float32) / 7.0
+    # Index 0 -> red0, 1 -> red1, 2..7 -> (6*r0 + r1)/7 ... (r0 + 6*r1)/7
+    palette = np.rint(red0[..., None] * (1 - weights) + red1[..., None] * weights)
+    distance = np.abs(blocks[..., None] - palette[:, :, None, :])
+    indices = distance.argmin(axis=-1)
+    indices[red0 == red1] = 0
+
+    bh, bw = red0.shape
+    out = np.empty((bh, bw, 8), dtype=np.uint8)
+    out[..., 0] = red0.astype(np.uint8)
+    out[..., 1] = red1.astype(np.uint8)
+    packed = _pack_indices(indices, 3)
+    out[..., 2:] = packed.astype('<u8')[..., None].view(np.uint8)[..., :6]
+    return out.reshape(-1)
+
+
+ENCODERS = {'bc1': encode_bc1, 'bc4': encode_bc4}
+GL_FORMATS = {'bc1': GL_COMPRESSED_RGB_S3TC_DXT1_EXT, 'bc4': GL_COMPRESSED_RED_RGTC1}
+# Format yang cocok untuk jumlah kanal sumber
+FORMAT_FOR_CHANNELS = {1: 'bc4', 3: 'bc1'}
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""Texture decoding and asynchronous loading.
+
+Images are read through the on-disk TextureCache (decoding with PIL only
+on a cache miss) on a thread pool, so initializeGL returns immediately;
+the GL upload happens on the GL thread (from paintGL, with the context
+current) as soon as each decode has finished. Until then a scene samples a
+1x1 placeholder texture.
+
+Procedural textures (procedural.py) take the same route: a cache hit is
+read on the thread pool like a file, a miss is generated on a process pool
+first (NumPy generation holds the GIL).
+"""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from OpenGL import GL
+from PyQt5 import QtCore
+from PyQt5.QtCore import pyqtSignal
+
+import procedural
+from texture_cache import FORMAT_RAW, TextureCache, TextureData
+from texture_compress import GL_FORMATS
+
+_capabilities = {}
+
+
+def gl_version():
+    """(major, minor) of the current context"""
+    if 'version' not in _capabilities:
+        text = GL.glGetString(GL.GL_VERSION) or b'1.0'
+        major, minor = text.split()[0].split(b'.')[:2]
+        _capabilities['version'] = (int(major), int(minor))
+    return _capabilities['version']
+
+
+def has_extension(name):
+    """Whether the current context exposes a GL extension"""
+    extensions = _capabilities.get('extensions')
+    if extensions is None:
+        extensions = set()
+        try:
+            count = GL.glGetIntegerv(GL.GL_NUM_EXTENSIONS)
+            for i in range(int(count)):
+                extensions.add(GL.glGetStringi(GL.GL_EXTENSIONS, i).decode())
+        except Exception:
+            # Konteks lama (< 3.0): daftar ekstensi dalam satu string
+            extensions.update((GL.glGetString(GL.GL_EXTENSIONS) or b'').decode().split())
+        _capabilities['extensions'] = extensions
+    return name in extensions
+
+
+def _has_swizzle():
+    return gl_version() >= (3, 3) or has_extension('GL_ARB_texture_swizzle')
+
+
+_GREY_SWIZZLE = (GL.GL_RED, GL.GL_RED, GL.GL_RED, GL.GL_ONE)
+
+
+def _pixel_format(channels):
+    """(internal format, pixel format, swizzle, bytes per texel) for an uncompressed upload"""
+    if channels == 1:
+        # Grayscale (bulan): satu kanal, dibaca sebagai (L, L, L, 1)
+        if _has_swizzle():
+            return GL.GL_R8, GL.GL_RED, _GREY_SWIZZLE, 1
+        return GL.GL_LUMINANCE8, GL.GL_LUMINANCE, None, 1
+    if channels == 3:
+        # Driver umumnya menyimpan RGB8 sebagai RGBX, jadi dihitung 4 byte di VRAM
+        return GL.GL_RGB8, GL.GL_RGB, None, 4
+    return GL.GL_RGBA8, GL.GL_RGBA, None, 4
+
+
+def supported_compression():
+    """Block formats from texture_compress that the current context can sample"""
+    formats = []
+    if has_extension('GL_EXT_texture_compression_s3tc'):
+        formats.append('bc1')
+    rgtc = gl_version() >= (3, 0) or has_extension('GL_ARB_texture_compression_rgtc')
+    if rgtc and _has_swizzle():
+        formats.append('bc4')
+    return tuple(formats)
+
+
+def upload_texture(data, texture_id=None, wrap=GL.GL_REPEAT):
+    """Upload a TextureData with its whole mip chain.
+
+    Returns (texture id, estimated VRAM bytes). Compressed data is uploaded
+    with glCompressedTexImage2D; callers only ask the cache for formats that
+    supported_compression() reported, so no runtime fallback is needed here.
+    """
+    if texture_id is None:
+        texture_id = GL.glGenTextures(1)
+
+    levels = data.levels
+    GL.glBindTexture(GL.GL_TEXTURE_2D, texture_id)
+    # Trilinear filtering kalau ada mip chain
+    min_filter = GL.GL_LINEAR_MIPMAP_LINEAR if len(levels) > 1 else GL.GL_LINEAR
+    GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, min_filter)
+    GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+    GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, wrap)
+    GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, wrap)
+    GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
+
+    vram_bytes = 0
+    if data.format == FORMAT_RAW:
+        internal_format, pixel_format, swizzle, texel_bytes = _pixel_format(data.channels)
+        if swizzle is not None:
+            GL.glTexParameteriv(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_SWIZZLE_RGBA, swizzle)
+        # Baris RGB / grayscale tidak selalu kelipatan 4 byte
+        GL.glPixelStorei(GL.GL_UNPACK_ALIGNMENT, 1)
+        for level, (width, height, pixels) in enumerate(levels):
+            GL.glTexImage2D(
+                GL.GL_TEXTURE_2D, level, internal_format,
+                width, height,
+                0, pixel_format, GL.GL_UNSIGNED_BYTE, pixels
+            )
+            vram_bytes += width * height * texel_bytes
+        GL.glPixelStorei(GL.GL_UNPACK_ALIGNMENT, 4)
+    else:
+        internal_format = GL_FORMATS[data.format]
+        if data.channels == 1:
+            GL.glTexParameteriv(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_SWIZZLE_RGBA, _GREY_SWIZZLE)
+        for level, (width, height, blocks) in enumerate(levels):
+            # PyOpenGL menghitung imageSize sendiri dari array
+            GL.glCompressedTexImage2D(GL.GL_TEXTURE_2D, level, internal_format,
+                                      width, height, 0, blocks)
+            vram_bytes += blocks.nbytes
+
+    GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+    return texture_id, vram_bytes
+
+
+def placeholder_data():
+    """1x1 mid-grey texture shown while the real one is loading"""
+    pixel = np.array([[[128, 128, 128, 255]]], dtype=np.uint8)
+    return TextureData(1, 1, 4, FORMAT_RAW, [(1, 1, pixel)])
+
+
+class TextureHandle(object):
+    """What a scene binds: the placeholder until the real texture is uploaded"""
+
+    def __init__(self, path, placeholder_id):
+        self.path = path
+        self.id = placeholder_id
+        self.ready = False
+        self.failed = False
+        self.wrap = GL.GL_REPEAT
+        self.width = 0
+        self.height = 0
+        self.format = None
+        self.levels = 0
+        self.vram_bytes = 0
+
+
+class TextureLoader(QtCore.QObject):
+    """Decode textures on worker threads, upload them on the GL thread.
+
+    Requests for the same file are coalesced into one handle (and therefore
+    one GL texture). `textureDecoded` is emitted from the worker thread when
+    a decode finishes (Qt queues it to the GUI thread), so the owner can
+    schedule a repaint; `upload_ready` must then be called with the GL
+    context current.
+    """
+
+    textureDecoded = pyqtSignal(str)
+    progressChanged = pyqtSignal(int, int)  # loaded, total
+
+    def __init__(self, cache=None, compress=False, max_workers=None, parent=None):
+        super(TextureLoader, self).__init__(parent)
+        self.cache = cache or TextureCache()
+        self.compress = compress
+        self.compression = ()
+        if max_workers is None:
+            max_workers = min(4, os.cpu_count() or 1)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='texture')
+        self.handles = {}
+        self.pending = {}
+        self.placeholder_id = None
+        self._process_pool = None
+
+    def initialize_gl(self):
+        """Create the placeholder texture and probe compression support"""
+        self.placeholder_id, _ = upload_texture(placeholder_data())
+        if self.compress:
+            self.compression = supported_compression()
+
+    def request(self, image_path):
+        """Start loading `image_path` (if not already) and return its handle"""
+        path = os.path.abspath(image_path)
+        handle = self.handles.get(path)
+        if handle is not None:
+            return handle
+
+        handle = TextureHandle(path, self.placeholder_id)
+        self.handles[path] = handle
+        if not os.path.exists(path):
+            print(f"Error: Texture file not found at {path}", file=sys.stderr)
+            handle.id = None
+            handle.failed = True
+            return handle
+
+        future = self.executor.submit(self.cache.load, path, self.compression)
+        future.add_done_callback(lambda _, path=path: self.textureDecoded.emit(path))
+        self.pending[path] = future
+        return handle
+
+    def request_procedural(self, name, size, seed=0, wrap=GL.GL_REPEAT):
+        """Start generating procedural texture `name` (see procedural.GENERATORS).
+
+        Returns its handle like `request`; the handle path is the cache key,
+        so equal (name, size, seed) requests share one texture.
+        """
+        key = procedural.cache_key(name, size, seed)
+        handle = self.handles.get(key)
+        if handle is not None:
+            return handle
+
+        handle = TextureHandle(key, self.placeholder_id)
+        handle.wrap = wrap
+        self.handles[key] = handle
+        future = self.executor.submit(self._load_procedural, name, size, seed)
+        future.add_done_callback(lambda _, key=key: self.textureDecoded.emit(key))
+        self.pending[key] = future
+        return handle
+
+    def _load_procedural(self, name, size, seed):
+        """Thread pool task: cached data, generated in a worker process on a miss"""
+        key = procedural.cache_key(name, size, seed)
+        data = self.cache.load_generated(key, procedural.VERSION, compression=self.compression)
+        if data is None:
+            self.process_pool().submit(procedural.generate, name, size, seed,
+                                       self.cache.directory).result()
+            # Kalau cache tidak bisa ditulis, buat ulang di sini saja
+            data = self.cache.load_generated(key, procedural.VERSION,
+                                             lambda: procedural.build(name, size, seed),
+                                             self.compression)
+        return data
+
+    def process_pool(self):
+        if self._process_pool is None:
+            # spawn, bukan fork: proses ini punya thread dan konteks GL
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=min(2, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context('spawn'))
+        return self._process_pool
+
+    def upload_ready(self):
+        """Upload every finished decode; returns the number of textures uploaded"""
+        uploaded = 0
+        for path, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[path]
+            handle = self.handles[path]
+            try:
+                data = future.result()
+                handle.id, handle.vram_bytes = upload_texture(data, wrap=handle.wrap)
+                handle.width, handle.height = data.width, data.height
+                handle.format, handle.levels = data.format, len(data.levels)
+                handle.ready = True
+            except Exception as e:
+                print(f"Error loading texture from {path}: {e}", file=sys.stderr)
+                handle.id = None
+                handle.failed = True
+            uploaded += 1
+        if uploaded:
+            self.progressChanged.emit(len(self.handles) - len(self.pending), len(self.handles))
+            if not self.pending:
+                # Ke stderr: stdout bisa jadi stream frame (render_headless --out -)
+                print(self.vram_report(), file=sys.stderr)
+        return uploaded
+
+    def vram_usage(self):
+        """Estimated bytes of texture memory used by the loaded textures"""
+        return sum(handle.vram_bytes for handle in self.handles.values())
+
+    def vram_report(self):
+        lines = [f"Textures: {len(self.handles)}, VRAM ~{self.vram_usage() / 2 ** 20:.2f} MB"]
+        for handle in self.handles.values():
+            if handle.ready:
+                # Tekstur buatan: path-nya kunci cache, bukan file
+                name = os.path.basename(handle.path) if os.path.isabs(handle.path) else handle.path
+                lines.append(f"  {name}: {handle.width}x{handle.height} "
+                             f"{handle.format}, {handle.levels} levels, "
+                             f"{handle.vram_bytes / 2 ** 20:.2f} MB")
+        return "\n".join(lines)
+
+    def wait(self):
+        """Block until every pending decode has finished (for headless use)"""
+        for future in list(self.pending.values()):
+            future.exception()
+
+    @property
+    def loading(self):
+        return bool(self.pending)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
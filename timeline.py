@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""Keyframed animation of the widget's transform fields and color.
+
+A Timeline holds one Track per field: the transform fields of
+transform_state.FIELDS ('rotation_y', 'translation_x', 'scale', ...) or
+'color' (an RGB tint for the top-level scene nodes). A track is a sorted
+list of keyframes (time, value, easing); `easing` shapes the segment that
+starts at that keyframe. Evaluation is a pure function of time:
+
+    value = track.at(t)            # one time, binary search: O(log n)
+    values = track.sample(times)   # NumPy array of times, vectorized
+
+so the interactive widget (advancing by wall time) and the headless
+exporter (stepping exact frame times) produce the same transforms for the
+same time. Timeline maps an arbitrary time onto its own range first:
+'loop' wraps, 'pingpong' plays forward then backward, 'once' clamps.
+
+Contoh:
+    spin = Timeline(6.0)
+    spin.add('rotation_y', [(0.0, 0.0), (6.0, 360.0)])
+    spin.add('scale', [(0.0, 1.0), (3.0, 1.3, 'ease_in_out'), (6.0, 1.0)])
+    spin.evaluate(1.5)   # {'rotation_y': 90.0, 'scale': 1.15}
+"""
+
+import bisect
+
+import numpy as np
+
+from transform_state import FIELDS
+
+
+def _linear(t):
+    return t
+
+
+def _step(t):
+    # Nilai keyframe ditahan sampai keyframe berikutnya
+    return np.zeros_like(t)
+
+
+def _ease_in(t):
+    return t * t
+
+
+def _ease_out(t):
+    return t * (2.0 - t)
+
+
+def _ease_in_out(t):
+    return t * t * (3.0 - 2.0 * t)
+
+
+def _sine(t):
+    return 0.5 - 0.5 * np.cos(np.pi * t)
+
+
+# Semua fungsi menerima float maupun array NumPy, t di [0, 1]
+EASINGS = {
+    'linear': _linear,
+    'step': _step,
+    'ease_in': _ease_in,
+    'ease_out': _ease_out,
+    'ease_in_out': _ease_in_out,
+    'sine': _sine,
+}
+
+LOOP_MODES = ('loop', 'pingpong', 'once')
+COLOR_FIELD = 'color'
+TRACK_FIELDS = tuple(FIELDS) + (COLOR_FIELD,)
+# Sudut rotasi dibungkus ke [0, 360) seperti di widget
+ANGLE_FIELDS = tuple(name for name, group in FIELDS.items() if group == 'rotation')
+
+
+class Track(object):
+    """Keyframes of one field; values are floats or equal-length tuples (colors)"""
+
+    def __init__(self, field, keys):
+        if field not in TRACK_FIELDS:
+            raise KeyError(f"Unknown timeline field '{field}'")
+        if not keys:
+            raise ValueError(f"Track '{field}' needs at least one keyframe")
+        keys = sorted((tuple(key) + ('linear',))[:3] for key in keys)
+        for _, _, easing in keys:
+            if easing not in EASINGS:
+                raise ValueError(f"Unknown easing '{easing}', expected one of {sorted(EASINGS)}")
+        self.field = field
+        self.times = np.array([key[0] for key in keys], dtype=np.float64)
+        values = np.array([key[1] for key in keys], dtype=np.float64)
+        self.scalar = values.ndim == 1
+        self.values = values.reshape(len(keys), -1)
+        self.easings = [key[2] for key in keys]
+        self._time_list = self.times.tolist()  # bisect lebih cepat pada list
+
+    @property
+    def start(self):
+        return self._time_list[0]
+
+    @property
+    def end(self):
+        return self._time_list[-1]
+
+    def _result(self, value):
+        return float(value[0]) if self.scalar else tuple(float(v) for v in value)
+
+    def at(self, time):
+        """Value at `time`; held constant before the first and after the last keyframe"""
+        times = self._time_list
+        i = bisect.bisect_right(times, time) - 1
+        if i < 0:
+            return self._result(self.values[0])
+        if i >= len(times) - 1:
+            return self._result(self.values[-1])
+        t = (time - times[i]) / (times[i + 1] - times[i])
+        t = float(EASINGS[self.easings[i]](t))
+        return self._result(self.values[i] + (self.values[i + 1] - self.values[i]) * t)
+
+    def sample(self, times):
+        """Values at an array of times: shape (n,), or (n, channels) for tuples"""
+        times = np.asarray(times, dtype=np.float64)
+        last = len(self.times) - 1
+        index = np.clip(np.searchsorted(self.times, times, side='right') - 1, 0, max(last - 1, 0))
+        if last == 0:
+            result = np.repeat(self.values, len(times), axis=0)
+        else:
+            span = self.times[index + 1] - self.times[index]
+            t = np.clip((times - self.times[index]) / span, 0.0, 1.0)
+            # Easing per segmen: satu panggilan per jenis easing, bukan per waktu
+            eased = np.empty_like(t)
+            easing_of = np.array(self.easings[:-1])[index]
+            for name in set(self.easings[:-1]):
+                mask = easing_of == name
+                eased[mask] = EASINGS[name](t[mask])
+            start = self.values[index]
+            result = start + (self.values[index + 1] - start) * eased[:, None]
+            result[times >= self.times[-1]] = self.values[-1]  # Juga untuk easing 'step'
+        return result[:, 0] if self.scalar else result
+
+
+class Timeline(object):
+    """Tracks sharing one time range of `duration` seconds (default: last keyframe)"""
+
+    def __init__(self, duration=None, mode='loop'):
+        if mode not in LOOP_MODES:
+            raise ValueError(f"Unknown loop mode '{mode}', expected one of {LOOP_MODES}")
+        self.tracks = {}
+        self.mode = mode
+        self._duration = duration
+
+    @property
+    def duration(self):
+        if self._duration is not None:
+            return self._duration
+        return max((track.end for track in self.tracks.values()), default=0.0)
+
+    def add(self, field, keys):
+        """Set the keyframes of `field`: (time, value[, easing]) tuples; returns the Track"""
+        track = self.tracks[field] = Track(field, keys)
+        return track
+
+    def local_time(self, time):
+        """`time` mapped onto [0, duration] according to the loop mode"""
+        duration = self.duration
+        if duration <= 0.0:
+            return 0.0
+        if self.mode == 'once':
+            return min(max(time, 0.0), duration)
+        if self.mode == 'pingpong':
+            time = time % (2.0 * duration)
+            return 2.0 * duration - time if time > duration else time
+        return time % duration
+
+    def local_times(self, times):
+        times = np.asarray(times, dtype=np.float64)
+        duration = self.duration
+        if duration <= 0.0:
+            return np.zeros_like(times)
+        if self.mode == 'once':
+            return np.clip(times, 0.0, duration)
+        if self.mode == 'pingpong':
+            times = np.mod(times, 2.0 * duration)
+            return np.where(times > duration, 2.0 * duration - times, times)
+        return np.mod(times, duration)
+
+    def evaluate(self, time):
+        """{field: value} at `time`"""
+        local = self.local_time(time)
+        values = {field: track.at(local) for field, track in self.tracks.items()}
+        for field in ANGLE_FIELDS:
+            if field in values:
+                values[field] %= 360.0
+        return values
+
+    def evaluate_many(self, times):
+        """{field: array} for an array of times, e.g. every frame of an export"""
+        local = self.local_times(times)
+        values = {field: track.sample(local) for field, track in self.tracks.items()}
+        for field in ANGLE_FIELDS:
+            if field in values:
+                values[field] = np.mod(values[field], 360.0)
+        return values
+
+
+def turntable(speed=60.0, axes='xyz'):
+    """Endless spin of `speed` degrees per second around `axes` (the default animation)"""
+    period = 360.0 / speed
+    timeline = Timeline(period, 'loop')
+    for axis in axes:
+        timeline.add('rotation_' + axis, [(0.0, 0.0), (period, 360.0)])
+    return timeline
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Transform state of SceneGLWidget (rotation, translation, scale).
+
+Every write goes through TransformState.set_values. Changes made during
+one event-loop turn are collected and announced once, on the next turn,
+through `changed` with the set of groups that actually changed
+('rotation', 'translation', 'scale', 'scale3d'). Writing a value equal to
+the current one is not a change, so a spin box echoing a value back into
+the model does not start another round of notifications.
+
+`revision` increases on every real change (also the silent ones made by
+the animation), so derived data such as matrices can be cached against it.
+"""
+
+from collections import OrderedDict
+
+from PyQt5 import QtCore
+from PyQt5.QtCore import pyqtSignal
+
+# Nama field -> grup sinyal
+FIELDS = OrderedDict([
+    ('rotation_x', 'rotation'),
+    ('rotation_y', 'rotation'),
+    ('rotation_z', 'rotation'),
+    ('translation_x', 'translation'),
+    ('translation_y', 'translation'),
+    ('translation_z', 'translation'),
+    ('scale', 'scale'),
+    ('scale_x', 'scale3d'),
+    ('scale_y', 'scale3d'),
+    ('scale_z', 'scale3d'),
+])
+
+DEFAULTS = {name: (1.0 if group.startswith('scale') else 0.0) for name, group in FIELDS.items()}
+
+
+class TransformState(QtCore.QObject):
+    changed = pyqtSignal(object)  # frozenset nama grup
+
+    def __init__(self, parent=None):
+        super(TransformState, self).__init__(parent)
+        self.values = dict(DEFAULTS)
+        self.revision = 0
+        self.notifications = 0  # Jumlah notifikasi gabungan yang sudah dikirim
+        self._dirty = set()
+        self._flush_scheduled = False
+
+    def set_values(self, notify=True, **values):
+        """Assign fields; with notify=False the change is not announced"""
+        for name, value in values.items():
+            if name not in FIELDS:
+                raise KeyError(f"Unknown transform field '{name}'")
+            if self.values[name] == value:
+                continue
+            self.values[name] = value
+            self.revision += 1
+            if notify:
+                self._dirty.add(FIELDS[name])
+        if self._dirty and not self._flush_scheduled:
+            self._flush_scheduled = True
+            QtCore.QTimer.singleShot(0, self.flush)
+
+    def reset(self):
+        self.set_values(**DEFAULTS)
+
+    def group(self, name):
+        """Current values of a group, e.g. group('rotation') -> (x, y, z)"""
+        return tuple(self.values[field] for field, group in FIELDS.items() if group == name)
+
+    def flush(self):
+        """Emit the pending change notification now"""
+        self._flush_scheduled = False
+        if not self._dirty:
+            return
+        groups = frozenset(self._dirty)
+        self._dirty.clear()
+        self.notifications += 1
+        self.changed.emit(groups)
+
+
+def transform_property(name):
+    """Widget attribute that reads and writes field `name` of self.transform"""
+    def getter(self):
+        return self.transform.values[name]
+
+    def setter(self, value):
+        self.transform.set_values(**{name: value})
+    return property(getter, setter)
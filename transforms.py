@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""4x4 transform matrices with NumPy, plus the widget's cached matrices.
+
+Matrices are float32, row-major, for column vectors (p' = M @ p), the same
+convention as the OpenGL documentation. OpenGL itself expects column-major
+memory, so `gl_matrix` returns the transposed, contiguous array that
+glLoadMatrixf / glMultMatrixf take directly. No GL calls are made here.
+"""
+
+import math
+
+import numpy as np
+
+
+def identity():
+    return np.identity(4, dtype=np.float32)
+
+
+def translation(x, y, z):
+    m = identity()
+    m[:3, 3] = (x, y, z)
+    return m
+
+
+def scaling(x, y, z):
+    return np.diag(np.array([x, y, z, 1.0], dtype=np.float32))
+
+
+def rotation(angle_deg, x, y, z):
+    """Rotation about an axis, like glRotatef"""
+    axis = np.array([x, y, z], dtype=np.float64)
+    length = np.linalg.norm(axis)
+    if length == 0.0:
+        return identity()
+    x, y, z = axis / length
+    a = math.radians(angle_deg)
+    c, s = math.cos(a), math.sin(a)
+    t = 1.0 - c
+    m = identity()
+    m[:3, :3] = [
+        [t * x * x + c, t * x * y - s * z, t * x * z + s * y],
+        [t * x * y + s * z, t * y * y + c, t * y * z - s * x],
+        [t * x * z - s * y, t * y * z + s * x, t * z * z + c],
+    ]
+    return m
+
+
+def euler_xyz(rx, ry, rz):
+    """Rx @ Ry @ Rz, i.e. glRotatef(rx, 1,0,0); glRotatef(ry, 0,1,0); glRotatef(rz, 0,0,1)"""
+    return rotation(rx, 1, 0, 0) @ rotation(ry, 0, 1, 0) @ rotation(rz, 0, 0, 1)
+
+
+def perspective(fovy, aspect, near, far):
+    """Same matrix as gluPerspective"""
+    f = 1.0 / math.tan(math.radians(fovy) / 2.0)
+    m = np.zeros((4, 4), dtype=np.float32)
+    m[0, 0] = f / aspect
+    m[1, 1] = f
+    m[2, 2] = (far + near) / (near - far)
+    m[2, 3] = 2.0 * far * near / (near - far)
+    m[3, 2] = -1.0
+    return m
+
+
+def look_at(eye, center, up):
+    """Same matrix as gluLookAt"""
+    eye = np.asarray(eye, dtype=np.float64)
+    forward = np.asarray(center, dtype=np.float64) - eye
+    forward /= np.linalg.norm(forward)
+    side = np.cross(forward, up)
+    side /= np.linalg.norm(side)
+    up = np.cross(side, forward)
+    m = identity()
+    m[0, :3] = side
+    m[1, :3] = up
+    m[2, :3] = -forward
+    return m @ translation(*(-eye))
+
+
+def gl_matrix(m):
+    """Column-major float32 copy of `m` for glLoadMatrixf / glMultMatrixf"""
+    return np.ascontiguousarray(m.T, dtype=np.float32)
+
+
+class SceneMatrices(object):
+    """Projection and model-view of SceneGLWidget, rebuilt only when inputs change.
+
+    The model-view is keyed on the TransformState revision and the camera
+    distance, the projection on (fovy, aspect, near, far).
+    """
+
+    def __init__(self, transform, near=0.1, far=100.0):
+        self.transform = transform
+        self.near = near
+        self.far = far
+        self._projection_key = None
+        self._projection = None
+        self._projection_gl = None
+        self._model_view_key = None
+        self._model = None
+        self._model_view = None
+        self._model_view_gl = None
+        self.rebuilds = 0
+
+    def set_projection(self, fovy, aspect):
+        key = (fovy, aspect, self.near, self.far)
+        if key != self._projection_key:
+            self._projection_key = key
+            self._projection = perspective(fovy, aspect, self.near, self.far)
+            self._projection_gl = gl_matrix(self._projection)
+        return self._projection_gl
+
+    @property
+    def projection(self):
+        return self._projection
+
+    def view(self, camera_distance):
+        return look_at((0.0, 0.0, camera_distance), (0.0, 0.0, 0.0), (0.0, 1.0, 0.0))
+
+    def model(self):
+        """Translate, rotate x/y/z, then scale, like the old glTranslatef/glRotatef/glScalef chain"""
+        v = self.transform.values
+        s = v['scale']
+        return (translation(v['translation_x'], v['translation_y'], v['translation_z']) @
+                euler_xyz(v['rotation_x'], v['rotation_y'], v['rotation_z']) @
+                scaling(v['scale_x'] * s, v['scale_y'] * s, v['scale_z'] * s))
+
+    def model_view(self, camera_distance):
+        """Column-major model-view matrix, recomputed only after a transform change"""
+        key = (self.transform.revision, camera_distance)
+        if key != self._model_view_key:
+            self._model_view_key = key
+            self._model = self.model()
+            self._model_view = self.view(camera_distance) @ self._model
+            self._model_view_gl = gl_matrix(self._model_view)
+            self.rebuilds += 1
+        return self._model_view_gl
+
+    def model_view_matrix(self, camera_distance):
+        """Row-major model-view (same cache as model_view), for further products"""
+        self.model_view(camera_distance)
+        return self._model_view
+
+    def units_per_pixel(self, depth, viewport_height):
+        """World units covered by one pixel at `depth` in front of the camera"""
+        if self._projection is None:
+            return 0.01
+        return 2.0 * depth / (float(self._projection[1, 1]) * max(viewport_height, 1))
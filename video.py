@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""Video output for rendered frames: encoders and asynchronous readback.
+
+Encoders take top-down (height, width, 4) uint8 RGBA frames through
+`write(rgba)` and encode them on a background thread, so the render loop
+only waits when the encoder falls several frames behind:
+
+    FfmpegEncoder  raw RGBA piped into a local ffmpeg (mp4, mkv, webm, ...)
+    ApngWriter     animated PNG written frame by frame with zlib, no extra
+                   dependencies
+    GifWriter      animated GIF through Pillow (kept in memory, short clips)
+
+`open_encoder(path, ...)` picks one from the file extension and falls back
+to APNG when ffmpeg is not installed (LANGIT_FFMPEG overrides the binary).
+PacedWriter feeds an encoder from frames painted at irregular times, such
+as the interactive viewer: frames are placed by timestamp, repeated to fill
+gaps and dropped when two fall into the same output frame.
+
+PixelBufferReader reads the framebuffer into pixel buffer objects.
+glReadPixels into a PBO returns right away; the pixels of frame N are
+mapped only after frame N+1 was issued, so readback overlaps rendering
+instead of stalling it.
+"""
+
+import ctypes
+import fractions
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import zlib
+
+import numpy as np
+from OpenGL import GL
+
+# Frame yang boleh mengantre di depan encoder sebelum render ikut menunggu
+QUEUE_FRAMES = 4
+FFMPEG_EXTENSIONS = ('.mp4', '.mkv', '.mov', '.webm', '.avi')
+
+
+class EncoderError(Exception):
+    pass
+
+
+class Encoder(object):
+    """Base class: frames are queued and encoded by `_encode` on a worker thread"""
+
+    def __init__(self, path, width, height, fps):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frames = 0
+        self._error = None
+        self._queue = queue.Queue(maxsize=QUEUE_FRAMES)
+        self._thread = threading.Thread(target=self._run, name=f'encoder {os.path.basename(path)}',
+                                        daemon=True)
+        self._thread.start()
+
+    def write(self, rgba):
+        """Queue one frame; the array must not be modified afterwards"""
+        if self._error is not None:
+            raise EncoderError(f"Encoding {self.path} failed: {self._error}")
+        if rgba.shape != (self.height, self.width, 4):
+            raise ValueError(f"Frame is {rgba.shape}, expected {(self.height, self.width, 4)}")
+        self._queue.put(rgba)
+        self.frames += 1
+
+    def close(self):
+        """Encode the queued frames and finish the file"""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is None:
+            self._finish()
+        if self._error is not None:
+            raise EncoderError(f"Encoding {self.path} failed: {self._error}")
+
+    def _run(self):
+        while True:
+            rgba = self._queue.get()
+            if rgba is None:
+                return
+            if self._error is not None:
+                continue  # Antrean tetap dikosongkan supaya write() tidak macet
+            try:
+                self._encode(rgba)
+            except Exception as e:
+                self._error = e
+
+    def _encode(self, rgba):
+        raise NotImplementedError
+
+    def _finish(self):
+        pass
+
+
+def ffmpeg_binary():
+    """Path of the ffmpeg executable, or None"""
+    return os.environ.get('LANGIT_FFMPEG') or shutil.which('ffmpeg')
+
+
+class FfmpegEncoder(Encoder):
+    """Raw RGBA frames on ffmpeg's stdin; H.264 / yuv420p unless `codec` says otherwise"""
+
+    def __init__(self, path, width, height, fps, codec=None, binary=None):
+        binary = binary or ffmpeg_binary()
+        if binary is None:
+            raise EncoderError("ffmpeg not found (install it or set LANGIT_FFMPEG)")
+        extension = os.path.splitext(path)[1].lower()
+        codec = codec or ('libvpx-vp9' if extension == '.webm' else 'libx264')
+        command = [binary, '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(fps),
+                   '-i', '-',
+                   # yuv420p butuh ukuran genap
+                   '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                   '-c:v', codec, '-pix_fmt', 'yuv420p', path]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        super(FfmpegEncoder, self).__init__(path, width, height, fps)
+
+    def _encode(self, rgba):
+        self.process.stdin.write(memoryview(np.ascontiguousarray(rgba)).cast('B'))
+
+    def close(self):
+        try:
+            super(FfmpegEncoder, self).close()
+        finally:
+            if not self.process.stdin.closed:
+                self.process.stdin.close()
+            code = self.process.wait()
+        if code != 0:
+            raise EncoderError(f"ffmpeg exited with status {code} while writing {self.path}")
+
+
+def _chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+class ApngWriter(Encoder):
+    """Animated PNG streamed to disk; the frame count is patched in on close"""
+
+    SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+    def __init__(self, path, width, height, fps, level=1):
+        self.level = level
+        self._sequence = 0
+        # Durasi frame sebagai pecahan 16-bit (mis. 1/30 detik)
+        delay = fractions.Fraction(1.0 / fps).limit_denominator(65535)
+        self._delay = (delay.numerator, delay.denominator)
+        self._stream = open(path, 'wb')
+        self._stream.write(self.SIGNATURE)
+        # RGBA 8 bit, tanpa interlace
+        self._stream.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)))
+        self._actl_offset = self._stream.tell()
+        self._stream.write(_chunk(b'acTL', struct.pack('>II', 0, 0)))
+        super(ApngWriter, self).__init__(path, width, height, fps)
+
+    def _next_sequence(self):
+        sequence = self._sequence
+        self._sequence += 1
+        return sequence
+
+    def _encode(self, rgba):
+        # Filter 0 (none) di awal tiap baris, lalu deflate
+        rows = np.empty((self.height, self.width * 4 + 1), dtype=np.uint8)
+        rows[:, 0] = 0
+        rows[:, 1:] = rgba.reshape(self.height, -1)
+        data = zlib.compress(rows.tobytes(), self.level)
+        first = self._sequence == 0
+        self._stream.write(_chunk(b'fcTL', struct.pack(
+            '>IIIIIHHBB', self._next_sequence(), self.width, self.height, 0, 0,
+            self._delay[0], self._delay[1], 0, 0)))
+        if first:
+            self._stream.write(_chunk(b'IDAT', data))  # Frame pertama juga gambar PNG biasa
+        else:
+            self._stream.write(_chunk(b'fdAT', struct.pack('>I', self._next_sequence()) + data))
+
+    def _finish(self):
+        self._stream.write(_chunk(b'IEND', b''))
+        self._stream.seek(self._actl_offset)
+        self._stream.write(_chunk(b'acTL', struct.pack('>II', self.frames, 0)))  # 0 = ulang terus
+        self._stream.close()
+
+    def close(self):
+        try:
+            super(ApngWriter, self).close()
+        finally:
+            if not self._stream.closed:
+                self._stream.close()
+
+
+class GifWriter(Encoder):
+    """Animated GIF through Pillow; frames are quantized as they arrive and saved on close"""
+
+    def __init__(self, path, width, height, fps):
+        self._images = []
+        super(GifWriter, self).__init__(path, width, height, fps)
+
+    def _encode(self, rgba):
+        from PIL import Image
+        self._images.append(Image.fromarray(rgba[..., :3], 'RGB').quantize(256))
+
+    def _finish(self):
+        if not self._images:
+            return
+        first, rest = self._images[0], self._images[1:]
+        first.save(self.path, save_all=True, append_images=rest,
+                   duration=int(round(1000.0 / self.fps)), loop=0)
+        self._images = []
+
+
+def open_encoder(path, width, height, fps):
+    """Encoder for `path` by extension; ffmpeg formats fall back to APNG without ffmpeg"""
+    root, extension = os.path.splitext(path)
+    extension = extension.lower()
+    if extension in FFMPEG_EXTENSIONS:
+        if ffmpeg_binary() is not None:
+            return FfmpegEncoder(path, width, height, fps)
+        print(f"Warning: ffmpeg not found, writing {root}.png (APNG) instead of {path}",
+              file=sys.stderr)
+        return ApngWriter(root + '.png', width, height, fps)
+    if extension in ('.png', '.apng'):
+        return ApngWriter(path, width, height, fps)
+    if extension == '.gif':
+        return GifWriter(path, width, height, fps)
+    raise ValueError(f"Unsupported video format '{extension}'")
+
+
+class PacedWriter(object):
+    """Timestamped frames to `encoder` at its fixed fps, repeating or dropping frames to keep time"""
+
+    def __init__(self, encoder, start):
+        self.encoder = encoder
+        self.start = start
+        self.repeated = 0
+        self.dropped = 0
+        self._last = None
+
+    @property
+    def size(self):
+        return (self.encoder.width, self.encoder.height)
+
+    def _slot(self, time):
+        # Frame output k menutupi waktu [k / fps, (k + 1) / fps) sejak start
+        return int((time - self.start) * self.encoder.fps)
+
+    def _fill(self, slot):
+        # Celah sebelum `slot`: frame terakhir ditahan
+        while self._last is not None and self.encoder.frames < slot:
+            self.encoder.write(self._last)
+            self.repeated += 1
+
+    def write(self, rgba, time):
+        """Frame painted at `time` (same clock as start); `rgba` is copied only if it is kept"""
+        slot = self._slot(time)
+        if slot < self.encoder.frames:
+            self.dropped += 1  # Frame output ini sudah terisi
+            return
+        self._fill(slot)
+        self._last = rgba.copy()
+        self.encoder.write(self._last)
+
+    def close(self, time):
+        """Hold the last frame until `time`, then finish the file"""
+        self._fill(self._slot(time))
+        self.encoder.close()
+
+
+def allocate_buffers(count, width, height):
+    """`count` pixel pack buffers for RGBA frames of width x height"""
+    buffers = [int(buffer) for buffer in np.atleast_1d(GL.glGenBuffers(count))]
+    for buffer in buffers:
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, buffer)
+        GL.glBufferData(GL.GL_PIXEL_PACK_BUFFER, width * height * 4, None, GL.GL_STREAM_READ)
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+    return buffers
+
+
+def read_into_buffer(buffer, width, height):
+    """Start reading the current framebuffer into `buffer`; returns without waiting"""
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, buffer)
+    GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
+    # Dengan PBO terpasang, argumen terakhir adalah offset di buffer, bukan pointer
+    GL.glReadPixels(0, 0, width, height, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+
+
+def map_buffer(buffer, width, height):
+    """Map `buffer` and return its frame as a top-down (height, width, 4) view, no copy.
+
+    The view is valid until unmap_buffer(buffer).
+    """
+    size = width * height * 4
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, buffer)
+    if GL.glMapBufferRange:
+        address = GL.glMapBufferRange(GL.GL_PIXEL_PACK_BUFFER, 0, size, GL.GL_MAP_READ_BIT)
+    else:
+        address = GL.glMapBuffer(GL.GL_PIXEL_PACK_BUFFER, GL.GL_READ_ONLY)
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+    pixels = np.ctypeslib.as_array((ctypes.c_ubyte * size).from_address(address))
+    # glReadPixels mulai dari baris bawah
+    return pixels.reshape(height, width, 4)[::-1]
+
+
+def unmap_buffer(buffer):
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, buffer)
+    GL.glUnmapBuffer(GL.GL_PIXEL_PACK_BUFFER)
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+
+
+class PixelBufferReader(object):
+    """Framebuffer readback through a ring of `count` pixel buffer objects.
+
+    `read(tag)` starts an asynchronous read of the current framebuffer and
+    returns the frames whose reads have finished as [(tag, rgba)]: with two
+    buffers, frame N comes back while frame N+1 is read. `flush()` returns
+    the rest. Frames are top-down (height, width, 4) uint8 copies.
+    """
+
+    def __init__(self, width, height, count=2):
+        self.width = width
+        self.height = height
+        self.buffers = allocate_buffers(count, width, height)
+        self._next = 0
+        self._pending = []  # (tag, buffer), yang paling lama di depan
+
+    @staticmethod
+    def supported():
+        return bool(GL.glGenBuffers) and bool(GL.glMapBuffer or GL.glMapBufferRange)
+
+    def read(self, tag=None):
+        finished = []
+        if len(self._pending) == len(self.buffers):
+            finished.append(self._collect())
+        buffer = self.buffers[self._next]
+        self._next = (self._next + 1) % len(self.buffers)
+        read_into_buffer(buffer, self.width, self.height)
+        self._pending.append((tag, buffer))
+        return finished
+
+    def flush(self):
+        finished = []
+        while self._pending:
+            finished.append(self._collect())
+        return finished
+
+    def _collect(self):
+        tag, buffer = self._pending.pop(0)
+        try:
+            rgba = map_buffer(buffer, self.width, self.height).copy()
+        finally:
+            unmap_buffer(buffer)
+        return tag, rgba
+
+    def delete(self):
+        GL.glDeleteBuffers(len(self.buffers), self.buffers)
+        self.buffers = []
+        self._pending = []